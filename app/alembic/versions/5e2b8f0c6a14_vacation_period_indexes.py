@@ -0,0 +1,48 @@
+"""vacation_period_indexes
+
+Revision ID: 5e2b8f0c6a14
+Revises: 9c41d2e7a8f3
+Create Date: 2026-10-18 11:02:17.219845
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5e2b8f0c6a14"
+down_revision = "9c41d2e7a8f3"
+branch_labels = None
+depends_on = None
+
+# ? duplicates of the primary key indexes
+ID_INDEXES = {
+    "team": "ix_team_id",
+    "employee": "ix_employee_id",
+    "balance": "ix_balance_id",
+    "vacation": "ix_vacation_id",
+}
+
+
+def upgrade():
+    for table, index in ID_INDEXES.items():
+        op.drop_index(index, table_name=table)
+    op.create_index(
+        "ix_vacation_employee_id_start_date_end_date",
+        "vacation",
+        ["employee_id", "start_date", "end_date"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_vacation_period",
+        "vacation",
+        [sa.text("daterange(start_date, end_date, '[]')")],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade():
+    op.drop_index("ix_vacation_period", table_name="vacation")
+    op.drop_index("ix_vacation_employee_id_start_date_end_date", table_name="vacation")
+    for table, index in ID_INDEXES.items():
+        op.create_index(index, table, ["id"], unique=False)
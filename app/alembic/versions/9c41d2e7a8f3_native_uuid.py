@@ -0,0 +1,67 @@
+"""native_uuid
+
+Revision ID: 9c41d2e7a8f3
+Revises: 3b7c5caa4267
+Create Date: 2026-10-18 10:12:41.503127
+
+"""
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "9c41d2e7a8f3"
+down_revision = "3b7c5caa4267"
+branch_labels = None
+depends_on = None
+
+UUID_COLUMNS = {
+    "team": ["id"],
+    "employee": ["id", "team_id"],
+    "balance": ["id", "employee_id"],
+    "vacation": ["id", "employee_id"],
+}
+FOREIGN_KEYS = [
+    # (source table, column, referred table)
+    ("employee", "team_id", "team"),
+    ("balance", "employee_id", "employee"),
+    ("vacation", "employee_id", "employee"),
+]
+
+
+def _drop_foreign_keys():
+    for table, column, _ in FOREIGN_KEYS:
+        op.drop_constraint(f"{table}_{column}_fkey", table, type_="foreignkey")
+
+
+def _create_foreign_keys():
+    for table, column, referred_table in FOREIGN_KEYS:
+        op.create_foreign_key(
+            f"{table}_{column}_fkey", table, referred_table, [column], ["id"]
+        )
+
+
+def upgrade():
+    # ? CHAR(36) -> uuid, converted in place
+    _drop_foreign_keys()
+    for table, columns in UUID_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=postgresql.UUID(as_uuid=True),
+                postgresql_using=f"{column}::uuid",
+            )
+    _create_foreign_keys()
+
+
+def downgrade():
+    _drop_foreign_keys()
+    for table, columns in UUID_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=postgresql.CHAR(36),
+                postgresql_using=f"{column}::text",
+            )
+    _create_foreign_keys()
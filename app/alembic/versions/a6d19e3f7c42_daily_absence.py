@@ -0,0 +1,54 @@
+"""daily_absence
+
+Revision ID: a6d19e3f7c42
+Revises: f3a8c61d5b20
+Create Date: 2026-10-18 15:22:47.905136
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "a6d19e3f7c42"
+down_revision = "f3a8c61d5b20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "daily_absence",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("team_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("employee_count", sa.Integer(), nullable=False),
+        sa.Column("employee_ids", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(["team_id"], ["team.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_daily_absence_team_id_date",
+        "daily_absence",
+        ["team_id", "date"],
+        unique=True,
+    )
+    # ? for gen_random_uuid(), already created by d47a9c13e8b2 on a full upgrade
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    # ? the calendars of the existing vacations, one row per team and day
+    op.execute(
+        "INSERT INTO daily_absence (id, team_id, date, employee_count, employee_ids) "
+        "SELECT gen_random_uuid(), employee.team_id, day::date, "
+        "count(DISTINCT vacation.employee_id), "
+        "json_agg(DISTINCT vacation.employee_id::text) "
+        "FROM vacation JOIN employee ON employee.id = vacation.employee_id "
+        "CROSS JOIN generate_series(vacation.start_date, vacation.end_date, "
+        "interval '1 day') AS day "
+        "WHERE employee.team_id IS NOT NULL "
+        "GROUP BY employee.team_id, day::date"
+    )
+
+
+def downgrade():
+    op.drop_index("ix_daily_absence_team_id_date", table_name="daily_absence")
+    op.drop_table("daily_absence")
@@ -0,0 +1,28 @@
+"""vacation_period_exclusion
+
+Revision ID: b81f4d9e27c5
+Revises: 5e2b8f0c6a14
+Create Date: 2026-10-18 11:47:53.664210
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b81f4d9e27c5"
+down_revision = "5e2b8f0c6a14"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ? needed for the `employee_id WITH =` part of the gist constraint
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE vacation ADD CONSTRAINT ex_vacation_employee_id_period "
+        "EXCLUDE USING gist (employee_id WITH =, "
+        "daterange(start_date, end_date, '[]') WITH &&)"
+    )
+
+
+def downgrade():
+    op.drop_constraint("ex_vacation_employee_id_period", "vacation")
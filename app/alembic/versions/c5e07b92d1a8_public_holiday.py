@@ -0,0 +1,40 @@
+"""public_holiday
+
+Revision ID: c5e07b92d1a8
+Revises: a6d19e3f7c42
+Create Date: 2026-10-18 16:08:31.274590
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c5e07b92d1a8"
+down_revision = "a6d19e3f7c42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ? filled by `python -m app.management.load_public_holidays`, run by
+    # ? `make migrate-db` after the migrations
+    op.create_table(
+        "public_holiday",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("timezone", sa.String(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_public_holiday_timezone_date",
+        "public_holiday",
+        ["timezone", "date"],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_public_holiday_timezone_date", table_name="public_holiday")
+    op.drop_table("public_holiday")
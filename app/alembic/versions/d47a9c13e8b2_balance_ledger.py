@@ -0,0 +1,67 @@
+"""balance_ledger
+
+Revision ID: d47a9c13e8b2
+Revises: b81f4d9e27c5
+Create Date: 2026-10-18 12:31:06.482917
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "d47a9c13e8b2"
+down_revision = "b81f4d9e27c5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ? gen_random_uuid() is only built in from PostgreSQL 13
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    op.create_table(
+        "balance_ledger",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("employee_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column(
+            "kind",
+            sa.Enum("OPENING", "VACATION", "ADJUSTMENT", name="ledgerentrykind"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["employee_id"], ["employee.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_balance_ledger_employee_id_created_at",
+        "balance_ledger",
+        ["employee_id", "created_at"],
+        unique=False,
+    )
+    op.add_column("balance", sa.Column("snapshot_at", sa.DateTime(), nullable=True))
+    # ? the current balances become the opening entries, already rolled up,
+    # ? now() is the same for both statements of the transaction
+    op.execute(
+        "INSERT INTO balance_ledger (id, employee_id, amount, kind, created_at) "
+        "SELECT gen_random_uuid(), employee_id, coalesce(balance, 0), 'OPENING', "
+        "now() AT TIME ZONE 'utc' FROM balance"
+    )
+    op.execute("UPDATE balance SET snapshot_at = now() AT TIME ZONE 'utc'")
+    op.alter_column("balance", "snapshot_at", nullable=False)
+
+
+def downgrade():
+    # ? the balances get back the entries that were not rolled up yet
+    op.execute(
+        "UPDATE balance SET balance = balance + coalesce(("
+        "SELECT sum(amount) FROM balance_ledger "
+        "WHERE balance_ledger.employee_id = balance.employee_id "
+        "AND balance_ledger.created_at > balance.snapshot_at), 0)"
+    )
+    op.drop_column("balance", "snapshot_at")
+    op.drop_index(
+        "ix_balance_ledger_employee_id_created_at", table_name="balance_ledger"
+    )
+    op.drop_table("balance_ledger")
+    sa.Enum(name="ledgerentrykind").drop(op.get_bind(), checkfirst=False)
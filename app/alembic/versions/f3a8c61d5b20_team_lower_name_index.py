@@ -0,0 +1,26 @@
+"""team_lower_name_index
+
+Revision ID: f3a8c61d5b20
+Revises: d47a9c13e8b2
+Create Date: 2026-10-18 14:05:12.318204
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3a8c61d5b20"
+down_revision = "d47a9c13e8b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ? fails if names only differing by their case exist, to be renamed first
+    op.create_index("ix_team_lower_name", "team", [sa.text("lower(name)")], unique=True)
+    op.drop_index("ix_team_name", table_name="team")
+
+
+def downgrade():
+    op.create_index("ix_team_name", "team", ["name"], unique=True)
+    op.drop_index("ix_team_lower_name", table_name="team")
@@ -1,9 +1,31 @@
 from fastapi import FastAPI
 
-from .routes import employee, team, vacation
+from app.core.config import settings
+
+from .routes import employee, internal, metrics, team, vacation
+from .routes.asynchronous import employee as async_employee
+from .routes.asynchronous import team as async_team
+from .routes.asynchronous import vacation as async_vacation
 
 
 def add_app_routes(app: FastAPI):
-    app.include_router(employee.router, prefix="/employee", tags=["Employee"])
-    app.include_router(team.router, prefix="/team", tags=["Team"])
-    app.include_router(vacation.router, prefix="/vacation", tags=["Vacation"])
+    # ? same routes, with async handlers over the asyncpg engine when enabled
+    if settings.ASYNC_DATABASE:
+        employee_router, team_router, vacation_router = (
+            async_employee.router,
+            async_team.router,
+            async_vacation.router,
+        )
+    else:
+        employee_router, team_router, vacation_router = (
+            employee.router,
+            team.router,
+            vacation.router,
+        )
+    app.include_router(employee_router, prefix="/employee", tags=["Employee"])
+    app.include_router(team_router, prefix="/team", tags=["Team"])
+    app.include_router(vacation_router, prefix="/vacation", tags=["Vacation"])
+    # ? not meant to be exposed publicly, to be filtered at the gateway
+    app.include_router(internal.router, prefix="/internal", tags=["Internal"])
+    # ? scraped by Prometheus, to be filtered at the gateway as well
+    app.include_router(metrics.router, tags=["Internal"])
@@ -1,27 +1,30 @@
+import calendar
+from datetime import date
 from uuid import UUID
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.model import EmployeeModel, TeamModel, VacationModel
-from app.repository.employee import EmployeeRepository
-from app.repository.team import TeamRepository
-from app.repository.vacation import VacationRepository
+from app.repository.employee import AsyncEmployeeRepository, EmployeeRepository
+from app.repository.team import AsyncTeamRepository, TeamRepository
+from app.repository.vacation import AsyncVacationRepository, VacationRepository
 
 
 def get_employee_by_id(
     db: Session = Depends(get_db), *, employee_id: UUID
 ) -> EmployeeModel:
     """Returns an employee by id or raises an HTTPException if not found."""
-    if not (employee := EmployeeRepository.get_by_id(db, employee_id)):
+    if not (employee := EmployeeRepository.load(db, employee_id)):
         raise HTTPException(status_code=404, detail="Employee not found")
     return employee
 
 
 def get_team_by_id(db: Session = Depends(get_db), *, team_id: UUID) -> TeamModel:
     """Returns a team by id or raises an HTTPException if not found."""
-    if not (team := TeamRepository.get_by_id(db, team_id)):
+    if not (team := TeamRepository.load(db, team_id)):
         raise HTTPException(status_code=404, detail="Team not found")
     return team
 
@@ -30,6 +33,44 @@ def get_vacation_by_id(
     db: Session = Depends(get_db), *, vacation_id: UUID
 ) -> VacationModel:
     """Returns a vacation by id or raises an HTTPException if not found."""
-    if not (vacation := VacationRepository.get_by_id(db, vacation_id)):
+    if not (vacation := VacationRepository.load(db, vacation_id)):
+        raise HTTPException(status_code=404, detail="Vacation not found")
+    return vacation
+
+
+def get_month(
+    month: str = Query(..., regex=r"^\d{4}-(0[1-9]|1[0-2])$", example="2023-03")
+) -> tuple[date, date]:
+    """Returns the first and last days of a YYYY-MM month."""
+    year, month_number = (int(part) for part in month.split("-"))
+    return (
+        date(year, month_number, 1),
+        date(year, month_number, calendar.monthrange(year, month_number)[1]),
+    )
+
+
+async def get_employee_by_id_async(
+    db: AsyncSession = Depends(get_async_db), *, employee_id: UUID
+) -> EmployeeModel:
+    """Same as `get_employee_by_id`, for the async routes."""
+    if not (employee := await AsyncEmployeeRepository.load(db, employee_id)):
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return employee
+
+
+async def get_team_by_id_async(
+    db: AsyncSession = Depends(get_async_db), *, team_id: UUID
+) -> TeamModel:
+    """Same as `get_team_by_id`, for the async routes."""
+    if not (team := await AsyncTeamRepository.load(db, team_id)):
+        raise HTTPException(status_code=404, detail="Team not found")
+    return team
+
+
+async def get_vacation_by_id_async(
+    db: AsyncSession = Depends(get_async_db), *, vacation_id: UUID
+) -> VacationModel:
+    """Same as `get_vacation_by_id`, for the async routes."""
+    if not (vacation := await AsyncVacationRepository.load(db, vacation_id)):
         raise HTTPException(status_code=404, detail="Vacation not found")
     return vacation
@@ -0,0 +1,82 @@
+import codecs
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import HTTPException, Request
+
+from app.schema.vacation import ImportFormat, VacationCreate, VacationImportResult
+from app.service.vacation_import import VacationRowReader, add_import_error
+
+IMPORT_CONTENT_TYPES = {
+    "text/csv": ImportFormat.CSV,
+    "application/x-ndjson": ImportFormat.NDJSON,
+    "application/jsonl": ImportFormat.NDJSON,
+}
+
+ImportChunk = Callable[
+    [list[tuple[int, VacationCreate]]], Awaitable[VacationImportResult]
+]
+
+
+def get_import_format(request: Request) -> ImportFormat:
+    """FastAPI dependency, the import format of the request content type."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if not (format := IMPORT_CONTENT_TYPES.get(content_type)):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Content type must be one of {', '.join(IMPORT_CONTENT_TYPES)}",
+        )
+    return format
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Yields the numbered lines of an utf-8 byte stream."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line
+    if buffer := buffer + decoder.decode(b"", final=True):
+        yield line_number + 1, buffer
+
+
+async def import_vacation_rows(
+    request: Request,
+    format: ImportFormat,
+    import_chunk: ImportChunk,
+    chunk_size: int,
+) -> VacationImportResult:
+    """
+    Reads the vacation rows of the request body as they are received, and
+    gives them to `import_chunk` by chunks of `chunk_size` rows. Invalid rows
+    are reported and skipped.
+    """
+    reader = VacationRowReader(format)
+    result = VacationImportResult()
+    rows: list[tuple[int, VacationCreate]] = []
+
+    async def import_rows():
+        chunk_result = await import_chunk(rows)
+        result.rows += chunk_result.rows
+        result.created += chunk_result.created
+        result.deleted += chunk_result.deleted
+        for error in chunk_result.errors:
+            add_import_error(result, error, 0)
+        result.failed += chunk_result.failed
+
+    async for line_number, line in iter_lines(request.stream()):
+        try:
+            if (vacation := reader.read(line)) is not None:
+                rows.append((line_number, vacation))
+        except ValueError as e:
+            result.rows += 1
+            add_import_error(result, f"line {line_number}: {e}")
+        if len(rows) >= chunk_size:
+            await import_rows()
+            rows = []
+    if rows:
+        await import_rows()
+    return result
@@ -0,0 +1,107 @@
+import base64
+import json
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+TSchema = TypeVar("TSchema", bound=BaseModel)
+
+
+@dataclass
+class PageParams:
+    cursor: str | None
+    limit: int
+    stream: bool
+
+
+def get_page_params(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
+) -> PageParams:
+    """
+    FastAPI dependency for the keyset paginated endpoints.
+    `cursor` is the value of the previous page X-Next-Cursor header,
+    `stream` returns every remaining row as NDJSON instead of a page.
+    """
+    return PageParams(cursor=cursor, limit=limit, stream=stream)
+
+
+def encode_cursor(*values: Any) -> str:
+    """Returns an opaque cursor holding the keyset values of a row."""
+    return base64.urlsafe_b64encode(
+        json.dumps([str(value) for value in values]).encode()
+    ).decode()
+
+
+def decode_cursor(
+    cursor: str | None, *parsers: Callable[[str], Any]
+) -> tuple[Any, ...] | None:
+    """
+    Returns the keyset values held by the cursor, parsed with the given parsers,
+    or raises an HTTPException if the cursor is invalid.
+    """
+    if cursor is None:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(parsers):
+            raise ValueError(f"expected {len(parsers)} values, got {len(values)}")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}") from e
+
+
+def page_response(
+    response: Response,
+    models: Sequence[Any],
+    limit: int,
+    schema: Type[TSchema],
+    cursor_of: Callable[[Any], Sequence[Any]],
+) -> list[TSchema]:
+    """
+    Serializes a page fetched with `limit + 1` rows, and sets the next cursor
+    header when there are more rows to fetch.
+    """
+    if len(models) > limit:
+        models = models[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*cursor_of(models[-1]))
+    return [schema.from_orm(model) for model in models]
+
+
+def ndjson_response(
+    models: Iterable[Any] | AsyncIterable[Any], schema: Type[TSchema]
+) -> StreamingResponse:
+    """Streams the given models, sync or async iterable, as newline delimited JSON."""
+    if isinstance(models, AsyncIterable):
+        return StreamingResponse(
+            _async_ndjson_lines(models, schema), media_type=NDJSON_MEDIA_TYPE
+        )
+    return StreamingResponse(
+        (schema.from_orm(model).json() + "\n" for model in models),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+async def _async_ndjson_lines(
+    models: AsyncIterable[Any], schema: Type[TSchema]
+) -> AsyncIterator[str]:
+    async for model in models:
+        yield schema.from_orm(model).json() + "\n"
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_employee_by_id_async, get_team_by_id_async
+from app.db.session import get_async_db
+from app.model import EmployeeModel, TeamModel
+from app.repository.balance import AsyncBalanceRepository
+from app.repository.employee import AsyncEmployeeRepository
+from app.schema.balance import Balance
+from app.schema.employee import Employee, EmployeeCreate
+from app.service.asynchronous import AsyncEmployeeService
+
+router = APIRouter()
+
+
+@router.get("/{employee_id}", response_model=Employee | None)
+async def get_employee(
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+) -> Employee | None:
+    return Employee.from_orm(employee)
+
+
+@router.get("/{employee_id}/balance", response_model=Balance | None)
+async def get_employee_balance(
+    session: AsyncSession = Depends(get_async_db),
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+    at: datetime | None = None,
+) -> Balance | None:
+    """Current balance of the employee, or their balance at the given time."""
+    return await AsyncBalanceRepository.get_schema_by_employee_id(
+        session, employee.id, at
+    )
+
+
+@router.post("/", response_model=Employee)
+async def create_employee(
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    employee: EmployeeCreate,
+    balance_amount: int = 10,
+):
+    """Create a new employee with a vacation balance assigned to it"""
+    employee_model = await AsyncEmployeeService.create_with_balance(
+        session, employee_create=employee, balance_amount=balance_amount
+    )
+    return Employee.from_orm(employee_model)
+
+
+@router.put("/{employee_id}/team", status_code=status.HTTP_200_OK)
+async def add_employee_to_team(
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+    team: TeamModel = Depends(get_team_by_id_async),
+):
+    await AsyncEmployeeService.change_team(session, employee, team)
+    return {"message": f"Employee {employee.id} joined the team {team.name}"}
+
+
+@router.delete("/{employee_id}/team", status_code=status.HTTP_200_OK)
+async def remove_employee_from_team(
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+):
+    await AsyncEmployeeService.change_team(session, employee, None)
+    return {"message": f"Employee {employee.id} left the team"}
+
+
+@router.delete("/{employee_id}", status_code=status.HTTP_200_OK)
+async def delete_employee(
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+):
+    await AsyncEmployeeRepository.delete(session, employee)
+    return {"message": "Deleted employee"}
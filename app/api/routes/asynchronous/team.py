@@ -0,0 +1,97 @@
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_month, get_team_by_id_async
+from app.api.pagination import (
+    PageParams,
+    decode_cursor,
+    get_page_params,
+    ndjson_response,
+    page_response,
+)
+from app.db.session import get_async_db
+from app.model import TeamModel
+from app.repository.daily_absence import AsyncDailyAbsenceRepository
+from app.repository.employee import AsyncEmployeeRepository
+from app.repository.team import AsyncTeamRepository
+from app.schema.employee import Employee
+from app.schema.team import DailyAbsence, Team, TeamCreate
+
+router = APIRouter()
+
+
+@router.get("/{team_id}", response_model=Team | None)
+async def get_team(team: TeamModel = Depends(get_team_by_id_async)) -> Team | None:
+    return Team.from_orm(team)
+
+
+@router.get("/{team_id}/employees", response_model=list[Employee])
+async def get_team_employees(
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    team: TeamModel = Depends(get_team_by_id_async),
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+):
+    order_by = [AsyncEmployeeRepository.model.id]
+    after = decode_cursor(page.cursor, UUID)
+    if page.stream:
+        return ndjson_response(
+            AsyncEmployeeRepository.stream(
+                session, team_id=team.id, order_by=order_by, after=after
+            ),
+            Employee,
+        )
+    return page_response(
+        response,
+        await AsyncEmployeeRepository.get_page(
+            session,
+            team_id=team.id,
+            order_by=order_by,
+            after=after,
+            limit=page.limit + 1,
+        ),
+        page.limit,
+        Employee,
+        lambda employee: [employee.id],
+    )
+
+
+@router.post("/", response_model=Team)
+async def create_team(
+    session: AsyncSession = Depends(get_async_db), *, team: TeamCreate
+) -> Team:
+    """Create a new team if it doesn't exist already"""
+    if not (
+        created := await AsyncTeamRepository.create_unless_exists(session, team.dict())
+    ):
+        raise HTTPException(status_code=400, detail=f"Team {team.name} already exists")
+    return Team.from_orm(created)
+
+
+@router.get("/by_name/{name}", response_model=Team | None)
+async def get_team_by_name(
+    session: AsyncSession = Depends(get_async_db), *, name: str
+) -> Team | None:
+    """Get a team by name if it exists"""
+    if model := await AsyncTeamRepository.get_by_name(session, name):
+        return Team.from_orm(model)
+
+
+@router.get("/{team_id}/calendar", response_model=list[DailyAbsence])
+async def get_team_calendar(
+    session: AsyncSession = Depends(get_async_db),
+    *,
+    team: TeamModel = Depends(get_team_by_id_async),
+    month: tuple[date, date] = Depends(get_month),
+) -> list[DailyAbsence]:
+    """Same as the sync `get_team_calendar`."""
+    return [
+        DailyAbsence.from_orm(absence)
+        for absence in await AsyncDailyAbsenceRepository.get_by_team(
+            session, team.id, *month
+        )
+    ]
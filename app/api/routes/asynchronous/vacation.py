@@ -0,0 +1,241 @@
+from datetime import date
+from functools import partial
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_employee_by_id_async, get_vacation_by_id_async
+from app.api.importing import get_import_format, import_vacation_rows
+from app.api.pagination import (
+    PageParams,
+    decode_cursor,
+    get_page_params,
+    ndjson_response,
+    page_response,
+)
+from app.api.validation import (
+    check_employee_found,
+    check_employees_found,
+    check_team_or_employees,
+    check_vacation_employee,
+)
+from app.db.session import get_async_db
+from app.model import EmployeeModel, VacationModel
+from app.repository.employee import AsyncEmployeeRepository, EmployeeRepository
+from app.repository.team import AsyncTeamRepository
+from app.repository.vacation import AsyncVacationRepository
+from app.schema.employee import EmployeeVacationDays
+from app.schema.vacation import (
+    ComparisonFormat,
+    DatePeriod,
+    HeadcountPeriod,
+    ImportFormat,
+    Vacation,
+    VacationCreate,
+    VacationImportResult,
+    VacationType,
+)
+from app.service.asynchronous import (
+    AsyncVacationComparisonService,
+    AsyncVacationImportService,
+    AsyncVacationService,
+)
+
+router = APIRouter()
+
+
+@router.get("/search_employees_by_period", response_model=list[EmployeeVacationDays])
+async def search_employees_by_period(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    response: Response,
+    start_date: date,
+    end_date: date,
+    type: VacationType | None = None,
+    page: PageParams = Depends(get_page_params),
+):
+    """Same as the sync `search_employees_by_period`."""
+    after = decode_cursor(page.cursor, UUID)
+    after_id = None if after is None else after[0]
+    if page.stream:
+        return ndjson_response(
+            AsyncEmployeeRepository.stream_rows(
+                db,
+                EmployeeRepository.with_vacation_days(
+                    db.sync_session, start_date, end_date, type, after=after_id
+                ),
+            ),
+            EmployeeVacationDays,
+        )
+    return page_response(
+        response,
+        await AsyncVacationService.get_employees_in_vacation_page(
+            db, start_date, end_date, type, after=after_id, limit=page.limit + 1
+        ),
+        page.limit,
+        EmployeeVacationDays,
+        lambda employee: [employee.id],
+    )
+
+
+@router.get(
+    "/compare_employees_vacations", response_model=list[DatePeriod] | list[date]
+)
+async def compare_employees_vacations(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    employee_1_id: UUID,
+    employee_2_id: UUID,
+    start_date: date,
+    end_date: date,
+    format: ComparisonFormat = ComparisonFormat.PERIODS,
+) -> list[DatePeriod] | list[date]:
+    """Same as the sync `compare_employees_vacations`."""
+    employee_1, employee_2 = await AsyncEmployeeRepository.load_many(
+        db, [employee_1_id, employee_2_id]
+    )
+    employee_1 = check_employee_found(employee_1, employee_1_id)
+    employee_2 = check_employee_found(employee_2, employee_2_id)
+    if format == ComparisonFormat.DATES:
+        return await AsyncVacationComparisonService.compare_employees_vacations(
+            db, employee_1, employee_2, start_date, end_date
+        )
+    return [
+        DatePeriod(start_date=period_start, end_date=period_end)
+        for period_start, period_end in (
+            await AsyncVacationComparisonService.compare_employees_vacation_periods(
+                db, employee_1, employee_2, start_date, end_date
+            )
+        )
+    ]
+
+
+@router.get("/overlapping_periods", response_model=list[HeadcountPeriod])
+async def get_overlapping_periods(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    start_date: date,
+    end_date: date,
+    team_id: UUID | None = None,
+    employee_ids: list[UUID] | None = Query(None),
+    min_headcount: int = Query(2, ge=1),
+) -> list[HeadcountPeriod]:
+    """Same as the sync `get_overlapping_periods`."""
+    check_team_or_employees(team_id, employee_ids)
+    if team_id is not None and not await AsyncTeamRepository.load(db, team_id):
+        raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+    if employee_ids is not None:
+        check_employees_found(
+            employee_ids,
+            (
+                employee.id
+                for employee in await AsyncEmployeeRepository.load_many(
+                    db, employee_ids
+                )
+                if employee
+            ),
+        )
+    return [
+        HeadcountPeriod(
+            start_date=period_start, end_date=period_end, headcount=headcount
+        )
+        for period_start, period_end, headcount in (
+            await AsyncVacationComparisonService.get_overlapping_periods(
+                db,
+                start_date,
+                end_date,
+                min_headcount,
+                employee_ids=employee_ids,
+                team_id=team_id,
+            )
+        )
+    ]
+
+
+@router.get("/{employee_id}", response_model=list[Vacation])
+async def get_employee_vacations(
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+    db: AsyncSession = Depends(get_async_db),
+    *,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+):
+    order_by = [
+        AsyncVacationRepository.model.start_date,
+        AsyncVacationRepository.model.id,
+    ]
+    after = decode_cursor(page.cursor, date.fromisoformat, UUID)
+    if page.stream:
+        return ndjson_response(
+            AsyncVacationRepository.stream(
+                db, employee_id=employee.id, order_by=order_by, after=after
+            ),
+            Vacation,
+        )
+    return page_response(
+        response,
+        await AsyncVacationRepository.get_page(
+            db,
+            employee_id=employee.id,
+            order_by=order_by,
+            after=after,
+            limit=page.limit + 1,
+        ),
+        page.limit,
+        Vacation,
+        lambda vacation: [vacation.start_date, vacation.id],
+    )
+
+
+@router.post("/import", response_model=VacationImportResult)
+async def import_vacations(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    format: ImportFormat = Depends(get_import_format),
+) -> VacationImportResult:
+    """Same as the sync `import_vacations`."""
+    return await import_vacation_rows(
+        request,
+        format,
+        partial(AsyncVacationImportService.import_chunk, db),
+        AsyncVacationImportService.chunk_size,
+    )
+
+
+@router.post("/{employee_id}", response_model=Vacation)
+async def create_employee_vacation(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+    vacation: VacationCreate,
+) -> Vacation:
+    check_vacation_employee(employee, vacation)
+    try:
+        return Vacation.from_orm(await AsyncVacationService.create(db, vacation))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.delete("/{employee_id}/vacations/{vacation_id}", status_code=status.HTTP_200_OK)
+async def delete_vacation(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+    vacation: VacationModel = Depends(get_vacation_by_id_async),
+):
+    await AsyncVacationService.delete(db, vacation)
+    return {"message": "Vacation deleted"}
+
+
+@router.put("/{employee_id}/vacations/{vacation_id}", status_code=status.HTTP_200_OK)
+async def update_vacation(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    employee: EmployeeModel = Depends(get_employee_by_id_async),
+    vacation: VacationModel = Depends(get_vacation_by_id_async),
+    vacation_update: VacationCreate,
+):
+    await AsyncVacationService.update(db, vacation, vacation_update)
+    return {"message": "Vacation updated"}
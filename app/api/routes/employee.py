@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
@@ -24,10 +26,10 @@ def get_employee(
 def get_employee_balance(
     session: Session = Depends(get_db),
     employee: EmployeeModel = Depends(get_employee_by_id),
+    at: datetime | None = None,
 ) -> Balance | None:
-    if not (balance := BalanceRepository.get_by_employee_id(session, employee.id)):
-        return
-    return Balance.from_orm(balance)
+    """Current balance of the employee, or their balance at the given time."""
+    return BalanceRepository.get_schema_by_employee_id(session, employee.id, at)
 
 
 @router.post("/", response_model=Employee)
@@ -51,7 +53,7 @@ def add_employee_to_team(
     employee: EmployeeModel = Depends(get_employee_by_id),
     team: TeamModel = Depends(get_team_by_id),
 ):
-    EmployeeRepository.update_team(session, employee, team)
+    EmployeeService.change_team(session, employee, team)
     return {"message": f"Employee {employee.id} joined the team {team.name}"}
 
 
@@ -61,7 +63,7 @@ def remove_employee_from_team(
     *,
     employee: EmployeeModel = Depends(get_employee_by_id),
 ):
-    EmployeeRepository.remove_team(session, employee)
+    EmployeeService.change_team(session, employee, None)
     return {"message": f"Employee {employee.id} left the team"}
 
 
@@ -0,0 +1,16 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.db.session import get_pool_stats
+
+router = APIRouter()
+
+
+@router.get("/pool")
+def get_pool() -> dict[str, dict[str, Any]]:
+    """
+    Connection pool state (size, checked in and out connections, overflow) and
+    checkout metrics (count, timeouts, wait times) of each database engine.
+    """
+    return get_pool_stats()
@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from app.api.dependencies import get_team_by_id
+from app.api.dependencies import get_month, get_team_by_id
+from app.api.pagination import (
+    PageParams,
+    decode_cursor,
+    get_page_params,
+    ndjson_response,
+    page_response,
+)
 from app.db.session import get_db
 from app.model import TeamModel
+from app.repository.daily_absence import DailyAbsenceRepository
+from app.repository.employee import EmployeeRepository
 from app.repository.team import TeamRepository
 from app.schema.employee import Employee
-from app.schema.team import Team, TeamCreate
+from app.schema.team import DailyAbsence, Team, TeamCreate
 
 router = APIRouter()
 
@@ -17,16 +29,43 @@ def get_team(team: TeamModel = Depends(get_team_by_id)) -> Team | None:
 
 
 @router.get("/{team_id}/employees", response_model=list[Employee])
-def get_team_employees(team: TeamModel = Depends(get_team_by_id)) -> list[Employee]:
-    return [Employee.from_orm(model) for model in team.employees]
+def get_team_employees(
+    session: Session = Depends(get_db),
+    *,
+    team: TeamModel = Depends(get_team_by_id),
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+):
+    order_by = [EmployeeRepository.model.id]
+    after = decode_cursor(page.cursor, UUID)
+    if page.stream:
+        return ndjson_response(
+            EmployeeRepository.stream(
+                session, team_id=team.id, order_by=order_by, after=after
+            ),
+            Employee,
+        )
+    return page_response(
+        response,
+        EmployeeRepository.get_page(
+            session,
+            team_id=team.id,
+            order_by=order_by,
+            after=after,
+            limit=page.limit + 1,
+        ),
+        page.limit,
+        Employee,
+        lambda employee: [employee.id],
+    )
 
 
 @router.post("/", response_model=Team)
 def create_team(session: Session = Depends(get_db), *, team: TeamCreate) -> Team:
     """Create a new team if it doesn't exist already"""
-    if TeamRepository.get_by_name(session, team.name):
+    if not (created := TeamRepository.create_unless_exists(session, team.dict())):
         raise HTTPException(status_code=400, detail=f"Team {team.name} already exists")
-    return Team.from_orm(TeamRepository.create(session=session, obj_in=team.dict()))
+    return Team.from_orm(created)
 
 
 @router.get("/by_name/{name}", response_model=Team | None)
@@ -34,3 +73,20 @@ def get_team_by_name(session: Session = Depends(get_db), *, name: str) -> Team |
     """Get a team by name if it exists"""
     if model := TeamRepository.get_by_name(session=session, name=name):
         return Team.from_orm(model)
+
+
+@router.get("/{team_id}/calendar", response_model=list[DailyAbsence])
+def get_team_calendar(
+    session: Session = Depends(get_db),
+    *,
+    team: TeamModel = Depends(get_team_by_id),
+    month: tuple[date, date] = Depends(get_month),
+) -> list[DailyAbsence]:
+    """
+    Days of the month (YYYY-MM) with members of the team on vacation, with
+    who is out. Days without anyone out are left out.
+    """
+    return [
+        DailyAbsence.from_orm(absence)
+        for absence in DailyAbsenceRepository.get_by_team(session, team.id, *month)
+    ]
@@ -1,39 +1,86 @@
 from datetime import date
+from functools import partial
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_employee_by_id, get_vacation_by_id
+from app.api.importing import get_import_format, import_vacation_rows
+from app.api.pagination import (
+    PageParams,
+    decode_cursor,
+    get_page_params,
+    ndjson_response,
+    page_response,
+)
+from app.api.validation import (
+    check_employee_found,
+    check_employees_found,
+    check_team_or_employees,
+    check_vacation_employee,
+)
 from app.db.session import get_db
 from app.model import EmployeeModel, VacationModel
 from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
 from app.repository.vacation import VacationRepository
-from app.schema.employee import Employee
-from app.schema.vacation import Vacation, VacationCreate, VacationType
+from app.schema.employee import EmployeeVacationDays
+from app.schema.vacation import (
+    ComparisonFormat,
+    DatePeriod,
+    HeadcountPeriod,
+    ImportFormat,
+    Vacation,
+    VacationCreate,
+    VacationImportResult,
+    VacationType,
+)
 from app.service.vacation import VacationService
 from app.service.vacation_comparison import VacationComparisonService
+from app.service.vacation_import import VacationImportService
 
 router = APIRouter()
 
 
-@router.get("/search_employees_by_period", response_model=list[Employee])
+@router.get("/search_employees_by_period", response_model=list[EmployeeVacationDays])
 def search_employees_by_period(
     *,
     db: Session = Depends(get_db),
+    response: Response,
     start_date: date,
     end_date: date,
     type: VacationType | None = None,
-) -> list[Employee]:
-    return [
-        Employee.from_orm(model)
-        for model in VacationService.get_employees_in_vacation(
-            db, start_date, end_date, type
+    page: PageParams = Depends(get_page_params),
+):
+    """
+    Employees with a vacation in the period, with the number of days and of
+    working days of their vacations in it.
+    """
+    after = decode_cursor(page.cursor, UUID)
+    after_id = None if after is None else after[0]
+    if page.stream:
+        return ndjson_response(
+            VacationService.stream_employees_in_vacation(
+                db, start_date, end_date, type, after=after_id
+            ),
+            EmployeeVacationDays,
         )
-    ]
+    return page_response(
+        response,
+        VacationService.get_employees_in_vacation_page(
+            db, start_date, end_date, type, after=after_id, limit=page.limit + 1
+        ),
+        page.limit,
+        EmployeeVacationDays,
+        lambda employee: [employee.id],
+    )
 
 
-@router.get("/compare_employees_vacations", response_model=list[date])
+@router.get(
+    "/compare_employees_vacations", response_model=list[DatePeriod] | list[date]
+)
 def compare_employees_vacations(
     *,
     db: Session = Depends(get_db),
@@ -41,30 +88,126 @@ def compare_employees_vacations(
     employee_2_id: UUID,
     start_date: date,
     end_date: date,
-) -> list[date]:
-    if not (employee_1 := EmployeeRepository.get_by_id(db, employee_1_id)):
-        raise HTTPException(
-            status_code=404, detail=f"Employee {employee_1_id} not found"
+    format: ComparisonFormat = ComparisonFormat.PERIODS,
+) -> list[DatePeriod] | list[date]:
+    """
+    Returns the periods during which both employees are on vacation,
+    or every shared date with `format=dates`.
+    """
+    employee_1, employee_2 = EmployeeRepository.load_many(
+        db, [employee_1_id, employee_2_id]
+    )
+    employee_1 = check_employee_found(employee_1, employee_1_id)
+    employee_2 = check_employee_found(employee_2, employee_2_id)
+    if format == ComparisonFormat.DATES:
+        return VacationComparisonService.compare_employees_vacations(
+            db, employee_1, employee_2, start_date, end_date
         )
-    if not (employee_2 := EmployeeRepository.get_by_id(db, employee_2_id)):
-        raise HTTPException(
-            status_code=404, detail=f"Employee {employee_2_id} not found"
+    return [
+        DatePeriod(start_date=period_start, end_date=period_end)
+        for period_start, period_end in (
+            VacationComparisonService.compare_employees_vacation_periods(
+                db, employee_1, employee_2, start_date, end_date
+            )
         )
-    return VacationComparisonService.compare_employees_vacations(
-        db, employee_1, employee_2, start_date, end_date
-    )
+    ]
 
 
-@router.get("/{employee_id}", response_model=list[Vacation])
-def get_employee_vacations(
-    employee: EmployeeModel = Depends(get_employee_by_id), db: Session = Depends(get_db)
-) -> list[Vacation]:
+@router.get("/overlapping_periods", response_model=list[HeadcountPeriod])
+def get_overlapping_periods(
+    *,
+    db: Session = Depends(get_db),
+    start_date: date,
+    end_date: date,
+    team_id: UUID | None = None,
+    employee_ids: list[UUID] | None = Query(None),
+    min_headcount: int = Query(2, ge=1),
+) -> list[HeadcountPeriod]:
+    """
+    Returns the periods during which at least `min_headcount` members of the team,
+    or of the given employees, are on vacation at the same time.
+    """
+    check_team_or_employees(team_id, employee_ids)
+    if team_id is not None and not TeamRepository.load(db, team_id):
+        raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+    if employee_ids is not None:
+        check_employees_found(
+            employee_ids,
+            (
+                employee.id
+                for employee in EmployeeRepository.load_many(db, employee_ids)
+                if employee
+            ),
+        )
     return [
-        Vacation.from_orm(model)
-        for model in VacationRepository.get_many(db, employee_id=employee.id)
+        HeadcountPeriod(
+            start_date=period_start, end_date=period_end, headcount=headcount
+        )
+        for period_start, period_end, headcount in (
+            VacationComparisonService.get_overlapping_periods(
+                db,
+                start_date,
+                end_date,
+                min_headcount,
+                employee_ids=employee_ids,
+                team_id=team_id,
+            )
+        )
     ]
 
 
+@router.get("/{employee_id}", response_model=list[Vacation])
+def get_employee_vacations(
+    employee: EmployeeModel = Depends(get_employee_by_id),
+    db: Session = Depends(get_db),
+    *,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+):
+    order_by = [VacationRepository.model.start_date, VacationRepository.model.id]
+    after = decode_cursor(page.cursor, date.fromisoformat, UUID)
+    if page.stream:
+        return ndjson_response(
+            VacationRepository.stream(
+                db, employee_id=employee.id, order_by=order_by, after=after
+            ),
+            Vacation,
+        )
+    return page_response(
+        response,
+        VacationRepository.get_page(
+            db,
+            employee_id=employee.id,
+            order_by=order_by,
+            after=after,
+            limit=page.limit + 1,
+        ),
+        page.limit,
+        Vacation,
+        lambda vacation: [vacation.start_date, vacation.id],
+    )
+
+
+@router.post("/import", response_model=VacationImportResult)
+async def import_vacations(
+    *,
+    db: Session = Depends(get_db),
+    request: Request,
+    format: ImportFormat = Depends(get_import_format),
+) -> VacationImportResult:
+    """
+    Imports vacations from a CSV (employee_id,start_date,end_date,type header)
+    or NDJSON request body, merging them with each other and with the existing
+    vacations. Rows are committed by chunks, invalid rows are reported and skipped.
+    """
+    return await import_vacation_rows(
+        request,
+        format,
+        partial(run_in_threadpool, VacationImportService.import_chunk, db),
+        VacationImportService.chunk_size,
+    )
+
+
 @router.post("/{employee_id}", response_model=Vacation)
 def create_employee_vacation(
     *,
@@ -72,12 +215,7 @@ def create_employee_vacation(
     employee: EmployeeModel = Depends(get_employee_by_id),
     vacation: VacationCreate,
 ) -> Vacation:
-    # check that the employee id in the path matches the employee id in the body
-    if employee.id != vacation.employee_id:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Employee id in path ({employee.id}) does not match employee id in body ({vacation.employee_id})",
-        )
+    check_vacation_employee(employee, vacation)
     try:
         return Vacation.from_orm(VacationService.create(db, vacation))
     except ValueError as e:
@@ -85,13 +223,13 @@ def create_employee_vacation(
 
 
 @router.delete("/{employee_id}/vacations/{vacation_id}", status_code=status.HTTP_200_OK)
-async def delete_vacation(
+def delete_vacation(
     *,
     db: Session = Depends(get_db),
     employee: EmployeeModel = Depends(get_employee_by_id),
     vacation: VacationModel = Depends(get_vacation_by_id),
 ):
-    VacationRepository.delete(db, vacation)
+    VacationService.delete(db, vacation)
     return {"message": "Vacation deleted"}
 
 
@@ -0,0 +1,43 @@
+from typing import Iterable
+from uuid import UUID
+
+from fastapi import HTTPException
+
+from app.model import EmployeeModel
+from app.schema.vacation import VacationCreate
+
+
+def check_employee_found(
+    employee: EmployeeModel | None, employee_id: UUID
+) -> EmployeeModel:
+    """Returns the employee or raises an HTTPException if not found."""
+    if not employee:
+        raise HTTPException(status_code=404, detail=f"Employee {employee_id} not found")
+    return employee
+
+
+def check_employees_found(employee_ids: list[UUID], found_ids: Iterable[UUID]):
+    """Raises an HTTPException listing the employees not found, if any."""
+    found_ids = set(found_ids)
+    if missing_ids := [str(id) for id in employee_ids if id not in found_ids]:
+        raise HTTPException(
+            status_code=404, detail=f"Employees {', '.join(missing_ids)} not found"
+        )
+
+
+def check_team_or_employees(team_id: UUID | None, employee_ids: list[UUID] | None):
+    """Raises an HTTPException unless exactly one of the filters is given."""
+    if (team_id is None) == (employee_ids is None):
+        raise HTTPException(
+            status_code=400, detail="Either team_id or employee_ids must be given"
+        )
+
+
+def check_vacation_employee(employee: EmployeeModel, vacation: VacationCreate):
+    """Raises an HTTPException if the vacation is not the one of the employee."""
+    # check that the employee id in the path matches the employee id in the body
+    if employee.id != vacation.employee_id:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Employee id in path ({employee.id}) does not match employee id in body ({vacation.employee_id})",
+        )
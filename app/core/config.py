@@ -11,6 +11,46 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn]
+    # connection pool, per engine and per process
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # ? seconds waited for a free connection before failing the request
+    DB_POOL_TIMEOUT: float = 10
+    # ? seconds after which a connection is replaced, -1 to keep them forever
+    DB_POOL_RECYCLE: int = 1800
+    # ? checks the connections on checkout, drops the stale ones (failovers)
+    DB_POOL_PRE_PING: bool = True
+    # ? milliseconds, None for no timeout. Off by default, the management jobs
+    # ? share the setting and run long statements
+    DB_STATEMENT_TIMEOUT: int | None = None
+    # ? behind PgBouncer in transaction mode: no server side prepared statements
+    # ? and no startup parameters
+    DB_PGBOUNCER: bool = False
+    # read replicas, used by the read-only requests of the sync routes
+    # ? a JSON list in the environment: ["postgresql://...", ...]
+    SQLALCHEMY_REPLICA_URIS: list[str] = []
+    # ? seconds, replicas lagging more are skipped until they catch up
+    DB_REPLICA_MAX_LAG: float = 5
+    # ? seconds between two lag checks of a replica
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 1
+    # ? seconds during which a client reads from the primary after a write,
+    # ? so that it reads its own writes
+    DB_REPLICA_STICKY_SECONDS: int = 30
+    # process-level cache of the teams, see `RepositoryCache`
+    # ? seconds during which a cached team is served without query
+    TEAM_CACHE_TTL: float = 300
+    TEAM_CACHE_MAX_SIZE: int = 1024
+    # ? PostgreSQL NOTIFY channel broadcasting the cache invalidations to the
+    # ? other processes, the caches are only cleared locally when not set
+    CACHE_INVALIDATION_CHANNEL: Optional[str]
+    # logging of the app loggers, as JSON lines on stdout
+    LOG_LEVEL: str = "INFO"
+    # ? fraction of the records under WARNING that are kept, the others are
+    # ? dropped before being formatted
+    LOG_SAMPLE_RATE: float = 1
+    # ? serves the routes with async handlers, over an asyncpg engine
+    ASYNC_DATABASE: bool = False
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str]
 
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def database_uri(cls, val, values):
@@ -24,5 +64,13 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    @validator("SQLALCHEMY_ASYNC_DATABASE_URI", pre=True)
+    def async_database_uri(cls, val, values):
+        if isinstance(val, str):
+            return val
+        if not (uri := values.get("SQLALCHEMY_DATABASE_URI")):
+            return None
+        return uri.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 
 settings = Settings()
@@ -0,0 +1,81 @@
+import copy
+import json
+import logging
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Any
+
+# ? root of the loggers of the app, modules log with logging.getLogger(__name__)
+APP_LOGGER = "app"
+# ? attributes of every log record, the other ones are the fields given in `extra`
+_RECORD_ATTRIBUTES = {*vars(logging.makeLogRecord({})), "message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger and message, plus the
+    structured fields given with `extra`, e.g.
+    logger.info("vacation created", extra={"vacation_id": vacation.id}).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES
+        )
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a `rate` fraction of the records under WARNING, and all the others."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # ? the message is rendered right away, its arguments could change
+        # ? meanwhile, the record is formatted by the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging(level: str, sample_rate: float) -> QueueListener:
+    """
+    Sends the records of the app loggers at `level` or above, sampled with
+    `sample_rate`, to a queue. A listener thread formats them as JSON and
+    writes them to stdout, so that the requests never wait on the output.
+    Returns the started listener, to be stopped on shutdown.
+    """
+    log_queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(sample_rate))
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    logger = logging.getLogger(APP_LOGGER)
+    logger.setLevel(level)
+    logger.handlers = [handler]
+    logger.propagate = False
+
+    listener = QueueListener(log_queue, output)
+    listener.start()
+    return listener
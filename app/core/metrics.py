@@ -0,0 +1,251 @@
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from prometheus_client import Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Router
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of the HTTP requests, until their response is sent",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"]
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of the database statements, by repository method",
+    ["repository", "method"],
+)
+
+# ? route label of the requests matching no route, to bound the label values
+UNMATCHED_ROUTE = "unmatched"
+# ? repository method running, see `instrument_repository`
+NO_OPERATION = ("none", "none")
+_operation: ContextVar[tuple[str, str]] = ContextVar(
+    "repository_operation", default=NO_OPERATION
+)
+# ? key of the connection info holding the start times of the running statements
+QUERY_START_TIMES = "query_start_times"
+
+
+class MetricsMiddleware:
+    """
+    Times the HTTP requests, until their whole response is sent, and counts
+    the ones in progress. Requests are labelled with the path of their route,
+    `/team/{team_id}` rather than the requested path.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._routes: dict[Callable[..., Any], str] | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(scope["method"])
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            REQUEST_DURATION.labels(
+                scope["method"], self._get_route(scope), status
+            ).observe(time.perf_counter() - start)
+
+    def _get_route(self, scope: Scope) -> str:
+        # ? the router sets the endpoint of the matched route in the scope
+        if self._routes is None:
+            router: Router = scope["app"].router
+            self._routes = {
+                route.endpoint: route.path  # type: ignore[attr-defined]
+                for route in router.routes
+                if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), UNMATCHED_ROUTE)  # type: ignore[arg-type]
+
+
+def instrument_repository(repository: Any, name: str) -> None:
+    """
+    Labels the statements run by the public methods of the repository with
+    its name and the method name, see `DB_QUERY_DURATION`. Statements are
+    labelled with the outermost method, the one called by the services.
+    """
+    for attribute in dir(type(repository)):
+        method = getattr(type(repository), attribute)
+        if attribute.startswith("_") or not inspect.isfunction(method):
+            continue
+        bound_method = getattr(repository, attribute)
+        operation = (name, attribute)
+        if inspect.isasyncgenfunction(method):
+            tracked = _track_async_generator(operation, bound_method)
+        elif inspect.iscoroutinefunction(method):
+            tracked = _track_coroutine(operation, bound_method)
+        elif inspect.isgeneratorfunction(method):
+            tracked = _track_generator(operation, bound_method)
+        else:
+            tracked = _track(operation, bound_method)
+        setattr(repository, attribute, tracked)
+
+
+@contextmanager
+def _running(operation: tuple[str, str]) -> Iterator[None]:
+    if _operation.get() is not NO_OPERATION:
+        yield
+        return
+    token = _operation.set(operation)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def _track(operation: tuple[str, str], method: Callable) -> Callable:
+    @wraps(method)
+    def tracked(*args: Any, **kwargs: Any) -> Any:
+        with _running(operation):
+            return method(*args, **kwargs)
+
+    return tracked
+
+
+def _track_coroutine(operation: tuple[str, str], method: Callable) -> Callable:
+    @wraps(method)
+    async def tracked(*args: Any, **kwargs: Any) -> Any:
+        with _running(operation):
+            return await method(*args, **kwargs)
+
+    return tracked
+
+
+def _track_generator(operation: tuple[str, str], method: Callable) -> Callable:
+    # ? labelled while computing each item only, not while the caller uses it
+    @wraps(method)
+    def tracked(*args: Any, **kwargs: Any) -> Iterator[Any]:
+        iterator = method(*args, **kwargs)
+        while True:
+            with _running(operation):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    return tracked
+
+
+def _track_async_generator(operation: tuple[str, str], method: Callable) -> Callable:
+    @wraps(method)
+    async def tracked(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        iterator = method(*args, **kwargs)
+        while True:
+            with _running(operation):
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+
+    return tracked
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault(QUERY_START_TIMES, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _observe_query(connection, cursor, statement, parameters, context, executemany):
+    start = connection.info[QUERY_START_TIMES].pop()
+    DB_QUERY_DURATION.labels(*_operation.get()).observe(time.perf_counter() - start)
+
+
+@event.listens_for(Engine, "handle_error")
+def _forget_query_timer(context) -> None:
+    if context.connection is not None and (
+        start_times := context.connection.info.get(QUERY_START_TIMES)
+    ):
+        start_times.pop()
+
+
+class PoolCollector:
+    """
+    Exposes the state and checkout metrics of the connection pools, read from
+    `get_pool_stats` at each scrape.
+    """
+
+    def __init__(self, get_pool_stats: Callable[[], dict[str, dict[str, Any]]]):
+        self.get_pool_stats = get_pool_stats
+
+    def collect(self) -> Iterator[GaugeMetricFamily | CounterMetricFamily]:
+        gauges = {
+            key: GaugeMetricFamily(
+                f"db_pool_{key}", f"Connections {key} of the pool", labels=["engine"]
+            )
+            for key in ("size", "checked_in", "checked_out", "overflow")
+        }
+        counters = {
+            "checkouts": CounterMetricFamily(
+                "db_pool_checkouts", "Connection checkouts", labels=["engine"]
+            ),
+            "timeouts": CounterMetricFamily(
+                "db_pool_timeouts",
+                "Checkouts timed out waiting for a connection",
+                labels=["engine"],
+            ),
+            "wait_seconds_total": CounterMetricFamily(
+                "db_pool_wait_seconds",
+                "Time spent waiting for a connection",
+                labels=["engine"],
+            ),
+        }
+        for engine, stats in self.get_pool_stats().items():
+            for key, metric in (gauges | counters).items():
+                metric.add_metric([engine], stats[key])
+        yield from gauges.values()
+        yield from counters.values()
+
+
+class CalendarCacheCollector:
+    """
+    Exposes the hits and misses of the year caches of the workday calendars
+    built so far, read from `get_workday_calendars` at each scrape.
+    """
+
+    def __init__(self, get_workday_calendars: Callable[[], dict[str, Any]]):
+        self.get_workday_calendars = get_workday_calendars
+
+    def collect(self) -> Iterator[GaugeMetricFamily | CounterMetricFamily]:
+        hits = CounterMetricFamily(
+            "calendar_cache_hits", "Years served from the cache", labels=["timezone"]
+        )
+        misses = CounterMetricFamily(
+            "calendar_cache_misses", "Years computed", labels=["timezone"]
+        )
+        size = GaugeMetricFamily(
+            "calendar_cache_years", "Years in the cache", labels=["timezone"]
+        )
+        for timezone, calendar in self.get_workday_calendars().items():
+            info = calendar.cache_info()
+            hits.add_metric([timezone], info.hits)
+            misses.add_metric([timezone], info.misses)
+            size.add_metric([timezone], info.currsize)
+        yield from (hits, misses, size)
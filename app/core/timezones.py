@@ -0,0 +1,11 @@
+# ? workalendar calendar class of each supported timezone, as "module.Class"
+# ? paths, imported the first time a calendar of the timezone is needed, see
+# ? `get_calendar_for_tz`
+CALENDAR_CLASSES = {
+    "Europe/Paris": "workalendar.europe.france.France",
+    "Europe/Berlin": "workalendar.europe.germany.Germany",
+    "Europe/London": "workalendar.europe.united_kingdom.UnitedKingdom",
+    "Europe/Madrid": "workalendar.europe.spain.Spain",
+    "America/New_York": "workalendar.usa.core.UnitedStates",
+}
+SUPPORTED_TIMEZONES = tuple(CALENDAR_CLASSES)
@@ -0,0 +1,62 @@
+from typing import Any
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+
+from fastapi_utils.session import FastAPISessionMaker
+
+from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+
+class SessionMaker(FastAPISessionMaker):
+    """FastAPISessionMaker with the engine configured by the DB_* settings"""
+
+    def get_new_engine(self) -> Engine:
+        return configure_engine(
+            create_engine(self.database_uri, **get_engine_options())
+        )
+
+
+def get_engine_options(is_async: bool = False) -> dict[str, Any]:
+    """`create_engine` arguments for the pool and connection settings"""
+    connect_args: dict[str, Any] = {}
+    if settings.DB_PGBOUNCER:
+        if is_async:
+            # ? psycopg2 never prepares statements, asyncpg does by default
+            connect_args |= {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+    elif settings.DB_STATEMENT_TIMEOUT:
+        if is_async:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)
+            }
+        else:
+            connect_args[
+                "options"
+            ] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def configure_engine(engine: Engine) -> Engine:
+    """Registers the connection settings that cannot be startup parameters"""
+    if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT:
+        # ? PgBouncer rejects startup parameters and shares the server
+        # ? connections, so the timeout is set for each transaction only
+        @event.listens_for(engine, "begin")
+        def set_statement_timeout(connection: Connection):
+            connection.exec_driver_sql(
+                f"SET LOCAL statement_timeout = {settings.DB_STATEMENT_TIMEOUT}"
+            )
+
+    return engine
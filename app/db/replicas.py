@@ -0,0 +1,75 @@
+import itertools
+import math
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.engine import SessionMaker
+
+# ? 0 when the replica replayed everything it received, otherwise the age of
+# ? the last replayed transaction
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    """Session maker of a read replica, aware of its replication lag."""
+
+    def __init__(self, uri: str):
+        self.sessionmaker = SessionMaker(uri)
+        self._lag: float | None = None
+        self._checked_at = -math.inf
+        self._lock = threading.Lock()
+
+    def lag(self) -> float | None:
+        """
+        Returns the replication lag in seconds, None if the replica is
+        unreachable. The lag is checked at most every
+        DB_REPLICA_LAG_CHECK_INTERVAL, by a single request at a time.
+        """
+        now = time.monotonic()
+        if (
+            now - self._checked_at >= settings.DB_REPLICA_LAG_CHECK_INTERVAL
+            and self._lock.acquire(blocking=False)
+        ):
+            try:
+                self._lag = self._check_lag()
+                self._checked_at = now
+            finally:
+                self._lock.release()
+        return self._lag
+
+    def _check_lag(self) -> float | None:
+        try:
+            with self.sessionmaker.cached_engine.connect() as connection:
+                return float(connection.execute(LAG_QUERY).scalar() or 0)
+        except SQLAlchemyError:
+            return None
+
+
+class ReplicaRouter:
+    """Spreads the reads over the replicas that are up to date enough."""
+
+    def __init__(self, uris: list[str]):
+        self.replicas = [Replica(uri) for uri in uris]
+        self._next = itertools.count()
+
+    def pick(self) -> Replica | None:
+        """
+        Returns the next replica, round robin, skipping the ones lagging more
+        than DB_REPLICA_MAX_LAG. None if there is no such replica, the reads
+        then go to the primary.
+        """
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if (
+                lag := replica.lag()
+            ) is not None and lag <= settings.DB_REPLICA_MAX_LAG:
+                return replica
+        return None
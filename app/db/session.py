@@ -1,19 +1,98 @@
 from functools import lru_cache
-from typing import Iterator
+from typing import Any, AsyncIterator, Iterator
 
-from sqlalchemy.orm import Session
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from fastapi_utils.session import FastAPISessionMaker
 
 from app.core.config import settings
+from app.db.engine import SessionMaker, configure_engine, get_engine_options
+from app.db.replicas import ReplicaRouter
 
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+# ? set after a write, the client reads from the primary while it is present
+PRIMARY_STICKY_COOKIE = "db_primary"
 
-def get_db() -> Iterator[Session]:
-    """FastAPI dependency that provides a sqlalchemy session"""
+
+def get_db(request: Request, response: Response) -> Iterator[Session]:
+    """
+    FastAPI dependency that provides a sqlalchemy session.
+    Read-only requests get a replica session when replicas are configured,
+    unless the client wrote recently (read-your-writes) or every replica lags.
+    """
+    if not settings.SQLALCHEMY_REPLICA_URIS:
+        yield from _get_fastapi_sessionmaker().get_db()
+        return
+    if request.method not in READ_ONLY_METHODS:
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            "1",
+            max_age=settings.DB_REPLICA_STICKY_SECONDS,
+            httponly=True,
+        )
+    elif PRIMARY_STICKY_COOKIE not in request.cookies and (
+        replica := _get_replica_router().pick()
+    ):
+        yield from replica.sessionmaker.get_db()
+        return
     yield from _get_fastapi_sessionmaker().get_db()
 
 
 @lru_cache()
 def _get_fastapi_sessionmaker() -> FastAPISessionMaker:
     """This function could be replaced with a global variable if preferred"""
-    return FastAPISessionMaker(settings.SQLALCHEMY_DATABASE_URI)
+    return SessionMaker(settings.SQLALCHEMY_DATABASE_URI)
+
+
+@lru_cache()
+def _get_replica_router() -> ReplicaRouter:
+    return ReplicaRouter(settings.SQLALCHEMY_REPLICA_URIS)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency that provides an async sqlalchemy session, committed
+    after the response like the `get_db` one
+    """
+    async with _get_async_sessionmaker()() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+@lru_cache()
+def _get_async_engine() -> AsyncEngine:
+    engine = create_async_engine(
+        settings.SQLALCHEMY_ASYNC_DATABASE_URI,  # type: ignore
+        **get_engine_options(is_async=True),
+    )
+    configure_engine(engine.sync_engine)
+    return engine
+
+
+@lru_cache()
+def _get_async_sessionmaker() -> sessionmaker:
+    # ? the objects are used on the event loop after the commits of the
+    # ? repositories, they must not be expired and lazy loaded there
+    return sessionmaker(
+        _get_async_engine(),
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+def get_pool_stats() -> dict[str, dict[str, Any]]:
+    """State and checkout metrics of the connection pool of each engine"""
+    engines = {"sync": _get_fastapi_sessionmaker().cached_engine}
+    if settings.ASYNC_DATABASE:
+        engines["async"] = _get_async_engine().sync_engine
+    if settings.SQLALCHEMY_REPLICA_URIS:
+        for n, replica in enumerate(_get_replica_router().replicas):
+            engines[f"replica_{n}"] = replica.sessionmaker.cached_engine
+    return {name: engine.pool.stats() for name, engine in engines.items()}  # type: ignore
@@ -1,7 +1,13 @@
 from fastapi import FastAPI
+from prometheus_client import REGISTRY
 
 from app.api import add_app_routes
 from app.core.config import settings
+from app.core.logging import configure_logging
+from app.core.metrics import CalendarCacheCollector, MetricsMiddleware, PoolCollector
+from app.db.session import get_pool_stats
+from app.repository.cache import PostgresInvalidationChannel, set_invalidation_channel
+from app.service.workdays import get_workday_calendars
 
 
 app = FastAPI(
@@ -10,3 +16,17 @@ app = FastAPI(
 )
 
 add_app_routes(app)
+app.add_middleware(MetricsMiddleware)
+REGISTRY.register(PoolCollector(get_pool_stats))
+REGISTRY.register(CalendarCacheCollector(get_workday_calendars))
+
+log_listener = configure_logging(settings.LOG_LEVEL, settings.LOG_SAMPLE_RATE)
+app.add_event_handler("shutdown", log_listener.stop)
+
+if settings.CACHE_INVALIDATION_CHANNEL:
+    set_invalidation_channel(
+        PostgresInvalidationChannel(
+            settings.SQLALCHEMY_DATABASE_URI,  # type: ignore
+            settings.CACHE_INVALIDATION_CHANNEL,
+        )
+    )
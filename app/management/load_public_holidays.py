@@ -0,0 +1,59 @@
+"""
+Stores the public holidays of the supported timezones in the public_holiday
+table, used to count the working days in SQL. Meant to be run once a year, and
+after a change of the holiday rules:
+
+    python -m app.management.load_public_holidays --from-year 2020 --to-year 2030
+"""
+import argparse
+from datetime import date
+
+from app.core.timezones import SUPPORTED_TIMEZONES
+from app.db.session import _get_fastapi_sessionmaker
+from app.repository.public_holiday import PublicHolidayRepository
+from app.service.workdays import get_public_holidays
+
+# ? years loaded around the current one by default
+DEFAULT_YEARS_BEFORE = 5
+DEFAULT_YEARS_AFTER = 5
+
+
+def main(argv: list[str] | None = None) -> None:
+    current_year = date.today().year
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--from-year", type=int, default=current_year - DEFAULT_YEARS_BEFORE
+    )
+    parser.add_argument(
+        "--to-year", type=int, default=current_year + DEFAULT_YEARS_AFTER
+    )
+    parser.add_argument(
+        "--timezone",
+        action="append",
+        choices=SUPPORTED_TIMEZONES,
+        help="defaults to every supported timezone",
+    )
+    args = parser.parse_args(argv)
+
+    with _get_fastapi_sessionmaker().context_session() as session:
+        for timezone in args.timezone or SUPPORTED_TIMEZONES:
+            holidays = {
+                day: name
+                for year in range(args.from_year, args.to_year + 1)
+                for day, name in get_public_holidays(timezone, year).items()
+            }
+            PublicHolidayRepository.replace(
+                session,
+                timezone,
+                date(args.from_year, 1, 1),
+                date(args.to_year, 12, 31),
+                holidays,
+            )
+            print(
+                f"Loaded {len(holidays)} public holidays of {timezone} "
+                f"from {args.from_year} to {args.to_year}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Prices the vacations of every employee again, and appends an adjustment to the
+balance ledger of the ones whose recorded vacation costs differ. Meant to be
+run, with the vacation writes stopped, after a fix of the holiday rules or a
+bad import:
+
+    python -m app.management.recompute_balances --workers 4
+
+The last committed employee is saved in the checkpoint file, an interrupted run
+resumes right after it. The file is removed once every employee is done.
+"""
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from uuid import UUID
+
+from app.db.session import _get_fastapi_sessionmaker
+from app.repository.employee import EmployeeRepository
+from app.service.balance_recompute import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_IN_FLIGHT,
+    BalanceRecomputeService,
+)
+
+DEFAULT_CHECKPOINT = "recompute_balances.checkpoint"
+
+
+def read_checkpoint(path: Path) -> UUID | None:
+    if not path.exists():
+        return None
+    return UUID(path.read_text().strip())
+
+
+def write_checkpoint(path: Path, employee_id: UUID) -> None:
+    # ? replaced atomically, an interruption never leaves a partial file
+    temporary_path = path.with_name(f"{path.name}.tmp")
+    temporary_path.write_text(str(employee_id))
+    os.replace(temporary_path, path)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="employees priced together by a worker",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help="batches read ahead of the last committed one",
+    )
+    parser.add_argument("--checkpoint", type=Path, default=Path(DEFAULT_CHECKPOINT))
+    parser.add_argument(
+        "--restart", action="store_true", help="ignore the checkpoint file"
+    )
+    args = parser.parse_args(argv)
+
+    after = None if args.restart else read_checkpoint(args.checkpoint)
+    service = replace(
+        BalanceRecomputeService,
+        batch_size=args.batch_size,
+        max_in_flight=args.max_in_flight,
+    )
+    sessionmaker = _get_fastapi_sessionmaker()
+    # ? spawned workers do not inherit the database connections of this process
+    with (
+        ProcessPoolExecutor(
+            args.workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor,
+        sessionmaker.context_session() as read_session,
+        sessionmaker.context_session() as write_session,
+    ):
+        total = EmployeeRepository.count(read_session)
+        done = 0
+        if after is not None:
+            done = EmployeeRepository.count(
+                read_session, EmployeeRepository.model.id <= after
+            )
+            print(f"Resuming after employee {after}, {done}/{total} employees done")
+        adjusted = 0
+        for progress in service.recompute(
+            read_session, write_session, executor, after=after
+        ):
+            write_checkpoint(args.checkpoint, progress.last_employee_id)
+            done += progress.employees
+            adjusted += progress.adjusted
+            print(f"{done}/{total} employees, {adjusted} balances adjusted")
+    args.checkpoint.unlink(missing_ok=True)
+    print(f"Recomputed the balances, {adjusted} adjusted")
+
+
+if __name__ == "__main__":
+    main()
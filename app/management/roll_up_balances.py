@@ -0,0 +1,34 @@
+"""
+Rolls the balance ledger entries up into the balance snapshots, so that reading
+a balance only sums the few entries created since. Meant to be run periodically:
+
+    python -m app.management.roll_up_balances --grace-minutes 60
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from app.db.session import _get_fastapi_sessionmaker
+from app.repository.balance import BalanceRepository
+
+# ? must be longer than the longest transaction writing ledger entries
+DEFAULT_GRACE_MINUTES = 60
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--grace-minutes",
+        type=int,
+        default=DEFAULT_GRACE_MINUTES,
+        help="only roll up the entries older than this",
+    )
+    args = parser.parse_args(argv)
+
+    until = datetime.utcnow() - timedelta(minutes=args.grace_minutes)
+    with _get_fastapi_sessionmaker().context_session() as session:
+        count = BalanceRepository.roll_up(session, until)
+    print(f"Rolled up {count} balances until {until.isoformat()}")
+
+
+if __name__ == "__main__":
+    main()
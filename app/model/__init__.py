@@ -1,4 +1,7 @@
 from .balance import BalanceModel  # type: ignore[not-accessed]
+from .balance_ledger import BalanceLedgerModel  # type: ignore[not-accessed]
+from .daily_absence import DailyAbsenceModel  # type: ignore[not-accessed]
 from .employee import EmployeeModel  # type: ignore[not-accessed]
+from .public_holiday import PublicHolidayModel  # type: ignore[not-accessed]
 from .team import TeamModel  # type: ignore[not-accessed]
 from .vacation import VacationModel  # type: ignore[not-accessed]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel, CustomUUID
@@ -13,6 +13,9 @@ class BalanceModel(BaseModel):
     # ? obviously for testing purposes
     # ? and shouldn't be done that way in production
     balance = Column(Integer, default=10)
+    # ? the balance is a snapshot, the sum of the employee ledger entries
+    # ? created until snapshot_at, see `BalanceRepository.roll_up`
+    snapshot_at = Column(DateTime, nullable=False)
 
     employee: "relationship[EmployeeModel]" = relationship(
         "EmployeeModel", back_populates="balance"
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer
+
+from app.schema.balance import LedgerEntryKind
+
+from .base import BaseModel, CustomUUID
+
+
+class BalanceLedgerModel(BaseModel):
+    """
+    Append-only log of the balance changes. The balance of an employee at a
+    given time is the sum of their entries created until then.
+    """
+
+    __tablename__ = "balance_ledger"
+    __table_args__ = (
+        Index("ix_balance_ledger_employee_id_created_at", "employee_id", "created_at"),
+    )
+
+    employee_id = Column(CustomUUID, ForeignKey("employee.id"), nullable=False)
+    amount = Column(Integer, nullable=False)
+    kind = Column(Enum(LedgerEntryKind), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,18 +1,36 @@
 import uuid as uid
 
 from sqlalchemy import Column, types
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Dialect
 from sqlalchemy.ext.declarative import as_declarative  # type: ignore[import]
 
 
 class CustomUUID(types.TypeDecorator[uid.UUID]):
+    """
+    Native 16 bytes UUID on PostgreSQL, CHAR(36) on the other databases
+    (sqlite for the tests).
+    """
+
     impl = types.CHAR(36)
     cache_ok = True
 
-    def process_bind_param(self, value: uid.UUID | None, _):  # type: ignore[override]
-        return None if value is None else str(value)
+    def load_dialect_impl(self, dialect: Dialect) -> types.TypeEngine:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(types.CHAR(36))
+
+    def process_bind_param(self, value: uid.UUID | str | None, dialect: Dialect):  # type: ignore[override]
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return value if isinstance(value, uid.UUID) else uid.UUID(value)
+        return str(value)
 
-    def process_result_value(self, value: str | None, _) -> uid.UUID | None:  # type: ignore[override]
-        return None if value is None else uid.UUID(str(value))
+    def process_result_value(self, value: uid.UUID | str | None, _) -> uid.UUID | None:  # type: ignore[override]
+        if value is None or isinstance(value, uid.UUID):
+            return value
+        return uid.UUID(value)
 
 
 @as_declarative()  # type: ignore[call-arg]
@@ -20,6 +38,5 @@ class BaseModel:
     id = Column(
         CustomUUID,
         primary_key=True,
-        index=True,
         default=uid.uuid4,
     )
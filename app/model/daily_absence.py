@@ -0,0 +1,21 @@
+from sqlalchemy import JSON, Column, Date, ForeignKey, Index, Integer
+
+from .base import BaseModel, CustomUUID
+
+
+class DailyAbsenceModel(BaseModel):
+    """
+    Who is out, per team and per day. Materialized from the vacations by
+    `VacationService`, so that a team calendar is a single range scan.
+    """
+
+    __tablename__ = "daily_absence"
+    __table_args__ = (
+        Index("ix_daily_absence_team_id_date", "team_id", "date", unique=True),
+    )
+
+    team_id = Column(CustomUUID, ForeignKey("team.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    employee_count = Column(Integer, nullable=False)
+    # ? sorted ids of the employees on vacation that day
+    employee_ids = Column(JSON, nullable=False)
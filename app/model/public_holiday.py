@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Date, Index, Integer, String, case
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+
+from .base import BaseModel
+
+# ? a Monday, day numbers count the days since then
+DAY_NUMBER_EPOCH = "1900-01-01"
+
+
+class PublicHolidayModel(BaseModel):
+    """
+    Weekdays that are not working days, per employee timezone. Precomputed
+    from the workalendar calendars, see `app.management.load_public_holidays`,
+    so that working days can be counted in SQL, see `count_weekdays`.
+    """
+
+    __tablename__ = "public_holiday"
+    __table_args__ = (
+        Index("ix_public_holiday_timezone_date", "timezone", "date", unique=True),
+    )
+
+    timezone = Column(String, nullable=False)
+    date = Column(Date, nullable=False)
+    # ? None for the days off that are not named holidays
+    name = Column(String)
+
+
+class day_number(FunctionElement):
+    """`day_number(date_column)` is the number of days since DAY_NUMBER_EPOCH."""
+
+    type = Integer()
+    name = "day_number"
+    inherit_cache = True
+
+
+@compiles(day_number)
+def _compile_day_number(element, compiler, **kw):
+    (day,) = element.clauses
+    return (
+        f"CAST(julianday({compiler.process(day, **kw)}) "
+        f"- julianday('{DAY_NUMBER_EPOCH}') AS INTEGER)"
+    )
+
+
+@compiles(day_number, "postgresql")
+def _compile_day_number_postgresql(element, compiler, **kw):
+    (day,) = element.clauses
+    return f"({compiler.process(day, **kw)} - DATE '{DAY_NUMBER_EPOCH}')"
+
+
+def count_weekdays(first_day: ColumnElement, last_day: ColumnElement) -> ColumnElement:
+    """
+    Number of Monday to Friday days between the two day numbers, both included,
+    as an arithmetic expression.
+    """
+
+    def weekdays_before(day: ColumnElement) -> ColumnElement:
+        # ? day numbers are positive, the integer division is a floor division
+        return 5 * (day / 7) + case((day % 7 < 5, day % 7), else_=5)
+
+    return weekdays_before(last_day + 1) - weekdays_before(first_day)
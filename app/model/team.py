@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String, func
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -8,5 +8,10 @@ from .employee import EmployeeModel
 class TeamModel(BaseModel):
     __tablename__ = "team"
 
-    name = Column(String, unique=True, index=True)
+    name = Column(String)
     employees: "relationship[list[EmployeeModel]]" = relationship("EmployeeModel", back_populates="team")  # type: ignore[assignment]
+
+    __table_args__ = (
+        # ? team names are unique regardless of the case, and looked up that way
+        Index("ix_team_lower_name", func.lower(name), unique=True),
+    )
@@ -1,5 +1,9 @@
-from sqlalchemy import Column, Date, Enum, ForeignKey
+from datetime import date
+
+from sqlalchemy import DDL, Boolean, Column, Date, Enum, ForeignKey, Index, and_, event
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.functions import FunctionElement
 
 from app.model.employee import EmployeeModel
 from app.schema.vacation import VacationType
@@ -7,8 +11,49 @@ from app.schema.vacation import VacationType
 from .base import BaseModel, CustomUUID
 
 
+class overlaps_period(FunctionElement):
+    """
+    `overlaps_period(start_column, end_column, start_date, end_date)` is true when
+    the closed periods overlap.
+    Compiled to a `daterange` overlap on PostgreSQL, so that the GiST index on
+    the vacation period is used, and to plain date comparisons elsewhere.
+    """
+
+    type = Boolean()
+    name = "overlaps_period"
+    inherit_cache = True
+
+
+@compiles(overlaps_period)
+def _compile_overlaps_period(element, compiler, **kw):
+    start_column, end_column, start_date, end_date = element.clauses
+    return compiler.process(
+        and_(start_column <= end_date, end_column >= start_date), **kw
+    )
+
+
+@compiles(overlaps_period, "postgresql")
+def _compile_overlaps_period_postgresql(element, compiler, **kw):
+    start_column, end_column, start_date, end_date = (
+        compiler.process(clause, **kw) for clause in element.clauses
+    )
+    return (
+        f"daterange({start_column}, {end_column}, '[]') "
+        f"&& daterange({start_date}, {end_date}, '[]')"
+    )
+
+
 class VacationModel(BaseModel):
     __tablename__ = "vacation"
+    __table_args__ = (
+        # ? serves every per employee period query, and sorts by start date
+        Index(
+            "ix_vacation_employee_id_start_date_end_date",
+            "employee_id",
+            "start_date",
+            "end_date",
+        ),
+    )
 
     employee_id = Column(CustomUUID, ForeignKey("employee.id"), nullable=False)
     end_date = Column(Date, nullable=False)
@@ -16,3 +61,26 @@ class VacationModel(BaseModel):
     type = Column(Enum(VacationType), nullable=False)
 
     employee: "relationship[EmployeeModel]" = relationship("EmployeeModel", back_populates="vacations")  # type: ignore[assignment]
+
+    @classmethod
+    def overlaps(cls, start_date: date, end_date: date) -> overlaps_period:
+        """Filter on vacations overlapping the given (closed) period."""
+        return overlaps_period(cls.start_date, cls.end_date, start_date, end_date)
+
+
+# ? range types and exclusion constraints only exist on PostgreSQL, see the
+# ? vacation_period_indexes and vacation_period_exclusion migrations
+for statement in (
+    "CREATE INDEX ix_vacation_period ON vacation "
+    "USING gist (daterange(start_date, end_date, '[]'))",
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    # the vacations of an employee never overlap, whatever the writer
+    "ALTER TABLE vacation ADD CONSTRAINT ex_vacation_employee_id_period "
+    "EXCLUDE USING gist (employee_id WITH =, "
+    "daterange(start_date, end_date, '[]') WITH &&)",
+):
+    event.listen(
+        VacationModel.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
@@ -0,0 +1,92 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, Sequence
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+from app.core.metrics import instrument_repository
+from app.repository.base import STREAM_BATCH_SIZE, BaseRepository, T
+
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    Async counterpart of a `BaseRepository`, for `AsyncSession`s.
+
+    Reads are awaited queries, built by the sync repository. Every other
+    method of the sync repository is available too: it runs with
+    `AsyncSession.run_sync`, which awaits the database I/O of the sync code
+    on the event loop, without a thread. Lookups by id, `get_by_id`, `load`
+    and `load_many`, run that way too, through the cache of the repository
+    and the entity loader of the session.
+    """
+
+    def __init__(self, repository: BaseRepository[T]):
+        self.repository = repository
+        self.model = repository.model
+        instrument_repository(self, type(repository).__name__.lstrip("_"))
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        if not callable(method := getattr(self.repository, name)):
+            return method
+
+        async def run_sync(session: AsyncSession, *args: Any, **kwargs: Any) -> Any:
+            return await session.run_sync(method, *args, **kwargs)
+
+        return run_sync
+
+    async def get(self, session: AsyncSession, *args: ..., **kwargs: ...) -> T | None:
+        query = self.repository._query(session.sync_session, *args, **kwargs)
+        return (await session.execute(query.statement)).scalars().one_or_none()
+
+    async def get_many(
+        self, session: AsyncSession, *args: ..., **kwargs: ...
+    ) -> list[T]:
+        query = self.repository._query(session.sync_session, *args, **kwargs)
+        return list((await session.execute(query.statement)).scalars())
+
+    async def get_page(
+        self,
+        session: AsyncSession,
+        *args: ...,
+        order_by: Sequence[Any],
+        after: Sequence[Any] | None = None,
+        limit: int,
+        **kwargs: ...,
+    ) -> list[T]:
+        """See `BaseRepository.get_page`."""
+        query = self.repository._keyset_query(
+            session.sync_session, *args, order_by=order_by, after=after, **kwargs
+        ).limit(limit)
+        return list((await session.execute(query.statement)).scalars())
+
+    async def stream(
+        self,
+        session: AsyncSession,
+        *args: ...,
+        order_by: Sequence[Any],
+        after: Sequence[Any] | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        **kwargs: ...,
+    ) -> AsyncIterator[T]:
+        """See `BaseRepository.stream`, rows are fetched with a server side cursor."""
+        query = self.repository._keyset_query(
+            session.sync_session, *args, order_by=order_by, after=after, **kwargs
+        )
+        result = await session.stream(
+            query.statement.execution_options(yield_per=batch_size)
+        )
+        async for model in result.scalars():
+            yield model
+
+    async def stream_rows(
+        self, session: AsyncSession, query: Query, batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[Row]:
+        """
+        Streams the rows of a column query built by the sync repository, with
+        a server side cursor.
+        """
+        result = await session.stream(
+            query.statement.execution_options(yield_per=batch_size)
+        )
+        async for row in result:
+            yield row
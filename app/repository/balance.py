@@ -1,41 +1,111 @@
+from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import and_, exists, func, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
 
-from app.model import BalanceModel, EmployeeModel
-from app.repository.base import BaseRepository
-from app.schema.balance import BalanceCreate
+from app.model import BalanceLedgerModel, BalanceModel, EmployeeModel
+from app.repository.async_base import AsyncBaseRepository
+from app.repository.balance_ledger import BalanceLedgerRepository
+from app.repository.base import BaseRepository, commit
+from app.schema.balance import Balance, BalanceCreate, LedgerEntryKind
 
 
 class _BalanceRepository(BaseRepository[BalanceModel]):
     def create_for_employee(
         self, session: Session, employee: EmployeeModel, balance_amount: int = 10
     ) -> BalanceModel:
-        """Creates a new balance for the given employee."""
+        """
+        Creates a new balance for the given employee, with its opening ledger
+        entry already rolled up.
+        """
+        created_at = datetime.utcnow()
+        session.add(
+            BalanceLedgerModel(
+                employee_id=employee.id,
+                amount=balance_amount,
+                kind=LedgerEntryKind.OPENING,
+                created_at=created_at,
+            )
+        )
         balance = self.model(
-            **BalanceCreate(employee_id=employee.id, balance=balance_amount).dict()
+            **BalanceCreate(employee_id=employee.id, balance=balance_amount).dict(),
+            snapshot_at=created_at,
         )
         return self.create(session, balance)
 
     def delete_by_employee_id(self, session: Session, employee_id: UUID):
-        """Deletes the balance for the given employee."""
-        if balance := self.get_by_employee_id(session, employee_id):
-            self.delete(session, balance)
+        """Deletes the balance and the ledger entries of the given employee."""
+        BalanceLedgerRepository.delete_where(
+            session, BalanceLedgerModel.employee_id == employee_id
+        )
+        self.delete_where(session, self.model.employee_id == employee_id)
 
     def get_by_employee_id(
         self, session: Session, employee_id: UUID
     ) -> BalanceModel | None:
         return self.get(session, self.model.employee_id == employee_id)
 
-    def update_balance(
-        self, session: Session, employee: EmployeeModel, amount: int
-    ) -> BalanceModel | None:
-        """Updates the balance for the given employee."""
-        if not (balance := self.get_by_employee_id(session, employee.id)):
-            return
-        balance.balance += amount  # type: ignore
-        self.update(session, balance)
-        return balance
+    def get_schema_by_employee_id(
+        self, session: Session, employee_id: UUID, at: datetime | None = None
+    ) -> Balance | None:
+        """
+        Returns the balance of the given employee, in a single query: the
+        snapshot plus the ledger entries created since, or the sum of the
+        ledger entries created until `at` when given.
+        """
+        if at is None:
+            amount = self.model.balance + self._ledger_sum(
+                BalanceLedgerModel.created_at > self.model.snapshot_at
+            )
+        else:
+            amount = self._ledger_sum(BalanceLedgerModel.created_at <= at)
+        row = (
+            session.query(self.model.id, self.model.employee_id, amount.label("balance"))  # type: ignore
+            .filter(self.model.employee_id == employee_id)
+            .one_or_none()
+        )
+        return Balance(**row._mapping) if row else None
+
+    def roll_up(self, session: Session, until: datetime) -> int:
+        """
+        Adds the ledger entries created until the given time to the balance
+        snapshots, in a single UPDATE statement.
+        Entries must not be created before `until` by transactions still
+        running, or they would be left out of the snapshot: `until` should be
+        in the past by more than the longest write transaction.
+        Returns the number of updated balances.
+        """
+        table = self.model.__table__  # type: ignore
+        rolled_up = and_(
+            BalanceLedgerModel.employee_id == table.c.employee_id,
+            BalanceLedgerModel.created_at > table.c.snapshot_at,
+            BalanceLedgerModel.created_at <= until,
+        )
+        result = session.execute(
+            update(table)
+            .where(exists().where(rolled_up))
+            .values(
+                balance=table.c.balance
+                + select(func.sum(BalanceLedgerModel.amount))
+                .where(rolled_up)
+                .scalar_subquery(),
+                snapshot_at=until,
+            )
+        )
+        commit(session)
+        return result.rowcount  # type: ignore
+
+    def _ledger_sum(self, *args: ColumnElement) -> ColumnElement:
+        """Sum of the ledger entries of the balance employee, with the filters."""
+        return func.coalesce(
+            select(func.sum(BalanceLedgerModel.amount))
+            .where(BalanceLedgerModel.employee_id == self.model.employee_id, *args)
+            .scalar_subquery(),
+            0,
+        )
 
 
 BalanceRepository = _BalanceRepository(model=BalanceModel)
+AsyncBalanceRepository = AsyncBaseRepository(BalanceRepository)
@@ -0,0 +1,70 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.model import BalanceLedgerModel
+from app.repository.async_base import AsyncBaseRepository
+from app.repository.base import BaseRepository
+from app.schema.balance import LedgerEntryKind
+
+
+class _BalanceLedgerRepository(BaseRepository[BalanceLedgerModel]):
+    def add_entry(
+        self,
+        session: Session,
+        employee_id: UUID,
+        amount: int,
+        kind: LedgerEntryKind,
+    ) -> BalanceLedgerModel:
+        """Appends a balance change of the given employee to the ledger."""
+        return self.create(
+            session, {"employee_id": employee_id, "amount": amount, "kind": kind}
+        )
+
+    def add_entries(
+        self, session: Session, amounts: dict[UUID, int], kind: LedgerEntryKind
+    ) -> list[UUID]:
+        """
+        Appends the balance change of each employee to the ledger, with bulk
+        inserts. Zero amounts are skipped.
+        """
+        created_at = datetime.utcnow()
+        return self.bulk_create(
+            session,
+            [
+                {
+                    "employee_id": employee_id,
+                    "amount": amount,
+                    "kind": kind,
+                    "created_at": created_at,
+                }
+                for employee_id, amount in amounts.items()
+                if amount
+            ],
+        )
+
+    def get_sums(
+        self,
+        session: Session,
+        employee_ids: list[UUID],
+        kinds: list[LedgerEntryKind],
+    ) -> dict[UUID, int]:
+        """
+        Sum of the ledger entries of the given kinds of each employee, in a
+        single query. Employees without such entries are left out.
+        """
+        rows = (
+            session.query(self.model.employee_id, func.sum(self.model.amount))
+            .filter(
+                self.model.employee_id.in_(employee_ids),
+                self.model.kind.in_(kinds),
+            )
+            .group_by(self.model.employee_id)
+        )
+        return {employee_id: amount for employee_id, amount in rows}
+
+
+BalanceLedgerRepository = _BalanceLedgerRepository(model=BalanceLedgerModel)
+AsyncBalanceLedgerRepository = AsyncBaseRepository(BalanceLedgerRepository)
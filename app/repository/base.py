@@ -1,18 +1,54 @@
 import uuid as uid
-from typing import Any, Generic, Type, TypeVar
+from contextlib import contextmanager
+from typing import Any, Callable, Generic, Hashable, Iterator, Sequence, Type, TypeVar
 
 from pydantic import BaseModel as PydanticBaseModel
-from sqlalchemy.orm import Query, Session
+from sqlalchemy import (
+    case,
+    cast,
+    column,
+    delete,
+    insert,
+    inspect,
+    literal,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session, make_transient_to_detached
 
+from app.core.metrics import instrument_repository
 from app.model.base import BaseModel
+from app.repository.cache import MISSING, RepositoryCache
+from app.repository.loader import get_loader
 
 T = TypeVar("T", bound=BaseModel)
 TSchema = TypeVar("TSchema", bound=PydanticBaseModel)
 
+STREAM_BATCH_SIZE = 1000
+# ? rows per bulk statement, keeps the number of bound parameters under the
+# ? database limits
+BULK_BATCH_SIZE = 1000
+# ? key of the session info holding the number of nested transaction blocks
+UNIT_OF_WORK_DEPTH = "unit_of_work_depth"
+
 
 class BaseRepository(Generic[T]):
-    def __init__(self, model: Type[T]):
+    """
+    Data access of a model. With a `cache`, the lookups by id, and the ones
+    going through `_cached`, are served from a process-level cache, cleared
+    by every write of the repository.
+    """
+
+    def __init__(self, model: Type[T], cache: RepositoryCache | None = None):
         self.model = model
+        self.cache = cache
+        instrument_repository(self, type(self).__name__.lstrip("_"))
+
+    def transaction(self, session: Session):
+        """See `transaction`."""
+        return transaction(session)
 
     def _query(self, session: Session, *args: ..., **kwargs: ...) -> "Query[T]":
         filters = [getattr(self.model, k) == v for k, v in kwargs.items()]
@@ -25,7 +61,57 @@ class BaseRepository(Generic[T]):
     def get_many(self, session: Session, *args: ..., **kwargs: ...) -> list[T]:
         return self._query(session, *args, **kwargs).all()
 
+    def count(self, session: Session, *args: ..., **kwargs: ...) -> int:
+        return self._query(session, *args, **kwargs).count()
+
+    def get_page(
+        self,
+        session: Session,
+        *args: ...,
+        order_by: Sequence[Any],
+        after: Sequence[Any] | None = None,
+        limit: int,
+        **kwargs: ...,
+    ) -> list[T]:
+        """
+        Returns at most `limit` rows sorted by the `order_by` columns, starting
+        right after the row whose `order_by` values are `after` (keyset pagination).
+        """
+        return (
+            self._keyset_query(session, *args, order_by=order_by, after=after, **kwargs)
+            .limit(limit)
+            .all()
+        )
+
+    def stream(
+        self,
+        session: Session,
+        *args: ...,
+        order_by: Sequence[Any],
+        after: Sequence[Any] | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        **kwargs: ...,
+    ) -> Iterator[T]:
+        """
+        Same as `get_page` without limit, rows are fetched `batch_size` at a time
+        so that memory stays flat whatever the number of rows.
+        """
+        yield from self._keyset_query(
+            session, *args, order_by=order_by, after=after, **kwargs
+        ).yield_per(batch_size)
+
+    def _keyset_query(
+        self,
+        session: Session,
+        *args: ...,
+        order_by: Sequence[Any],
+        after: Sequence[Any] | None = None,
+        **kwargs: ...,
+    ) -> "Query[T]":
+        return keyset(self._query(session, *args, **kwargs), order_by, after)
+
     def create(self, session: Session, obj_in: dict[str, Any] | T) -> T:
+        self._invalidate(session)
         if isinstance(obj_in, dict):
             return self._create_from_dict(session, obj_in)
         if isinstance(obj_in, self.model):
@@ -34,6 +120,27 @@ class BaseRepository(Generic[T]):
             f"obj_in must be of type {self.model} or dict, not {type(obj_in)}"
         )
 
+    def create_unless_exists(
+        self, session: Session, obj_in: dict[str, Any]
+    ) -> T | None:
+        """
+        Creates the row with a single INSERT ... ON CONFLICT DO NOTHING, so
+        that concurrent creations cannot both pass a uniqueness check.
+        Returns None, without error, when the row conflicts with an existing
+        one on a unique constraint or index.
+        """
+        self._invalidate(session)
+        row = {"id": uid.uuid4(), **obj_in}
+        if session.get_bind().dialect.name == "postgresql":
+            statement = postgresql.insert(self.model.__table__)  # type: ignore
+        else:
+            statement = sqlite.insert(self.model.__table__)  # type: ignore
+        result = session.execute(statement.values(row).on_conflict_do_nothing())
+        commit(session)
+        if not result.rowcount:  # type: ignore
+            return None
+        return self.get_by_id(session, row["id"])
+
     def _create_from_model(self, session: Session, obj_in: T) -> T:
         return add_and_commit(session, obj_in)
 
@@ -41,7 +148,20 @@ class BaseRepository(Generic[T]):
         return add_and_commit(session, self.model(**obj_in))
 
     def get_by_id(self, session: Session, id: uid.UUID) -> T | None:
-        return self.get(session, id=id)
+        return self._cached(session, ("id", id), lambda: self.get(session, id=id))
+
+    def load(self, session: Session, id: uid.UUID) -> T | None:
+        """
+        Same as `get_by_id`, through the entity loader of the session: the
+        entity is fetched at most once per session, see `EntityLoader`.
+        """
+        return self._cached(
+            session, ("id", id), lambda: get_loader(session).load(self.model, id)
+        )
+
+    def load_many(self, session: Session, ids: Sequence[uid.UUID]) -> list[T | None]:
+        """Same as `load` for several ids, fetched with a single query."""
+        return get_loader(session).load_many(self.model, ids)
 
     def get_schema_by_id(
         self,
@@ -53,27 +173,207 @@ class BaseRepository(Generic[T]):
             return response_schema.from_orm(result)
 
     def update(self, session: Session, obj_in: T) -> T:
-        session.commit()
+        self._invalidate(session)
+        commit(session)
         return obj_in
 
     def delete(self, session: Session, obj_in: T) -> None:
+        self._invalidate(session)
         session.delete(obj_in)  # type: ignore
-        session.commit()
+        commit(session)
 
     def delete_many(self, session: Session, objs_in: list[T]) -> None:
-        for obj in objs_in:
-            session.delete(obj)  # type: ignore
-        session.commit()
+        """Deletes the given objects with a single DELETE ... WHERE id IN (...)."""
+        if not objs_in:
+            return
+        self.delete_where(
+            session,
+            self.model.id.in_([obj.id for obj in objs_in]),
+            synchronize_session="evaluate",
+        )
+
+    def delete_where(
+        self,
+        session: Session,
+        *args: ...,
+        synchronize_session: str | bool = False,
+    ) -> int:
+        """
+        Deletes the rows matching the given filters in a single statement,
+        without loading them. By default the objects already loaded in the
+        session are left untouched, see `Query.delete` for the other strategies.
+        Returns the number of deleted rows.
+        """
+        self._invalidate(session)
+        result = session.execute(
+            delete(self.model)
+            .where(*args)
+            .execution_options(synchronize_session=synchronize_session)
+        )
+        commit(session)
+        return result.rowcount  # type: ignore
+
+    def bulk_create(
+        self, session: Session, rows: list[dict[str, Any]]
+    ) -> list[uid.UUID]:
+        """
+        Inserts the rows, which must all have the same keys, with multi-row
+        INSERT ... VALUES statements. Objects are not added to the session.
+        Returns the ids of the inserted rows.
+        """
+        self._invalidate(session)
+        rows = [{"id": uid.uuid4(), **row} for row in rows]
+        table = self.model.__table__  # type: ignore
+        for batch in _batches(rows):
+            session.execute(insert(table).values(batch))
+        if rows:
+            commit(session)
+        return [row["id"] for row in rows]
+
+    def bulk_update(self, session: Session, rows: list[dict[str, Any]]) -> None:
+        """
+        Updates the rows matching the "id" of each given row with its other
+        values, all rows must have the same keys. Objects loaded in the session
+        are not refreshed.
+        On PostgreSQL, this is a single UPDATE ... FROM (VALUES ...) statement
+        per batch, and an UPDATE ... SET col = CASE id ... END otherwise.
+        """
+        if not rows:
+            return
+        self._invalidate(session)
+        table = self.model.__table__  # type: ignore
+        keys = [key for key in rows[0] if key != "id"]
+        is_postgresql = session.get_bind().dialect.name == "postgresql"
+        for batch in _batches(rows):
+            if is_postgresql:
+                data = values(
+                    *(column(key, table.c[key].type) for key in ["id", *keys]),
+                    name="data",
+                ).data([tuple(row[key] for key in ["id", *keys]) for row in batch])
+                statement = (
+                    update(table)
+                    .where(table.c.id == cast(data.c.id, table.c.id.type))
+                    .values({key: cast(data.c[key], table.c[key].type) for key in keys})
+                )
+            else:
+                statement = (
+                    update(table)
+                    .where(table.c.id.in_([row["id"] for row in batch]))
+                    .values(
+                        {
+                            key: case(
+                                *(
+                                    (
+                                        table.c.id == row["id"],
+                                        literal(row[key], table.c[key].type),
+                                    )
+                                    for row in batch
+                                )
+                            )
+                            for key in keys
+                        }
+                    )
+                )
+            session.execute(statement)
+        commit(session)
+
+    def _cached(
+        self, session: Session, key: Hashable, fetch: Callable[[], T | None]
+    ) -> T | None:
+        """
+        Read-through lookup of the entity cached under `key`, fetched with
+        `fetch` on a miss. Entities are cached as their column values, and
+        merged back into the session without query. Misses are not cached.
+        """
+        if self.cache is None:
+            return fetch()
+        if (values := self.cache.get(key)) is not MISSING:
+            entity = self.model(**values)
+            make_transient_to_detached(entity)
+            return session.merge(entity, load=False)
+        generation = self.cache.generation
+        if (entity := fetch()) is not None:
+            self.cache.set(
+                key,
+                {
+                    attribute.key: getattr(entity, attribute.key)
+                    for attribute in inspect(self.model).column_attrs
+                },
+                generation,
+            )
+        return entity
+
+    def _invalidate(self, session: Session) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(session)
+
+
+def keyset(
+    query: Query, order_by: Sequence[Any], after: Sequence[Any] | None = None
+) -> Query:
+    """
+    Sorts the query by the `order_by` columns, starting right after the row
+    whose `order_by` values are `after`, see `BaseRepository.get_page`.
+    """
+    if after is not None:
+        query = query.filter(
+            tuple_(*order_by)
+            > tuple_(
+                *(literal(value, column.type) for column, value in zip(order_by, after))
+            )
+        )
+    return query.order_by(*order_by)
+
+
+def _batches(rows: list[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+    for start in range(0, len(rows), BULK_BATCH_SIZE):
+        yield rows[start : start + BULK_BATCH_SIZE]
 
 
 class RepositoryException(Exception):
     pass
 
 
+@contextmanager
+def transaction(session: Session) -> Iterator[Session]:
+    """
+    Unit of work: inside the block, repository writes are only flushed and a
+    single commit happens when the outermost block exits. Everything is rolled
+    back if an exception is raised. Blocks can be nested.
+    """
+    depth = session.info.get(UNIT_OF_WORK_DEPTH, 0)
+    session.info[UNIT_OF_WORK_DEPTH] = depth + 1
+    try:
+        yield session
+        if not depth:
+            session.commit()
+    except Exception:
+        if not depth:
+            session.rollback()
+        raise
+    finally:
+        if depth:
+            session.info[UNIT_OF_WORK_DEPTH] = depth
+        else:
+            del session.info[UNIT_OF_WORK_DEPTH]
+
+
+def in_transaction(session: Session) -> bool:
+    return UNIT_OF_WORK_DEPTH in session.info
+
+
+def commit(session: Session) -> None:
+    """Commits the session, or only flushes it inside a `transaction` block."""
+    if in_transaction(session):
+        session.flush()
+    else:
+        session.commit()
+
+
 def add_and_commit(session: Session, obj: T) -> T:
     try:
         session.add(obj)  # type: ignore
-        session.commit()
+        commit(session)
     except Exception as e:
         session.rollback()
         raise RepositoryException(
@@ -0,0 +1,181 @@
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Protocol
+
+import psycopg2
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+# ? key of the session info holding the caches to invalidate on commit
+INVALIDATED_CACHES = "invalidated_caches"
+# ? seconds between two reconnections of the PostgreSQL listener
+LISTEN_RETRY_DELAY = 5
+
+MISSING = object()
+
+
+class InvalidationChannel(Protocol):
+    """Broadcasts the names of the invalidated caches to every process."""
+
+    def publish(self, session: Session, name: str) -> None:
+        """Called in the transaction of the session, right before its commit."""
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        ...
+
+
+class RepositoryCache:
+    """
+    Process-level read-through cache of a repository, see `BaseRepository`.
+    Holds at most `max_size` entries, least recently used ones are evicted
+    first, and each entry expires `ttl` seconds after it was cached.
+    Thread safe, the sync routes run in a thread pool.
+    """
+
+    def __init__(self, name: str, ttl: float, max_size: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # ? bumped by every invalidation, so that a value read before it is not
+        # ? cached after it
+        self.generation = 0
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value, or `MISSING`."""
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        """Caches the value, unless the cache was invalidated since `generation`."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def invalidate(self, session: Session) -> None:
+        """
+        Clears the cache now, for the rest of the session, and again once the
+        session commits, for the other sessions and processes.
+        """
+        self.clear()
+        session.info.setdefault(INVALIDATED_CACHES, set()).add(self.name)
+
+
+_caches: dict[str, RepositoryCache] = {}
+_channel: InvalidationChannel | None = None
+
+
+def set_invalidation_channel(channel: InvalidationChannel | None) -> None:
+    """Broadcasts the invalidations through the channel, None to stop."""
+    global _channel
+    if channel is not None:
+        channel.subscribe(_clear_cache)
+    _channel = channel
+
+
+def _clear_cache(name: str) -> None:
+    if cache := _caches.get(name):
+        cache.clear()
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_invalidations(session: Session) -> None:
+    if _channel is not None:
+        for name in session.info.get(INVALIDATED_CACHES, ()):
+            _channel.publish(session, name)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_invalidated_caches(session: Session) -> None:
+    for name in session.info.pop(INVALIDATED_CACHES, ()):
+        _clear_cache(name)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_invalidations(session: Session, previous_transaction) -> None:
+    session.info.pop(INVALIDATED_CACHES, None)
+
+
+class LocalInvalidationChannel:
+    """In-process channel, delivers right away. Stand-in for the tests."""
+
+    def __init__(self):
+        self.callbacks: list[Callable[[str], None]] = []
+        self.published: list[str] = []
+
+    def publish(self, session: Session, name: str) -> None:
+        self.published.append(name)
+        for callback in self.callbacks:
+            callback(name)
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        self.callbacks.append(callback)
+
+
+class PostgresInvalidationChannel:
+    """
+    Channel over PostgreSQL LISTEN/NOTIFY. Notifications are sent in the
+    transaction of the writes, so they are delivered only if it commits.
+    A daemon thread listens on a dedicated connection, and reconnects when it
+    is lost: the caches are cleared then, notifications may have been missed.
+    """
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self.callbacks: list[Callable[[str], None]] = []
+        self._thread: threading.Thread | None = None
+
+    def publish(self, session: Session, name: str) -> None:
+        session.execute(func.pg_notify(self.channel, name).select())
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        self.callbacks.append(callback)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen, daemon=True)
+            self._thread.start()
+
+    def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = psycopg2.connect(self.dsn)
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                for name in list(_caches):
+                    self._notify(name)
+                while True:
+                    select.select([connection], [], [])
+                    connection.poll()
+                    while connection.notifies:
+                        self._notify(connection.notifies.pop(0).payload)
+            except psycopg2.Error:
+                time.sleep(LISTEN_RETRY_DELAY)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def _notify(self, name: str) -> None:
+        for callback in self.callbacks:
+            callback(name)
@@ -0,0 +1,84 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.model import DailyAbsenceModel
+from app.repository.async_base import AsyncBaseRepository
+from app.repository.base import BaseRepository, commit
+from app.repository.team import TeamRepository
+
+# ? (employee id, start date, end date), both dates included
+EmployeePeriod = tuple[UUID, date, date]
+
+
+class _DailyAbsenceRepository(BaseRepository[DailyAbsenceModel]):
+    def get_by_team(
+        self, session: Session, team_id: UUID, start_date: date, end_date: date
+    ) -> list[DailyAbsenceModel]:
+        """Returns the days of the period with members of the team out, by date."""
+        return (
+            self._query(
+                session, self.model.date.between(start_date, end_date), team_id=team_id
+            )
+            .order_by(self.model.date)
+            .all()
+        )
+
+    def apply(
+        self,
+        session: Session,
+        team_id: UUID,
+        removed: Iterable[EmployeePeriod] = (),
+        added: Iterable[EmployeePeriod] = (),
+    ) -> None:
+        """
+        Removes the employees from the days of the `removed` periods of the team
+        calendar, then adds them to the days of the `added` ones.
+        The team row is locked until the end of the transaction, so that the
+        writes to the calendar of a team are serialized.
+        """
+        removed, added = list(removed), list(added)
+        if not removed and not added:
+            return
+        TeamRepository.lock(session, team_id)
+        rows = {
+            row.date: row
+            for row in self.get_by_team(
+                session,
+                team_id,
+                min(start_date for _, start_date, _ in removed + added),
+                max(end_date for _, _, end_date in removed + added),
+            )
+        }
+        employee_ids: defaultdict[date, set[str]] = defaultdict(set)
+        for day, row in rows.items():
+            employee_ids[day].update(row.employee_ids)  # type: ignore
+        for periods, change in ((removed, set.discard), (added, set.add)):
+            for employee_id, start_date, end_date in periods:
+                for n in range((end_date - start_date).days + 1):
+                    change(employee_ids[start_date + timedelta(n)], str(employee_id))
+
+        for day, ids in employee_ids.items():
+            if (row := rows.get(day)) is None:
+                if ids:
+                    session.add(
+                        self.model(
+                            team_id=team_id,
+                            date=day,
+                            employee_count=len(ids),
+                            employee_ids=sorted(ids),
+                        )
+                    )
+            elif not ids:
+                session.delete(row)
+            elif len(ids) != row.employee_count or sorted(ids) != row.employee_ids:
+                row.employee_count = len(ids)  # type: ignore
+                row.employee_ids = sorted(ids)  # type: ignore
+        commit(session)
+
+
+DailyAbsenceRepository = _DailyAbsenceRepository(model=DailyAbsenceModel)
+AsyncDailyAbsenceRepository = AsyncBaseRepository(DailyAbsenceRepository)
@@ -1,7 +1,17 @@
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import Iterator
+from uuid import UUID
 
-from app.model import EmployeeModel, TeamModel
-from app.repository.base import BaseRepository
+from sqlalchemy import Date, case, exists, func, literal, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session, raiseload
+from sqlalchemy.sql.selectable import Exists
+
+from app.model import EmployeeModel, PublicHolidayModel, TeamModel, VacationModel
+from app.model.public_holiday import count_weekdays, day_number
+from app.repository.async_base import AsyncBaseRepository
+from app.repository.base import STREAM_BATCH_SIZE, BaseRepository, keyset
+from app.schema.vacation import VacationType
 
 
 class _EmployeeRepository(BaseRepository[EmployeeModel]):
@@ -21,5 +31,169 @@ class _EmployeeRepository(BaseRepository[EmployeeModel]):
         employee.team_id = None  # type: ignore
         self.update(session, employee)
 
+    def lock(self, session: Session, *employee_ids: UUID) -> list[EmployeeModel]:
+        """
+        Locks the rows of the given employees until the end of the transaction,
+        so that concurrent writes on their vacations are serialized.
+        Rows are locked in id order, so that two transactions locking the same
+        employees cannot deadlock. No-op on sqlite, which has no row locks.
+        """
+        # ? FOR NO KEY UPDATE does not block the foreign key checks of the
+        # ? inserts referencing the employees
+        return (
+            self._query(session, self.model.id.in_(sorted(set(employee_ids))))
+            .order_by(self.model.id)
+            .with_for_update(key_share=True)
+            .all()
+        )
+
+    def get_many_in_vacation(
+        self,
+        session: Session,
+        start_date: date,
+        end_date: date,
+        type: VacationType | None = None,
+    ) -> list[EmployeeModel]:
+        """
+        Returns the employees having at least one vacation in the given period,
+        in a single query.
+        """
+        # ? only the employee columns are needed, relationships must not be
+        # ? lazy loaded one row at a time
+        return (
+            self._query(session, self.in_vacation(start_date, end_date, type))
+            .options(raiseload("*"))  # type: ignore
+            .all()
+        )
+
+    def in_vacation(
+        self, start_date: date, end_date: date, type: VacationType | None = None
+    ) -> Exists:
+        """Filter on employees having at least one vacation in the given period."""
+        return exists().where(
+            VacationModel.employee_id == self.model.id,
+            VacationModel.overlaps(start_date, end_date),
+            VacationModel.type == type if type else True,
+        )
+
+    def get_page_with_vacation_days(
+        self,
+        session: Session,
+        start_date: date,
+        end_date: date,
+        type: VacationType | None = None,
+        *,
+        after: UUID | None = None,
+        limit: int,
+    ) -> list[Row]:
+        """
+        Same as `get_many_in_vacation`, with the vacation days of each
+        employee, see `with_vacation_days`, paginated on the employee id.
+        """
+        return (
+            self.with_vacation_days(session, start_date, end_date, type, after=after)
+            .limit(limit)
+            .all()
+        )
+
+    def stream_with_vacation_days(
+        self,
+        session: Session,
+        start_date: date,
+        end_date: date,
+        type: VacationType | None = None,
+        *,
+        after: UUID | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[Row]:
+        """Same as `get_page_with_vacation_days` without limit, see `stream`."""
+        yield from self.with_vacation_days(
+            session, start_date, end_date, type, after=after
+        ).yield_per(batch_size)
+
+    def stream_vacation_periods(
+        self,
+        session: Session,
+        *,
+        after: UUID | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[Row]:
+        """
+        Every employee, sorted by id, with their vacations, as rows of
+        employee_id, timezone, start_date and end_date: one row per vacation,
+        and a single row with null dates for the employees without vacation.
+        Starts right after the `after` employee, rows are fetched `batch_size`
+        at a time with a server-side cursor.
+        """
+        query = session.query(
+            self.model.id.label("employee_id"),
+            self.model.timezone,
+            VacationModel.start_date,
+            VacationModel.end_date,
+        ).outerjoin(VacationModel, VacationModel.employee_id == self.model.id)
+        if after is not None:
+            query = query.filter(self.model.id > after)
+        yield from query.order_by(self.model.id, VacationModel.start_date).yield_per(
+            batch_size
+        )
+
+    def with_vacation_days(
+        self,
+        session: Session,
+        start_date: date,
+        end_date: date,
+        type: VacationType | None = None,
+        *,
+        after: UUID | None = None,
+    ) -> Query:
+        """
+        Employees having at least one vacation in the given period, sorted by
+        id, as rows of the employee columns and of the number of days of their
+        vacations in the period: `vacation_days`, every day, and
+        `vacation_workdays`, the weekdays that are not public holidays of the
+        employee timezone, see `PublicHolidayModel`.
+        Computed for all the employees in a single aggregation.
+        """
+        vacation_start = case(
+            (VacationModel.start_date < start_date, literal(start_date, Date)),
+            else_=VacationModel.start_date,
+        )
+        vacation_end = case(
+            (VacationModel.end_date > end_date, literal(end_date, Date)),
+            else_=VacationModel.end_date,
+        )
+        first_day, last_day = day_number(vacation_start), day_number(vacation_end)
+        holidays = (
+            select(func.count(PublicHolidayModel.id))
+            .where(
+                PublicHolidayModel.timezone == self.model.timezone,
+                PublicHolidayModel.date.between(vacation_start, vacation_end),
+            )
+            .scalar_subquery()
+        )
+        totals = (
+            select(
+                VacationModel.employee_id,
+                func.sum(last_day - first_day + 1).label("vacation_days"),
+                func.sum(count_weekdays(first_day, last_day) - holidays).label(
+                    "vacation_workdays"
+                ),
+            )
+            .join(self.model, self.model.id == VacationModel.employee_id)
+            .where(
+                VacationModel.overlaps(start_date, end_date),
+                VacationModel.type == type if type else True,
+            )
+            .group_by(VacationModel.employee_id)
+            .subquery()
+        )
+        query = session.query(
+            *self.model.__table__.c,  # type: ignore
+            totals.c.vacation_days,
+            totals.c.vacation_workdays,
+        ).join(totals, totals.c.employee_id == self.model.id)
+        return keyset(query, [self.model.id], None if after is None else [after])
+
 
 EmployeeRepository = _EmployeeRepository(model=EmployeeModel)
+AsyncEmployeeRepository = AsyncBaseRepository(EmployeeRepository)
@@ -0,0 +1,81 @@
+import uuid as uid
+from collections import defaultdict
+from typing import Iterable, Type, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.model.base import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+# ? key of the session info holding the loader of the session
+ENTITY_LOADER = "entity_loader"
+
+
+class EntityLoader:
+    """
+    Loads entities by primary key, DataLoader style, for the lifetime of a
+    session, which is a request in the API.
+    Ids are queued with `prime` and fetched together, with a single
+    SELECT ... WHERE id IN (...) per model, the first time one of them is
+    loaded. Each entity is fetched at most once, and entities already in the
+    session identity map are not fetched at all. Missing ones are fetched again
+    on their next load, they may have been created since. The loaded entities
+    are forgotten on rollback, they may not exist anymore.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._pending: defaultdict[Type[BaseModel], set[uid.UUID]]
+        self._pending = defaultdict(set)
+        self._loaded: dict[tuple[Type[BaseModel], uid.UUID], BaseModel] = {}
+
+    def prime(self, model: Type[T], *ids: uid.UUID) -> None:
+        """Queues the ids, to be fetched with the next load of the model."""
+        self._pending[model].update(id for id in ids if (model, id) not in self._loaded)
+
+    def load(self, model: Type[T], id: uid.UUID) -> T | None:
+        return self.load_many(model, [id])[0]
+
+    def load_many(self, model: Type[T], ids: Iterable[uid.UUID]) -> list[T | None]:
+        """Returns the entities of the given ids, in order, None when missing."""
+        ids = list(ids)
+        self.prime(model, *ids)
+        self._dispatch(model)
+        return [self._get_loaded(model, id) for id in ids]
+
+    def _dispatch(self, model: Type[T]) -> None:
+        if not (ids := self._pending.pop(model, None)):
+            return
+        for id in list(ids):
+            entity = self.session.identity_map.get(identity_key(model, id))
+            if entity is not None:
+                self._loaded[(model, id)] = entity
+                ids.discard(id)
+        if not ids:
+            return
+        for entity in self.session.query(model).filter(model.id.in_(sorted(ids))):  # type: ignore
+            self._loaded[(model, entity.id)] = entity  # type: ignore
+
+    def _get_loaded(self, model: Type[T], id: uid.UUID) -> T | None:
+        entity = self._loaded.get((model, id))
+        # ? deleted since it was loaded
+        if entity is not None and inspect(entity).was_deleted:
+            return None
+        return entity  # type: ignore
+
+
+def get_loader(session: Session) -> EntityLoader:
+    """Returns the entity loader of the session, created on first use."""
+    if (loader := session.info.get(ENTITY_LOADER)) is None:
+        loader = session.info[ENTITY_LOADER] = EntityLoader(session)
+    return loader
+
+
+@event.listens_for(Session, "after_rollback")
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_loader(session: Session, *args) -> None:
+    # ? the loaded entities may have been created by the rolled back transaction
+    session.info.pop(ENTITY_LOADER, None)
@@ -0,0 +1,37 @@
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.model import PublicHolidayModel
+from app.repository.base import BaseRepository
+
+
+class _PublicHolidayRepository(BaseRepository[PublicHolidayModel]):
+    def replace(
+        self,
+        session: Session,
+        timezone: str,
+        start_date: date,
+        end_date: date,
+        holidays: dict[date, str | None],
+    ) -> None:
+        """
+        Replaces the public holidays of the timezone in the given period with
+        the given ones, in a single transaction.
+        """
+        with self.transaction(session):
+            self.delete_where(
+                session,
+                self.model.timezone == timezone,
+                self.model.date.between(start_date, end_date),
+            )
+            self.bulk_create(
+                session,
+                [
+                    {"timezone": timezone, "date": day, "name": name}
+                    for day, name in sorted(holidays.items())
+                ],
+            )
+
+
+PublicHolidayRepository = _PublicHolidayRepository(model=PublicHolidayModel)
@@ -1,16 +1,42 @@
+from uuid import UUID
+
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.model import TeamModel
+from app.repository.async_base import AsyncBaseRepository
 from app.repository.base import BaseRepository
+from app.repository.cache import RepositoryCache
 
 
 class _TeamRepository(BaseRepository[TeamModel]):
     def get_by_name(self, session: Session, name: str) -> TeamModel | None:
+        """Returns the team of the given name, whatever its case."""
+        return self._cached(
+            session,
+            ("name", name.lower()),
+            lambda: self.get(session, func.lower(self.model.name) == func.lower(name)),
+        )
+
+    def lock(self, session: Session, *team_ids: UUID) -> list[TeamModel]:
+        """
+        Locks the rows of the given teams until the end of the transaction, in
+        id order, see `EmployeeRepository.lock`.
+        """
         return (
-            session.query(self.model)  # type: ignore
-            .filter(self.model.name.ilike(name))  # type: ignore
-            .one_or_none()
+            self._query(session, self.model.id.in_(sorted(set(team_ids))))
+            .order_by(self.model.id)
+            .with_for_update(key_share=True)
+            .all()
         )
 
 
-TeamRepository = _TeamRepository(model=TeamModel)
+# ? teams hardly ever change
+TeamRepository = _TeamRepository(
+    model=TeamModel,
+    cache=RepositoryCache(
+        "team", ttl=settings.TEAM_CACHE_TTL, max_size=settings.TEAM_CACHE_MAX_SIZE
+    ),
+)
+AsyncTeamRepository = AsyncBaseRepository(TeamRepository)
@@ -1,13 +1,18 @@
 from datetime import date, timedelta
+from uuid import UUID
 
 from sqlalchemy.orm import Session
 
 from app.model import EmployeeModel, VacationModel
+from app.repository.async_base import AsyncBaseRepository
 from app.repository.base import BaseRepository
 from app.schema.vacation import VacationCreate, VacationType
 
 
 class _VacationRepository(BaseRepository[VacationModel]):
+    # ? queries on a single employee filter on (employee_id, start_date, end_date)
+    # ? to use the composite index, period searches across employees use
+    # ? `VacationModel.overlaps` to use the GiST index on PostgreSQL
     def get_overlapping_vacations(
         self, session: Session, vacation: VacationCreate
     ) -> list[VacationModel]:
@@ -22,6 +27,24 @@ class _VacationRepository(BaseRepository[VacationModel]):
             self.model.end_date >= vacation.start_date - timedelta(days=1),
         )
 
+    def get_overlapping_vacations_for_employees(
+        self,
+        session: Session,
+        employee_ids: list[UUID],
+        start_date: date,
+        end_date: date,
+    ) -> list[VacationModel]:
+        """
+        Returns the vacations of the given employees that overlap or contiguously
+        touch the given period.
+        """
+        return self.get_many(
+            session,
+            self.model.employee_id.in_(employee_ids),
+            self.model.start_date <= end_date + timedelta(days=1),
+            self.model.end_date >= start_date - timedelta(days=1),
+        )
+
     def get_employee_vacations(
         self,
         session: Session,
@@ -38,5 +61,57 @@ class _VacationRepository(BaseRepository[VacationModel]):
             self.model.type == type if type else True,
         )
 
+    def get_employee_vacation_periods(
+        self,
+        session: Session,
+        employee: EmployeeModel,
+        start_date: date,
+        end_date: date,
+        type: VacationType | None = None,
+    ) -> list[tuple[date, date]]:
+        """
+        Returns the (start_date, end_date) of the employee vacations in the given
+        period, sorted by start date, without loading the vacation models.
+        """
+        return (
+            session.query(self.model.start_date, self.model.end_date)  # type: ignore
+            .filter(
+                self.model.employee_id == employee.id,
+                self.model.start_date <= end_date,
+                self.model.end_date >= start_date,
+                self.model.type == type if type else True,
+            )
+            .order_by(self.model.start_date)
+            .all()
+        )
+
+    def get_vacation_periods_by_employee(
+        self,
+        session: Session,
+        start_date: date,
+        end_date: date,
+        employee_ids: list[UUID] | None = None,
+        team_id: UUID | None = None,
+        type: VacationType | None = None,
+    ) -> list[tuple[UUID, date, date]]:
+        """
+        Returns the (employee_id, start_date, end_date) of the vacations in the
+        given period, for the given employees and/or team, in a single query.
+        """
+        query = session.query(
+            self.model.employee_id, self.model.start_date, self.model.end_date  # type: ignore
+        ).filter(
+            self.model.overlaps(start_date, end_date),
+            self.model.type == type if type else True,
+        )
+        if employee_ids is not None:
+            query = query.filter(self.model.employee_id.in_(employee_ids))
+        if team_id is not None:
+            query = query.join(
+                EmployeeModel, EmployeeModel.id == self.model.employee_id
+            ).filter(EmployeeModel.team_id == team_id)
+        return query.all()
+
 
 VacationRepository = _VacationRepository(model=VacationModel)
+AsyncVacationRepository = AsyncBaseRepository(VacationRepository)
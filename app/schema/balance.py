@@ -1,3 +1,4 @@
+from enum import StrEnum
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -17,3 +18,9 @@ class Balance(BalanceBase):
 
     class Config:
         orm_mode = True
+
+
+class LedgerEntryKind(StrEnum):
+    OPENING = "opening"
+    VACATION = "vacation"
+    ADJUSTMENT = "adjustment"
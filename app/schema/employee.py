@@ -3,6 +3,8 @@ from uuid import UUID
 import pytz
 from pydantic import BaseModel, Field, validator
 
+from app.core.timezones import SUPPORTED_TIMEZONES
+
 
 class EmployeeBase(BaseModel):
     first_name: str
@@ -12,12 +14,11 @@ class EmployeeBase(BaseModel):
 
     @validator("timezone")
     def validate_timezone(cls, v: str) -> str:
-        # ? locking the timezone to Europe/Paris for now
-        if v != "Europe/Paris":
-            raise ValueError("Only Europe/Paris is supported for now")
-        # ? bypassed for now
         if v not in pytz.all_timezones:
             raise ValueError(f"Invalid timezone: {v}")
+        # ? vacations are priced with the calendar of the timezone
+        if v not in SUPPORTED_TIMEZONES:
+            raise ValueError(f"Timezone {v} is not supported yet")
         return v
 
 
@@ -30,3 +31,11 @@ class Employee(EmployeeBase):
 
     class Config:
         orm_mode = True
+
+
+class EmployeeVacationDays(Employee):
+    """Employee with the number of days of their vacations in a period."""
+
+    vacation_days: int
+    # ? weekdays that are not public holidays
+    vacation_workdays: int
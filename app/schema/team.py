@@ -1,3 +1,4 @@
+import datetime
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -16,3 +17,14 @@ class Team(TeamBase):
 
     class Config:
         orm_mode = True
+
+
+class DailyAbsence(BaseModel):
+    """Members of a team on vacation on a given day."""
+
+    date: datetime.date
+    employee_count: int
+    employee_ids: list[UUID]
+
+    class Config:
+        orm_mode = True
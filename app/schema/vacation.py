@@ -11,6 +11,11 @@ class VacationType(StrEnum):
     PAID = "paid"
 
 
+class ComparisonFormat(StrEnum):
+    PERIODS = "periods"
+    DATES = "dates"
+
+
 class VacationBase(BaseModel):
     start_date: date
     end_date: date
@@ -34,3 +39,26 @@ class Vacation(VacationBase):
 
     class Config:
         orm_mode = True
+
+
+class DatePeriod(BaseModel):
+    start_date: date
+    end_date: date
+
+
+class HeadcountPeriod(DatePeriod):
+    headcount: int
+
+
+class ImportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class VacationImportResult(BaseModel):
+    rows: int = 0
+    created: int = 0
+    deleted: int = 0
+    failed: int = 0
+    # ? only the first errors are reported
+    errors: list[str] = []
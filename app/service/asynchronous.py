@@ -0,0 +1,35 @@
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .employee import EmployeeService
+from .vacation import VacationService
+from .vacation_comparison import VacationComparisonService
+from .vacation_import import VacationImportService
+
+TService = TypeVar("TService")
+
+
+class AsyncService(Generic[TService]):
+    """
+    Async facade of a service, for `AsyncSession`s: the service methods run
+    with `AsyncSession.run_sync`, see `AsyncBaseRepository`.
+    """
+
+    def __init__(self, service: TService):
+        self.service = service
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        if not callable(method := getattr(self.service, name)):
+            return method
+
+        async def run_sync(session: AsyncSession, *args: Any, **kwargs: Any) -> Any:
+            return await session.run_sync(method, *args, **kwargs)
+
+        return run_sync
+
+
+AsyncEmployeeService = AsyncService(EmployeeService)
+AsyncVacationService = AsyncService(VacationService)
+AsyncVacationComparisonService = AsyncService(VacationComparisonService)
+AsyncVacationImportService = AsyncService(VacationImportService)
@@ -0,0 +1,148 @@
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from datetime import date
+from itertools import groupby, islice
+from operator import attrgetter
+from typing import Iterator, NamedTuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.repository.balance_ledger import BalanceLedgerRepository
+from app.repository.employee import EmployeeRepository
+from app.schema.balance import LedgerEntryKind
+
+from .vacation import VacationService
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_IN_FLIGHT = 8
+# ? ledger entries holding the vacation costs, ADJUSTMENT entries being the
+# ? corrections appended by the recompute
+RECOMPUTED_KINDS = [LedgerEntryKind.VACATION, LedgerEntryKind.ADJUSTMENT]
+
+
+class VacationPeriod(NamedTuple):
+    start_date: date
+    end_date: date
+
+
+class EmployeeVacations(NamedTuple):
+    employee_id: UUID
+    timezone: str
+    vacations: list[VacationPeriod]
+
+
+class RecomputeProgress(NamedTuple):
+    # ? last employee of the committed batch, the recompute resumes after it
+    last_employee_id: UUID
+    employees: int
+    adjusted: int
+
+
+def price_employees(batch: list[EmployeeVacations]) -> dict[UUID, int]:
+    """
+    Cost in workdays of the vacations of each employee of the batch, see
+    `VacationService.get_vacations_number_of_workdays`. Runs in the worker
+    processes, without database access.
+    """
+    costs = iter(
+        VacationService.get_vacations_number_of_workdays(
+            [vacation for employee in batch for vacation in employee.vacations],  # type: ignore
+            [employee.timezone for employee in batch for _ in employee.vacations],
+        )
+    )
+    return {
+        employee.employee_id: sum(islice(costs, len(employee.vacations)))
+        for employee in batch
+    }
+
+
+@dataclass
+class _BalanceRecomputeService:
+    batch_size: int = DEFAULT_BATCH_SIZE
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    employee_repository = EmployeeRepository
+    balance_ledger_repository = BalanceLedgerRepository
+
+    def recompute(
+        self,
+        read_session: Session,
+        write_session: Session,
+        executor: Executor,
+        after: UUID | None = None,
+    ) -> Iterator[RecomputeProgress]:
+        """
+        Prices the vacations of every employee again, in id order starting
+        right after the `after` employee, and appends an ADJUSTMENT ledger
+        entry with the difference to their VACATION and ADJUSTMENT entries.
+
+        Vacations are streamed from `read_session` and priced on the executor
+        in batches of `batch_size` employees, at most `max_in_flight` batches
+        at a time, so that memory stays flat. Batches are written in order,
+        each in a transaction of `write_session`, and their progress is
+        yielded once committed.
+        Vacation writes must be stopped meanwhile: the ones made after a batch
+        is read are in the ledger, but not in its recomputed cost.
+        """
+        in_flight: deque[tuple[list[UUID], Future[dict[UUID, int]]]] = deque()
+        for batch in self._batches(read_session, after):
+            employee_ids = [employee.employee_id for employee in batch]
+            in_flight.append((employee_ids, executor.submit(price_employees, batch)))
+            if len(in_flight) >= self.max_in_flight:
+                yield self._write(write_session, *in_flight.popleft())
+        while in_flight:
+            yield self._write(write_session, *in_flight.popleft())
+
+    def _batches(
+        self, session: Session, after: UUID | None
+    ) -> Iterator[list[EmployeeVacations]]:
+        batch: list[EmployeeVacations] = []
+        rows = self.employee_repository.stream_vacation_periods(
+            session, after=after, batch_size=self.batch_size
+        )
+        for employee_id, employee_rows in groupby(rows, attrgetter("employee_id")):
+            employee_rows = list(employee_rows)
+            batch.append(
+                EmployeeVacations(
+                    employee_id,
+                    employee_rows[0].timezone,
+                    [
+                        VacationPeriod(row.start_date, row.end_date)
+                        for row in employee_rows
+                        if row.start_date is not None
+                    ],
+                )
+            )
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _write(
+        self,
+        session: Session,
+        employee_ids: list[UUID],
+        costs: Future[dict[UUID, int]],
+    ) -> RecomputeProgress:
+        vacation_costs = costs.result()
+        with self.balance_ledger_repository.transaction(session):
+            recorded = self.balance_ledger_repository.get_sums(
+                session, employee_ids, RECOMPUTED_KINDS
+            )
+            adjustments = {
+                employee_id: vacation_costs[employee_id] - recorded.get(employee_id, 0)
+                for employee_id in employee_ids
+            }
+            self.balance_ledger_repository.add_entries(
+                session, adjustments, LedgerEntryKind.ADJUSTMENT
+            )
+        return RecomputeProgress(
+            employee_ids[-1],
+            len(employee_ids),
+            sum(1 for amount in adjustments.values() if amount),
+        )
+
+
+BalanceRecomputeService = _BalanceRecomputeService()
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+
+# ? closed interval, both dates are included
+DateInterval = tuple[date, date]
+
+
+def merge_intervals(intervals: Iterable[DateInterval]) -> list[DateInterval]:
+    """
+    Returns the given intervals sorted, with overlapping or contiguous
+    intervals merged together.
+    """
+    merged: list[DateInterval] = []
+    for start_date, end_date in sorted(intervals):
+        if merged and start_date <= merged[-1][1] + timedelta(days=1):
+            if end_date > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end_date)
+        else:
+            merged.append((start_date, end_date))
+    return merged
+
+
+def intersect_intervals(
+    intervals_1: list[DateInterval], intervals_2: list[DateInterval]
+) -> list[DateInterval]:
+    """
+    Returns the periods covered by both interval lists.
+    Both lists must be sorted and merged (see `merge_intervals`).
+    """
+    shared: list[DateInterval] = []
+    i = j = 0
+    while i < len(intervals_1) and j < len(intervals_2):
+        start_date = max(intervals_1[i][0], intervals_2[j][0])
+        end_date = min(intervals_1[i][1], intervals_2[j][1])
+        if start_date <= end_date:
+            shared.append((start_date, end_date))
+        # move past the interval finishing first
+        if intervals_1[i][1] < intervals_2[j][1]:
+            i += 1
+        else:
+            j += 1
+    return shared
+
+
+def clip_interval(interval: DateInterval, window: DateInterval) -> DateInterval | None:
+    """Returns the part of the interval inside the window, if any."""
+    start_date, end_date = max(interval[0], window[0]), min(interval[1], window[1])
+    return (start_date, end_date) if start_date <= end_date else None
+
+
+def get_headcount_periods(
+    intervals: Iterable[DateInterval], min_headcount: int = 1
+) -> list[tuple[date, date, int]]:
+    """
+    Sweeps over the interval boundaries and returns the periods during which at
+    least `min_headcount` intervals overlap, with their headcount.
+    A new period starts every time the headcount changes.
+    """
+    deltas: defaultdict[date, int] = defaultdict(int)
+    for start_date, end_date in intervals:
+        deltas[start_date] += 1
+        deltas[end_date + timedelta(days=1)] -= 1
+
+    periods: list[tuple[date, date, int]] = []
+    headcount = 0
+    previous_day: date | None = None
+    for day in sorted(deltas):
+        if not deltas[day]:
+            continue
+        if previous_day is not None and headcount >= min_headcount:
+            periods.append((previous_day, day - timedelta(days=1), headcount))
+        headcount += deltas[day]
+        previous_day = day
+    return periods
@@ -2,16 +2,23 @@ from dataclasses import dataclass
 
 from sqlalchemy.orm import Session
 
-from app.model import EmployeeModel
+from app.model import EmployeeModel, TeamModel
 from app.repository.balance import BalanceRepository
 from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
+from app.repository.vacation import VacationRepository
 from app.schema.employee import EmployeeCreate
 
+from .vacation import VacationService
+
 
 @dataclass
 class _EmployeeService:
     repository = EmployeeRepository
     balance_repository = BalanceRepository
+    team_repository = TeamRepository
+    vacation_repository = VacationRepository
+    vacation_service = VacationService
 
     def create_with_balance(
         self,
@@ -19,13 +26,39 @@ class _EmployeeService:
         employee_create: EmployeeCreate,
         balance_amount: int = 10,
     ) -> EmployeeModel:
-        employee = self.repository.create(session, employee_create.dict())
-        self.balance_repository.create_for_employee(session, employee, balance_amount)
+        with self.repository.transaction(session):
+            employee = self.repository.create(session, employee_create.dict())
+            self.balance_repository.create_for_employee(
+                session, employee, balance_amount
+            )
         return employee
 
+    def change_team(
+        self, session: Session, employee: EmployeeModel, team: TeamModel | None
+    ) -> None:
+        """
+        Moves the employee to the team, or out of their team when None, along
+        with their vacations in the team calendars.
+        """
+        with self.repository.transaction(session):
+            self.repository.lock(session, employee.id)  # type: ignore
+            # ? both teams at once, in id order, see `VacationService.update_absences`
+            team_ids = [employee.team_id, team and team.id]
+            self.team_repository.lock(session, *filter(None, team_ids))  # type: ignore
+            vacations = self.vacation_repository.get_many(
+                session, employee_id=employee.id
+            )
+            self.vacation_service.update_absences(session, removed=vacations)
+            if team is None:
+                self.repository.remove_team(session, employee)
+            else:
+                self.repository.update_team(session, employee, team)
+            self.vacation_service.update_absences(session, added=vacations)
+
     def delete(self, session: Session, employee: EmployeeModel):
-        self.balance_repository.delete_by_employee_id(session, employee.id)
-        self.repository.delete(session, employee)
+        with self.repository.transaction(session):
+            self.balance_repository.delete_by_employee_id(session, employee.id)
+            self.repository.delete(session, employee)
 
 
 EmployeeService = _EmployeeService()
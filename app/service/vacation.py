@@ -1,44 +1,68 @@
+import logging
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date
+from typing import Iterable, Iterator
+from uuid import UUID
 
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from app.model import EmployeeModel, VacationModel
-from app.repository.balance import BalanceRepository
+from app.repository.balance_ledger import BalanceLedgerRepository
+from app.repository.daily_absence import DailyAbsenceRepository, EmployeePeriod
+from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
 from app.repository.vacation import VacationRepository
+from app.schema.balance import LedgerEntryKind
 from app.schema.vacation import VacationCreate, VacationType
 
-from .vacation_validators import (
-    OverlappingVacationTypeValidator,
-    VacationValidator,
-    get_calendar_for_tz,
-)
+from .vacation_validators import OverlappingVacationTypeValidator, VacationValidator
+from .workdays import get_workday_calendar, get_working_days_deltas
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class _VacationService:
     validators: list[VacationValidator]
     repository = VacationRepository
-    balance_repository = BalanceRepository
+    balance_ledger_repository = BalanceLedgerRepository
+    employee_repository = EmployeeRepository
+    daily_absence_repository = DailyAbsenceRepository
+    team_repository = TeamRepository
 
     def create(self, session: Session, vacation: VacationCreate) -> VacationModel:
-        overlapping_vacations = self.repository.get_overlapping_vacations(
-            session, vacation
-        )
-
-        for validator in self.validators:
-            validator.validate(
-                session, vacation=vacation, overlapping_vacations=overlapping_vacations
+        with self.repository.transaction(session):
+            # ? held until the commit, concurrent writers of the employee wait
+            # ? here and then see the vacations stored by the previous one
+            self.employee_repository.lock(session, vacation.employee_id)
+            overlapping_vacations = self.repository.get_overlapping_vacations(
+                session, vacation
             )
-        if overlapping_vacations:
-            return self.handle_overlapping_vacations(
-                session, vacation, overlapping_vacations
+
+            for validator in self.validators:
+                validator.validate(
+                    session,
+                    vacation=vacation,
+                    overlapping_vacations=overlapping_vacations,
+                )
+            if overlapping_vacations:
+                return self.handle_overlapping_vacations(
+                    session, vacation, overlapping_vacations
+                )
+            created_vacation = self.repository.create(session, vacation.dict())
+            self.update_absences(session, added=[created_vacation])
+            # updating the employee balance
+            self.update_balance_by_vacation(session, created_vacation)
+            logger.info(
+                "vacation created",
+                extra={
+                    "vacation_id": str(created_vacation.id),
+                    "employee_id": str(created_vacation.employee_id),
+                },
             )
-        created_vacation = self.repository.create(session, vacation.dict())
-        # updating the employee balance
-        print("created_vacation")
-        self.update_balance_by_vacation(session, created_vacation)
-        return created_vacation
+            return created_vacation
 
     def update(
         self,
@@ -46,32 +70,49 @@ class _VacationService:
         old_vacation: VacationModel,
         new_vacation: VacationCreate,
     ) -> VacationModel:
-        overlapping_vacations = self.repository.get_overlapping_vacations(
-            session, new_vacation
-        )
-        # remove the old vacation from the overlapping vacations
-        overlapping_vacations = [
-            v for v in overlapping_vacations if v.id != old_vacation.id
-        ]
-
-        for validator in self.validators:
-            validator.validate(
-                session,
-                vacation=new_vacation,
-                overlapping_vacations=overlapping_vacations,
+        with self.repository.transaction(session):
+            employees = self.employee_repository.lock(
+                session, old_vacation.employee_id, new_vacation.employee_id  # type: ignore
             )
-        if overlapping_vacations:
-            return self.handle_overlapping_vacations(
-                session, new_vacation, overlapping_vacations
+            # ? the teams of both employees at once, in id order, see
+            # ? `update_absences`
+            team_ids = [employee.team_id for employee in employees]
+            self.team_repository.lock(session, *filter(None, team_ids))  # type: ignore
+            overlapping_vacations = self.repository.get_overlapping_vacations(
+                session, new_vacation
             )
-        updated_vacation = self.repository.update(
-            session,
-            VacationModel(employee=old_vacation.employee, **new_vacation.dict()),  # type: ignore
-        )
-        print("updated_vacation")
-        # updating the employee balance
-        self.update_balance_by_vacation(session, updated_vacation)
-        return updated_vacation
+            # remove the old vacation from the overlapping vacations
+            overlapping_vacations = [
+                v for v in overlapping_vacations if v.id != old_vacation.id
+            ]
+
+            for validator in self.validators:
+                validator.validate(
+                    session,
+                    vacation=new_vacation,
+                    overlapping_vacations=overlapping_vacations,
+                )
+            self.update_absences(session, removed=[old_vacation])
+            if overlapping_vacations:
+                # the old vacation is replaced by the merged one
+                self.repository.delete(session, old_vacation)
+                return self.handle_overlapping_vacations(
+                    session, new_vacation, overlapping_vacations
+                )
+            for key, value in new_vacation.dict().items():
+                setattr(old_vacation, key, value)
+            updated_vacation = self.repository.update(session, old_vacation)
+            self.update_absences(session, added=[updated_vacation])
+            # updating the employee balance
+            self.update_balance_by_vacation(session, updated_vacation)
+            logger.info(
+                "vacation updated",
+                extra={
+                    "vacation_id": str(updated_vacation.id),
+                    "employee_id": str(updated_vacation.employee_id),
+                },
+            )
+            return updated_vacation
 
     def handle_overlapping_vacations(
         self,
@@ -80,23 +121,75 @@ class _VacationService:
         overlapping_vacations: list[VacationModel],
     ) -> VacationModel:
         merged_vacation = self.merge_vacations(session, vacation, overlapping_vacations)
-        self.repository.delete_many(session, overlapping_vacations)
-        created_vacation = self.repository.create(session, merged_vacation.dict())
-        # updating the employee balance
-        self.update_balance_by_vacation(session, created_vacation)
+        with self.repository.transaction(session):
+            self.repository.delete_many(session, overlapping_vacations)
+            created_vacation = self.repository.create(session, merged_vacation.dict())
+            self.update_absences(
+                session, removed=overlapping_vacations, added=[created_vacation]
+            )
+            # updating the employee balance
+            self.update_balance_by_vacation(session, created_vacation)
         return created_vacation
 
+    def delete(self, session: Session, vacation: VacationModel) -> None:
+        with self.repository.transaction(session):
+            self.employee_repository.lock(session, vacation.employee_id)  # type: ignore
+            self.update_absences(session, removed=[vacation])
+            self.repository.delete(session, vacation)
+
+    def update_absences(
+        self,
+        session: Session,
+        removed: Iterable[VacationModel | VacationCreate] = (),
+        added: Iterable[VacationModel | VacationCreate] = (),
+    ) -> None:
+        """
+        Reflects the removed and added vacations in the calendars of the teams
+        of their employees, see `DailyAbsenceRepository.apply`.
+        Vacations of employees without team are not in any calendar.
+        Callers changing the calendars of several teams in more than one call
+        must lock all of them first, in a single `TeamRepository.lock`.
+        """
+        removed, added = list(removed), list(added)
+        employees = self.employee_repository.load_many(
+            session, list({vacation.employee_id for vacation in removed + added})  # type: ignore
+        )
+        team_ids = {employee.id: employee.team_id for employee in employees if employee}
+        removed_periods: defaultdict[UUID, list[EmployeePeriod]] = defaultdict(list)
+        added_periods: defaultdict[UUID, list[EmployeePeriod]] = defaultdict(list)
+        for vacations, periods in ((removed, removed_periods), (added, added_periods)):
+            for vacation in vacations:
+                if team_id := team_ids.get(vacation.employee_id):  # type: ignore
+                    periods[team_id].append(
+                        (vacation.employee_id, vacation.start_date, vacation.end_date)  # type: ignore
+                    )
+        # ? in id order, the teams changed by this call are locked
+        for team_id in sorted(removed_periods.keys() | added_periods.keys()):
+            self.daily_absence_repository.apply(
+                session, team_id, removed_periods[team_id], added_periods[team_id]
+            )
+
     def update_balance_by_vacation(
         self,
         session: Session,
         vacation: VacationModel,
     ) -> None:
-        # get the vacation cost in days
-        vacation_cost = self.get_vacation_number_of_workdays(vacation)
-        # update the employee balance
-        print(vacation.employee, vacation_cost)
-        self.balance_repository.update_balance(
-            session, vacation.employee, vacation_cost
+        # get the vacation cost in days, in the calendar of the employee
+        employee = self.employee_repository.load(session, vacation.employee_id)  # type: ignore
+        vacation_cost = self.get_vacation_number_of_workdays(
+            vacation, employee.timezone  # type: ignore
+        )
+        logger.debug(
+            "vacation priced",
+            extra={
+                "vacation_id": str(vacation.id),
+                "employee_id": str(vacation.employee_id),
+                "workdays": vacation_cost,
+            },
+        )
+        # append the change to the employee balance ledger
+        self.balance_ledger_repository.add_entry(
+            session, vacation.employee_id, vacation_cost, LedgerEntryKind.VACATION  # type: ignore
         )
 
     def merge_vacations(
@@ -119,26 +212,80 @@ class _VacationService:
         end_date: date,
         type: VacationType | None = None,
     ) -> set[EmployeeModel]:
-        vacations = self.repository.get_many(
-            session,
-            self.repository.model.start_date <= end_date,
-            self.repository.model.end_date >= start_date,
-            self.repository.model.type == type if type else True,
+        return set(
+            self.employee_repository.get_many_in_vacation(
+                session, start_date, end_date, type
+            )
+        )
+
+    def get_employees_in_vacation_page(
+        self,
+        session: Session,
+        start_date: date,
+        end_date: date,
+        type: VacationType | None = None,
+        *,
+        after: UUID | None = None,
+        limit: int,
+    ) -> list[Row]:
+        """
+        Same as `get_employees_in_vacation`, paginated on the employee id, with
+        the vacation days of each employee in the period, see
+        `EmployeeRepository.with_vacation_days`.
+        """
+        return self.employee_repository.get_page_with_vacation_days(
+            session, start_date, end_date, type, after=after, limit=limit
+        )
+
+    def stream_employees_in_vacation(
+        self,
+        session: Session,
+        start_date: date,
+        end_date: date,
+        type: VacationType | None = None,
+        *,
+        after: UUID | None = None,
+    ) -> Iterator[Row]:
+        """Same as `get_employees_in_vacation_page`, streamed by employee id."""
+        return self.employee_repository.stream_with_vacation_days(
+            session, start_date, end_date, type, after=after
         )
-        return {v.employee for v in vacations}
 
     def get_vacation_number_of_workdays(
-        self, vacation: VacationCreate | VacationModel
+        self, vacation: VacationCreate | VacationModel, timezone: str
     ) -> int:
         """
-        Get the number of workdays in the given vacation.
+        Get the number of workdays in the given vacation, in the calendar of
+        the timezone of its employee.
         Without counting public holidays and weekends.
         """
-
-        # ? For now, timezone can only be France
-        calendar = get_calendar_for_tz("Europe/Paris")
+        calendar = get_workday_calendar(timezone)
 
         return calendar.get_working_days_delta(vacation.start_date, vacation.end_date)  # type: ignore
 
+    def get_vacations_number_of_workdays(
+        self,
+        vacations: list[VacationCreate] | list[VacationModel],
+        timezones: list[str],
+    ) -> list[int]:
+        """
+        Same as `get_vacation_number_of_workdays` for many vacations, with the
+        timezone of the employee of each one. Vacations are counted all at
+        once per timezone, see `get_working_days_deltas`.
+        """
+        indexes_by_timezone: defaultdict[str, list[int]] = defaultdict(list)
+        for index, timezone in enumerate(timezones):
+            indexes_by_timezone[timezone].append(index)
+        costs = [0] * len(vacations)
+        for timezone, indexes in indexes_by_timezone.items():
+            deltas = get_working_days_deltas(
+                timezone,
+                [vacations[index].start_date for index in indexes],  # type: ignore
+                [vacations[index].end_date for index in indexes],  # type: ignore
+            )
+            for index, delta in zip(indexes, deltas.tolist()):
+                costs[index] = delta
+        return costs
+
 
 VacationService = _VacationService(validators=[OverlappingVacationTypeValidator])
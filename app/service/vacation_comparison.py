@@ -1,12 +1,22 @@
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Generator
+from typing import Generator, Iterable
+from uuid import UUID
 
 from sqlalchemy.orm import Session
 
 from app.model import EmployeeModel, VacationModel
 from app.repository.vacation import VacationRepository
 
+from .date_intervals import (
+    DateInterval,
+    clip_interval,
+    get_headcount_periods,
+    intersect_intervals,
+    merge_intervals,
+)
+
 
 def get_date_range(start_date: date, end_date: date) -> Generator[date, None, None]:
     """Returns a list of dates between the given start and end date."""
@@ -14,6 +24,11 @@ def get_date_range(start_date: date, end_date: date) -> Generator[date, None, No
         yield start_date + timedelta(n)
 
 
+def get_dates_of_periods(periods: Iterable[DateInterval]) -> list[date]:
+    """Flattens the given periods into the list of dates they cover."""
+    return [day for period in periods for day in get_date_range(*period)]
+
+
 @dataclass
 class _VacationComparisonService:
     repository = VacationRepository
@@ -26,29 +41,87 @@ class _VacationComparisonService:
         start_date: date,
         end_date: date,
     ) -> list[date]:
-        employee_1_vacations = self.repository.get_employee_vacations(
+        return get_dates_of_periods(
+            self.compare_employees_vacation_periods(
+                session, employee_1, employee_2, start_date, end_date
+            )
+        )
+
+    def compare_employees_vacation_periods(
+        self,
+        session: Session,
+        employee_1: EmployeeModel,
+        employee_2: EmployeeModel,
+        start_date: date,
+        end_date: date,
+    ) -> list[DateInterval]:
+        """Returns the periods during which both employees are on vacation."""
+        employee_1_periods = self.repository.get_employee_vacation_periods(
             session, employee_1, start_date, end_date
         )
-        employee_2_vacations = self.repository.get_employee_vacations(
+        employee_2_periods = self.repository.get_employee_vacation_periods(
             session, employee_2, start_date, end_date
         )
-        return self.compare_vacations(employee_1_vacations, employee_2_vacations)
+        return intersect_intervals(
+            merge_intervals(employee_1_periods), merge_intervals(employee_2_periods)
+        )
+
+    def get_overlapping_periods(
+        self,
+        session: Session,
+        start_date: date,
+        end_date: date,
+        min_headcount: int = 2,
+        employee_ids: list[UUID] | None = None,
+        team_id: UUID | None = None,
+    ) -> list[tuple[date, date, int]]:
+        """
+        Returns the periods, clipped to the given dates, during which at least
+        `min_headcount` of the given employees (or team members) are on vacation.
+        """
+        rows = self.repository.get_vacation_periods_by_employee(
+            session, start_date, end_date, employee_ids=employee_ids, team_id=team_id
+        )
+        periods_by_employee: defaultdict[UUID, list[DateInterval]] = defaultdict(list)
+        for employee_id, vacation_start, vacation_end in rows:
+            if period := clip_interval(
+                (vacation_start, vacation_end), (start_date, end_date)
+            ):
+                periods_by_employee[employee_id].append(period)
+        # ? merging per employee so that someone is never counted twice a day
+        return get_headcount_periods(
+            (
+                period
+                for periods in periods_by_employee.values()
+                for period in merge_intervals(periods)
+            ),
+            min_headcount,
+        )
 
     def compare_vacations(
         self, vacations_1: list[VacationModel], vacations_2: list[VacationModel]
     ) -> list[date]:
         """Returns a list of dates that are in both vacation lists."""
-        dates_1 = self._get_vacation_dates(vacations_1)
-        dates_2 = self._get_vacation_dates(vacations_2)
-        return sorted(list(dates_1 & dates_2))
-
-    def _get_vacation_dates(self, vacations: list[VacationModel]) -> set[date]:
-        """Returns a set of dates for the given vacations."""
-        return {
-            date
-            for vacation in vacations
-            for date in get_date_range(vacation.start_date, vacation.end_date)
-        }
+        return get_dates_of_periods(
+            self.compare_vacation_periods(vacations_1, vacations_2)
+        )
+
+    def compare_vacation_periods(
+        self, vacations_1: list[VacationModel], vacations_2: list[VacationModel]
+    ) -> list[DateInterval]:
+        """Returns the periods that are in both vacation lists."""
+        return intersect_intervals(
+            self._get_vacation_periods(vacations_1),
+            self._get_vacation_periods(vacations_2),
+        )
+
+    def _get_vacation_periods(
+        self, vacations: list[VacationModel]
+    ) -> list[DateInterval]:
+        """Returns the sorted and merged periods of the given vacations."""
+        return merge_intervals(
+            (vacation.start_date, vacation.end_date) for vacation in vacations  # type: ignore
+        )
 
 
 VacationComparisonService = _VacationComparisonService()
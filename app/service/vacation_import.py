@@ -0,0 +1,220 @@
+import csv
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import chain
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.model import VacationModel
+from app.repository.balance_ledger import BalanceLedgerRepository
+from app.repository.employee import EmployeeRepository
+from app.repository.vacation import VacationRepository
+from app.schema.balance import LedgerEntryKind
+from app.schema.vacation import ImportFormat, VacationCreate, VacationImportResult
+
+from .vacation import VacationService
+
+DEFAULT_CHUNK_SIZE = 10_000
+MAX_REPORTED_ERRORS = 100
+
+
+class VacationRowReader:
+    """Reads vacation rows from the lines of a CSV (with header) or NDJSON file."""
+
+    def __init__(self, format: ImportFormat):
+        self.format = format
+        self._csv_header: list[str] | None = None
+
+    def read(self, line: str) -> VacationCreate | None:
+        """
+        Returns the vacation held by the line, None for blank lines and the CSV
+        header, or raises a ValueError if the line is invalid.
+        """
+        if not line.strip():
+            return None
+        if self.format == ImportFormat.NDJSON:
+            return VacationCreate(**self._read_json(line))
+        try:
+            values = next(csv.reader([line]))
+        except csv.Error as e:
+            raise ValueError(str(e)) from e
+        if self._csv_header is None:
+            self._csv_header = [value.strip() for value in values]
+            return None
+        if len(values) != len(self._csv_header):
+            raise ValueError(
+                f"expected {len(self._csv_header)} columns, got {len(values)}"
+            )
+        row = {key: value for key, value in zip(self._csv_header, values) if value}
+        return VacationCreate(**row)
+
+    def _read_json(self, line: str) -> dict[str, Any]:
+        if not isinstance(row := json.loads(line), dict):
+            raise ValueError("expected a JSON object")
+        return row
+
+
+def merge_vacations(
+    existing_vacations: list[VacationModel], new_vacations: list[VacationCreate]
+) -> tuple[list[VacationCreate], list[VacationModel]]:
+    """
+    Sort-and-sweep merge of the vacations of a single employee, following the
+    rules of `VacationService.create`: overlapping or contiguous vacations are
+    merged into one, and must be of the same type.
+
+    Returns the vacations to create and the existing vacations to delete.
+    Existing vacations that no new vacation touches are left as they are.
+    """
+    runs: list[list[VacationModel | VacationCreate]] = []
+    run_end = None
+    for vacation in sorted(
+        chain(existing_vacations, new_vacations),
+        key=lambda v: (v.start_date, v.end_date),
+    ):
+        if runs and vacation.start_date <= run_end + timedelta(days=1):  # type: ignore
+            runs[-1].append(vacation)
+            run_end = max(run_end, vacation.end_date)  # type: ignore
+        else:
+            runs.append([vacation])
+            run_end = vacation.end_date
+
+    to_create: list[VacationCreate] = []
+    to_delete: list[VacationModel] = []
+    for run in runs:
+        if all(isinstance(vacation, VacationModel) for vacation in run):
+            continue
+        if any(vacation.type != run[0].type for vacation in run):
+            raise ValueError("Vacations are of different types")
+        to_delete.extend(v for v in run if isinstance(v, VacationModel))
+        to_create.append(
+            VacationCreate(
+                employee_id=run[0].employee_id,
+                start_date=run[0].start_date,
+                end_date=max(vacation.end_date for vacation in run),
+                type=run[0].type,
+            )
+        )
+    return to_create, to_delete
+
+
+def add_import_error(result: VacationImportResult, message: str, rows: int = 1):
+    result.failed += rows
+    if len(result.errors) < MAX_REPORTED_ERRORS:
+        result.errors.append(message)
+
+
+@dataclass
+class _VacationImportService:
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    repository = VacationRepository
+    balance_ledger_repository = BalanceLedgerRepository
+    employee_repository = EmployeeRepository
+    vacation_service = VacationService
+
+    def import_chunk(
+        self, session: Session, rows: list[tuple[int, VacationCreate]]
+    ) -> VacationImportResult:
+        """
+        Imports the given (line number, vacation) rows in a single transaction.
+
+        Rows are grouped by employee and merged, in memory, with each other and
+        with the employee existing vacations. All the writes are then batched.
+        A single balance ledger entry is appended for each employee, with the
+        cost of the vacations created for them, and the calendar of each team
+        is updated once.
+        """
+        result = VacationImportResult(rows=len(rows))
+        rows_by_employee: defaultdict[UUID, list[tuple[int, VacationCreate]]]
+        rows_by_employee = defaultdict(list)
+        for line_number, vacation in rows:
+            rows_by_employee[vacation.employee_id].append((line_number, vacation))
+
+        # ? locked until `_write` commits, see `VacationService.create`
+        employees = {
+            employee.id: employee
+            for employee in self.employee_repository.lock(session, *rows_by_employee)
+        }
+        existing_vacations: defaultdict[UUID, list[VacationModel]]
+        existing_vacations = defaultdict(list)
+        for vacation in self.repository.get_overlapping_vacations_for_employees(
+            session,
+            list(employees),
+            min(vacation.start_date for _, vacation in rows),
+            max(vacation.end_date for _, vacation in rows),
+        ):
+            existing_vacations[vacation.employee_id].append(vacation)  # type: ignore
+
+        to_create: list[VacationCreate] = []
+        to_delete: list[VacationModel] = []
+        balance_deltas: dict[UUID, int] = {}
+        for employee_id, employee_rows in rows_by_employee.items():
+            lines = ", ".join(str(line_number) for line_number, _ in employee_rows)
+            if employee_id not in employees:
+                add_import_error(
+                    result,
+                    f"lines {lines}: employee {employee_id} not found",
+                    len(employee_rows),
+                )
+                continue
+            try:
+                created, deleted = merge_vacations(
+                    existing_vacations[employee_id],
+                    [vacation for _, vacation in employee_rows],
+                )
+            except ValueError as e:
+                add_import_error(result, f"lines {lines}: {e}", len(employee_rows))
+                continue
+            to_create.extend(created)
+            to_delete.extend(deleted)
+            balance_deltas[employee_id] = 0
+
+        # ? the created vacations are priced all at once
+        costs = self.vacation_service.get_vacations_number_of_workdays(
+            to_create,
+            [employees[vacation.employee_id].timezone for vacation in to_create],  # type: ignore
+        )
+        for vacation, cost in zip(to_create, costs):
+            balance_deltas[vacation.employee_id] += cost
+
+        try:
+            self._write(session, to_create, to_delete, balance_deltas)
+        except SQLAlchemyError as e:
+            first_line, last_line = rows[0][0], rows[-1][0]
+            add_import_error(
+                result,
+                f"lines {first_line} to {last_line}: {e}",
+                result.rows - result.failed,
+            )
+            return result
+        result.created = len(to_create)
+        result.deleted = len(to_delete)
+        return result
+
+    def _write(
+        self,
+        session: Session,
+        to_create: list[VacationCreate],
+        to_delete: list[VacationModel],
+        balance_deltas: dict[UUID, int],
+    ) -> None:
+        with self.repository.transaction(session):
+            if to_delete:
+                self.repository.delete_where(
+                    session,
+                    VacationModel.id.in_([vacation.id for vacation in to_delete]),
+                )
+            self.repository.bulk_create(
+                session, [vacation.dict() for vacation in to_create]
+            )
+            self.vacation_service.update_absences(session, to_delete, to_create)
+            self.balance_ledger_repository.add_entries(
+                session, balance_deltas, LedgerEntryKind.VACATION
+            )
+
+
+VacationImportService = _VacationImportService()
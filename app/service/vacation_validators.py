@@ -1,24 +1,9 @@
 from typing import Protocol
 
-from workalendar.core import Calendar
-from workalendar.europe import France
-
 from app.model.vacation import VacationModel
 from app.schema.vacation import VacationCreate
 
 
-def get_calendar_for_tz(tz: str) -> Calendar:
-    """
-    Return a calendar for the given timezone.
-    For now, only France is supported.
-    """
-    match tz:
-        case "Europe/Paris":
-            return France()
-        case _:
-            raise ValueError(f"Timezone {tz} not supported yet")
-
-
 class VacationValidator(Protocol):
     def validate(self, *args: ..., **kwargs: ...) -> None:
         ...
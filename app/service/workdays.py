@@ -0,0 +1,217 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from importlib import import_module
+from itertools import accumulate
+from threading import Lock
+from typing import NamedTuple, Sequence
+
+import numpy as np
+from workalendar.core import Calendar
+
+from app.core.timezones import CALENDAR_CLASSES
+
+DEFAULT_MAX_YEARS = 16
+
+_workday_calendars: dict[str, "WorkdayCalendar"] = {}
+
+
+@lru_cache()
+def get_calendar_for_tz(tz: str) -> Calendar:
+    """
+    Return a calendar for the given timezone, see `CALENDAR_CLASSES`.
+    Calendars are built once per timezone and shared afterwards.
+    """
+    if (path := CALENDAR_CLASSES.get(tz)) is None:
+        raise ValueError(f"Timezone {tz} not supported yet")
+    module, _, name = path.rpartition(".")
+    return getattr(import_module(module), name)()
+
+
+@lru_cache()
+def get_workday_calendar(tz: str) -> "WorkdayCalendar":
+    """Return the shared WorkdayCalendar for the given timezone."""
+    calendar = _workday_calendars[tz] = WorkdayCalendar(get_calendar_for_tz(tz))
+    return calendar
+
+
+def get_workday_calendars() -> dict[str, "WorkdayCalendar"]:
+    """The WorkdayCalendars built so far, by timezone."""
+    return dict(_workday_calendars)
+
+
+def get_working_days_deltas(
+    tz: str, start_dates: Sequence[date], end_dates: Sequence[date]
+) -> np.ndarray:
+    """
+    Vectorized `WorkdayCalendar.get_working_days_delta` of each (start, end)
+    pair, in the calendar of the timezone. To price many vacations at once.
+    """
+    return get_workday_calendar(tz).get_working_days_deltas(start_dates, end_dates)
+
+
+def get_public_holidays(tz: str, year: int) -> dict[date, str | None]:
+    """
+    Returns the weekdays of the year that are not working days in the calendar
+    of the timezone, with their holiday name when they have one.
+    Stored as `PublicHolidayModel`s, they make the working days countable in
+    SQL, as weekdays minus public holidays.
+    """
+    calendar = get_workday_calendar(tz)
+    names = dict(calendar.calendar.holidays(year))
+    first_day = date(year, 1, 1)
+    days = (
+        first_day + timedelta(days=n)
+        for n in range((date(year + 1, 1, 1) - first_day).days)
+    )
+    return {
+        day: names.get(day)
+        for day in days
+        if day.weekday() < 5 and not calendar.is_working_day(day)
+    }
+
+
+class YearCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+@dataclass(frozen=True)
+class _YearTable:
+    holidays: frozenset[date]
+    # ? cumulative[n] is the number of working days in the first n days of the year
+    cumulative: tuple[int, ...]
+
+    @property
+    def total(self) -> int:
+        return self.cumulative[-1]
+
+
+class WorkdayCalendar:
+    """
+    Answers working day questions for a workalendar calendar in O(1).
+
+    Each year is computed once into a holiday set and a cumulative count of
+    working days, then kept in a LRU of at most `max_years` years.
+    """
+
+    def __init__(self, calendar: Calendar, max_years: int = DEFAULT_MAX_YEARS):
+        self.calendar = calendar
+        self.max_years = max_years
+        self._years: OrderedDict[int, _YearTable] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def holidays(self, year: int) -> frozenset[date]:
+        return self._get_year(year).holidays
+
+    def is_working_day(self, day: date) -> bool:
+        table = self._get_year(day.year)
+        ordinal = day.timetuple().tm_yday
+        return table.cumulative[ordinal] != table.cumulative[ordinal - 1]
+
+    def count_working_days(self, start_date: date, end_date: date) -> int:
+        """Number of working days between the two dates, both included."""
+        if end_date < start_date:
+            return 0
+        start_table = self._get_year(start_date.year)
+        before_start = start_table.cumulative[start_date.timetuple().tm_yday - 1]
+        if start_date.year == end_date.year:
+            return start_table.cumulative[end_date.timetuple().tm_yday] - before_start
+        end_table = self._get_year(end_date.year)
+        return (
+            start_table.total
+            - before_start
+            + sum(
+                self._get_year(year).total
+                for year in range(start_date.year + 1, end_date.year)
+            )
+            + end_table.cumulative[end_date.timetuple().tm_yday]
+        )
+
+    def get_working_days_delta(
+        self, start: date, end: date, include_start: bool = False
+    ) -> int:
+        """Same contract as `workalendar.core.Calendar.get_working_days_delta`."""
+        if start == end:
+            return 0
+        if start > end:
+            start, end = end, start
+        count = self.count_working_days(start + timedelta(days=1), end)
+        if include_start and self.is_working_day(start):
+            count += 1
+        return count
+
+    def count_working_days_many(
+        self, start_dates: Sequence[date], end_dates: Sequence[date]
+    ) -> np.ndarray:
+        """
+        Same as `count_working_days` for arrays of dates, with
+        `numpy.busday_count`: working days are the weekdays of the calendar
+        minus its holidays, which is how workalendar calendars define them.
+        """
+        starts = np.asarray(start_dates, dtype="datetime64[D]")
+        ends = np.asarray(end_dates, dtype="datetime64[D]")
+        if not starts.size:
+            return np.zeros(0, dtype=np.int64)
+        years = np.concatenate([starts, ends]).astype("datetime64[Y]").astype(int)
+        holidays = [
+            day
+            for year in range(years.min() + 1970, years.max() + 1971)
+            for day in self.holidays(year)
+        ]
+        weekend_days = self.calendar.get_weekend_days()
+        counts = np.busday_count(
+            starts,
+            ends + np.timedelta64(1, "D"),
+            weekmask=[day not in weekend_days for day in range(7)],
+            holidays=holidays,
+        )
+        return np.where(ends < starts, 0, counts)
+
+    def get_working_days_deltas(
+        self, start_dates: Sequence[date], end_dates: Sequence[date]
+    ) -> np.ndarray:
+        """
+        Same as `get_working_days_delta`, without `include_start`, for arrays
+        of dates.
+        """
+        starts = np.asarray(start_dates, dtype="datetime64[D]")
+        ends = np.asarray(end_dates, dtype="datetime64[D]")
+        return self.count_working_days_many(
+            np.minimum(starts, ends) + np.timedelta64(1, "D"), np.maximum(starts, ends)
+        )
+
+    def cache_info(self) -> YearCacheInfo:
+        return YearCacheInfo(self._hits, self._misses, self.max_years, len(self._years))
+
+    def _get_year(self, year: int) -> _YearTable:
+        with self._lock:
+            if (table := self._years.get(year)) is not None:
+                self._years.move_to_end(year)
+                self._hits += 1
+                return table
+            self._misses += 1
+            table = self._build_year(year)
+            self._years[year] = table
+            if len(self._years) > self.max_years:
+                self._years.popitem(last=False)
+            return table
+
+    def _build_year(self, year: int) -> _YearTable:
+        first_day = date(year, 1, 1)
+        days = (date(year + 1, 1, 1) - first_day).days
+        # ? delegating to the calendar keeps the exact workalendar semantics,
+        # ? including calendars overriding is_working_day
+        working_days = (
+            int(self.calendar.is_working_day(first_day + timedelta(days=n)))
+            for n in range(days)
+        )
+        return _YearTable(
+            holidays=frozenset(self.calendar.holidays_set(year)),
+            cumulative=tuple(accumulate(working_days, initial=0)),
+        )
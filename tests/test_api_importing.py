@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi import HTTPException
+
+from app.api.importing import get_import_format, import_vacation_rows, iter_lines
+from app.schema.vacation import ImportFormat, VacationImportResult
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def _request(*chunks: bytes) -> MagicMock:
+    request = MagicMock(headers={"content-type": "text/csv; charset=utf-8"})
+    request.stream = lambda: _chunks(*chunks)
+    return request
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestImporting(unittest.TestCase):
+    def test_iter_lines_across_chunks(self):
+        # "é" is split between two chunks
+        lines = asyncio.run(
+            _collect(iter_lines(_chunks(b"a,b\nc\xc3", b"\xa9\n", b"last")))
+        )
+        self.assertEqual(lines, [(1, "a,b"), (2, "cé"), (3, "last")])
+
+    def test_get_import_format(self):
+        self.assertEqual(get_import_format(_request()), ImportFormat.CSV)
+        with self.assertRaises(HTTPException) as context:
+            get_import_format(MagicMock(headers={"content-type": "text/plain"}))
+        self.assertEqual(context.exception.status_code, 415)
+
+    def test_import_vacation_rows_by_chunks(self):
+        header = b"employee_id,start_date,end_date,type\n"
+        row = b"00000000-0000-0000-0000-000000000001,2023-03-06,2023-03-08,paid\n"
+        chunks = []
+
+        async def import_chunk(rows):
+            chunks.append([line_number for line_number, _ in rows])
+            return VacationImportResult(rows=len(rows), created=len(rows))
+
+        result = asyncio.run(
+            import_vacation_rows(
+                _request(header, row, b"not a row\n", row, row),
+                ImportFormat.CSV,
+                import_chunk,
+                2,
+            )
+        )
+        self.assertEqual(chunks, [[2, 4], [5]])
+        self.assertEqual((result.rows, result.created, result.failed), (4, 3, 1))
+        self.assertEqual(len(result.errors), 1)
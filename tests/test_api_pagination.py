@@ -0,0 +1,51 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+from uuid import UUID
+
+from fastapi import HTTPException
+
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    page_response,
+)
+from app.schema.team import Team
+
+DUMMY_TEAMS = [
+    Team(id=UUID(f"00000000-0000-0000-0000-00000000000{n}"), name=f"Team{n}")
+    for n in range(3)
+]
+
+
+class TestPagination(unittest.TestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(date(2021, 1, 1), DUMMY_TEAMS[1].id)
+        self.assertEqual(
+            decode_cursor(cursor, date.fromisoformat, UUID),
+            (date(2021, 1, 1), DUMMY_TEAMS[1].id),
+        )
+
+    def test_no_cursor(self):
+        self.assertIsNone(decode_cursor(None, UUID))
+
+    def test_invalid_cursor(self):
+        for cursor in ("not a cursor", encode_cursor("not an uuid"), encode_cursor()):
+            with self.assertRaises(HTTPException):
+                decode_cursor(cursor, UUID)
+
+    def test_page_response_sets_next_cursor(self):
+        response = MagicMock(headers={})
+        page = page_response(response, DUMMY_TEAMS, 2, Team, lambda t: [t.id])
+        self.assertEqual(page, DUMMY_TEAMS[:2])
+        self.assertEqual(
+            decode_cursor(response.headers[NEXT_CURSOR_HEADER], UUID),
+            (DUMMY_TEAMS[1].id,),
+        )
+
+    def test_last_page_has_no_cursor(self):
+        response = MagicMock(headers={})
+        page = page_response(response, DUMMY_TEAMS, 3, Team, lambda t: [t.id])
+        self.assertEqual(page, DUMMY_TEAMS)
+        self.assertNotIn(NEXT_CURSOR_HEADER, response.headers)
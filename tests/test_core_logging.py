@@ -0,0 +1,32 @@
+import json
+import logging
+import unittest
+
+from app.core.logging import JsonFormatter, SamplingFilter
+
+
+class TestStructuredLogging(unittest.TestCase):
+    def _record(self, level: int, **fields) -> logging.LogRecord:
+        return logging.getLogger("app.test").makeRecord(
+            "app.test",
+            level,
+            __file__,
+            1,
+            "vacation %s",
+            ("created",),
+            None,
+            extra=fields,
+        )
+
+    def test_records_are_json_with_their_fields(self):
+        entry = json.loads(
+            JsonFormatter().format(self._record(logging.INFO, vacation_id="v1"))
+        )
+        self.assertEqual(entry["message"], "vacation created")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["vacation_id"], "v1")
+
+    def test_records_under_warning_are_sampled(self):
+        self.assertFalse(SamplingFilter(0).filter(self._record(logging.INFO)))
+        self.assertTrue(SamplingFilter(1).filter(self._record(logging.INFO)))
+        self.assertTrue(SamplingFilter(0).filter(self._record(logging.WARNING)))
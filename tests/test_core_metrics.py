@@ -0,0 +1,82 @@
+import unittest
+from uuid import UUID
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import MetricsMiddleware
+from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
+from tests.utils import get_test_db
+
+
+def get_sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestRepositoryMetrics(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+
+    def test_statements_are_labelled_with_the_outermost_method(self):
+        labels = {"repository": "TeamRepository", "method": "create_unless_exists"}
+        count = get_sample("db_query_duration_seconds_count", **labels)
+        get_count = get_sample(
+            "db_query_duration_seconds_count", repository="TeamRepository", method="get"
+        )
+        # ? an INSERT, then the SELECT of `get_by_id`
+        TeamRepository.create_unless_exists(self.session, {"name": "Metrics"})
+        self.assertEqual(
+            get_sample("db_query_duration_seconds_count", **labels), count + 2
+        )
+        self.assertEqual(
+            get_sample(
+                "db_query_duration_seconds_count",
+                repository="TeamRepository",
+                method="get",
+            ),
+            get_count,
+        )
+
+    def test_generators_are_labelled_while_iterated(self):
+        EmployeeRepository.create(
+            self.session, {"id": UUID(int=1), "first_name": "J", "last_name": "D"}
+        )
+        labels = {"repository": "EmployeeRepository", "method": "stream"}
+        count = get_sample("db_query_duration_seconds_count", **labels)
+        employees = EmployeeRepository.stream(self.session, order_by=[])
+        self.assertEqual(get_sample("db_query_duration_seconds_count", **labels), count)
+        self.assertEqual(len(list(employees)), 1)
+        self.assertEqual(
+            get_sample("db_query_duration_seconds_count", **labels), count + 1
+        )
+
+
+class TestMetricsMiddleware(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+
+        @app.get("/metrics-test/{item_id}")
+        def get_item(item_id: int):
+            return item_id
+
+        app.add_middleware(MetricsMiddleware)
+        self.client = TestClient(app)
+
+    def test_requests_are_labelled_with_their_route(self):
+        labels = {"method": "GET", "route": "/metrics-test/{item_id}", "status": "200"}
+        count = get_sample("http_request_duration_seconds_count", **labels)
+        for item_id in (1, 2):
+            self.client.get(f"/metrics-test/{item_id}")
+        self.assertEqual(
+            get_sample("http_request_duration_seconds_count", **labels), count + 2
+        )
+        self.assertEqual(get_sample("http_requests_in_progress", method="GET"), 0)
+
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        count = get_sample("http_request_duration_seconds_count", **labels)
+        self.client.get("/metrics-test")
+        self.assertEqual(
+            get_sample("http_request_duration_seconds_count", **labels), count + 1
+        )
@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi import Response
+from sqlalchemy import create_engine, exc
+
+from app.core.config import settings
+from app.db.engine import get_engine_options
+from app.db.pool import InstrumentedQueuePool
+from app.db.replicas import Replica, ReplicaRouter
+from app.db.session import PRIMARY_STICKY_COOKIE, get_db
+
+
+class TestInstrumentedPool(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.01,
+        )
+
+    def test_checkout_metrics(self):
+        with self.engine.connect():
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+            stats = self.engine.pool.stats()
+            self.assertEqual((stats["size"], stats["checked_out"]), (1, 1))
+
+        stats = self.engine.pool.stats()
+        self.assertEqual((stats["checkouts"], stats["timeouts"]), (2, 1))
+        self.assertGreaterEqual(stats["wait_seconds_max"], 0.01)
+        self.assertEqual(stats["checked_in"], 1)
+
+    def test_metrics_survive_dispose(self):
+        self.engine.connect().close()
+        self.engine.dispose()
+        self.assertEqual(self.engine.pool.stats()["checkouts"], 1)
+
+
+class TestEngineOptions(unittest.TestCase):
+    def test_pool_settings(self):
+        with patch.object(settings, "DB_POOL_SIZE", 42):
+            options = get_engine_options()
+        self.assertEqual(options["pool_size"], 42)
+        self.assertIs(options["poolclass"], InstrumentedQueuePool)
+        # no statement timeout by default
+        self.assertEqual(options["connect_args"], {})
+
+    def test_statement_timeout(self):
+        with patch.object(settings, "DB_STATEMENT_TIMEOUT", 30_000):
+            self.assertEqual(
+                get_engine_options()["connect_args"],
+                {"options": "-c statement_timeout=30000"},
+            )
+            self.assertEqual(
+                get_engine_options(is_async=True)["connect_args"],
+                {"server_settings": {"statement_timeout": "30000"}},
+            )
+
+    def test_pgbouncer_mode(self):
+        with patch.object(settings, "DB_PGBOUNCER", True):
+            self.assertEqual(get_engine_options()["connect_args"], {})
+            self.assertEqual(
+                get_engine_options(is_async=True)["connect_args"],
+                {"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+            )
+
+
+class TestReplicaRouting(unittest.TestCase):
+    def setUp(self):
+        self.replica = MagicMock()
+        self.replica.sessionmaker.get_db.side_effect = lambda: iter(["replica"])
+        self.primary = MagicMock()
+        self.primary.get_db.side_effect = lambda: iter(["primary"])
+        self.router = MagicMock()
+        self.router.pick.return_value = self.replica
+        for patcher in (
+            patch.object(settings, "SQLALCHEMY_REPLICA_URIS", ["postgresql://r/db"]),
+            patch(
+                "app.db.session._get_fastapi_sessionmaker", return_value=self.primary
+            ),
+            patch("app.db.session._get_replica_router", return_value=self.router),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _get_db(self, method: str, cookies: dict[str, str] | None = None):
+        response = Response()
+        request = MagicMock(method=method, cookies=cookies or {})
+        return next(get_db(request, response)), response
+
+    def test_reads_go_to_a_replica(self):
+        self.assertEqual(self._get_db("GET")[0], "replica")
+
+    def test_writes_go_to_the_primary_and_stick(self):
+        session, response = self._get_db("POST")
+        self.assertEqual(session, "primary")
+        self.assertIn(PRIMARY_STICKY_COOKIE, response.headers["set-cookie"])
+        # the next reads of the client see its writes
+        self.assertEqual(
+            self._get_db("GET", {PRIMARY_STICKY_COOKIE: "1"})[0], "primary"
+        )
+
+    def test_reads_fall_back_to_the_primary(self):
+        self.router.pick.return_value = None
+        self.assertEqual(self._get_db("GET")[0], "primary")
+
+
+class TestReplicaRouter(unittest.TestCase):
+    def test_lagging_replicas_are_skipped(self):
+        router = ReplicaRouter(["postgresql://r1/db", "postgresql://r2/db"])
+        with patch.object(Replica, "_check_lag", side_effect=[0, 0.5]):
+            self.assertEqual(
+                {router.pick(), router.pick(), router.pick()}, set(router.replicas)
+            )
+        # the lag is checked again on the next interval
+        for replica in router.replicas:
+            replica._checked_at -= settings.DB_REPLICA_LAG_CHECK_INTERVAL
+        with patch.object(
+            Replica, "_check_lag", side_effect=[settings.DB_REPLICA_MAX_LAG + 1, None]
+        ):
+            self.assertIsNone(router.pick())
@@ -0,0 +1,41 @@
+import unittest
+import uuid as uid
+
+from sqlalchemy import cast, literal
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.model.base import CustomUUID
+
+DUMMY_UUID = uid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+class TestCustomUUID(unittest.TestCase):
+    def setUp(self):
+        self.type = CustomUUID()
+
+    def test_native_uuid_on_postgresql(self):
+        dialect = postgresql.dialect()
+        self.assertEqual(
+            str(cast(literal("x"), self.type).compile(dialect=dialect)),
+            "CAST(%(param_1)s AS UUID)",
+        )
+        self.assertEqual(
+            self.type.process_bind_param(str(DUMMY_UUID), dialect), DUMMY_UUID
+        )
+        self.assertEqual(
+            self.type.process_result_value(DUMMY_UUID, dialect), DUMMY_UUID
+        )
+
+    def test_char_on_other_databases(self):
+        dialect = sqlite.dialect()
+        self.assertEqual(
+            str(cast(literal("x"), self.type).compile(dialect=dialect)),
+            "CAST(? AS CHAR(36))",
+        )
+        self.assertEqual(
+            self.type.process_bind_param(DUMMY_UUID, dialect), str(DUMMY_UUID)
+        )
+        self.assertEqual(
+            self.type.process_result_value(str(DUMMY_UUID), dialect), DUMMY_UUID
+        )
+        self.assertIsNone(self.type.process_bind_param(None, dialect))
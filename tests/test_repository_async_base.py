@@ -0,0 +1,113 @@
+import unittest
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_team_by_id_async
+from app.api.routes.asynchronous.vacation import (
+    create_employee_vacation,
+    delete_vacation,
+)
+from app.repository.employee import AsyncEmployeeRepository
+from app.repository.team import AsyncTeamRepository
+from app.repository.vacation import AsyncVacationRepository
+from app.schema.vacation import VacationCreate
+from app.service.asynchronous import AsyncVacationService
+from tests.utils import get_async_test_db
+
+
+class TestAsyncBaseRepository(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.session = await get_async_test_db()
+        self.employee = await AsyncEmployeeRepository.create(
+            self.session,
+            {"id": UUID(int=1), "first_name": "Jerome", "last_name": "Powell"},
+        )
+
+    async def asyncTearDown(self):
+        await self.session.close()
+
+    def _vacation(self, month: int) -> VacationCreate:
+        return VacationCreate(
+            employee_id=self.employee.id,
+            start_date=date(2021, month, 1),
+            end_date=date(2021, month, 5),
+        )
+
+    async def test_reads(self):
+        self.assertIs(
+            await AsyncEmployeeRepository.get_by_id(self.session, UUID(int=1)),
+            self.employee,
+        )
+        self.assertIsNone(
+            await AsyncEmployeeRepository.get(self.session, first_name="Janet")
+        )
+        self.assertEqual(
+            await AsyncEmployeeRepository.get_many(self.session, last_name="Powell"),
+            [self.employee],
+        )
+
+    async def test_page_and_stream(self):
+        for month in range(1, 6):
+            await AsyncVacationRepository.create(
+                self.session, self._vacation(month).dict()
+            )
+        order_by = [
+            AsyncVacationRepository.model.start_date,
+            AsyncVacationRepository.model.id,
+        ]
+        page = await AsyncVacationRepository.get_page(
+            self.session, employee_id=self.employee.id, order_by=order_by, limit=2
+        )
+        self.assertEqual([v.start_date.month for v in page], [1, 2])
+        streamed = [
+            vacation.start_date.month
+            async for vacation in AsyncVacationRepository.stream(
+                self.session,
+                order_by=order_by,
+                after=[page[-1].start_date, page[-1].id],
+                batch_size=2,
+            )
+        ]
+        self.assertEqual(streamed, [3, 4, 5])
+
+    async def test_services_and_routes(self):
+        await AsyncVacationService.create(self.session, self._vacation(1))
+        # merged with the first one by the sync service, run on the event loop
+        vacation = await create_employee_vacation(
+            db=self.session,
+            employee=self.employee,
+            vacation=VacationCreate(
+                employee_id=self.employee.id,
+                start_date=date(2021, 1, 4),
+                end_date=date(2021, 1, 8),
+            ),
+        )
+        self.assertEqual(
+            (vacation.start_date, vacation.end_date),
+            (date(2021, 1, 1), date(2021, 1, 8)),
+        )
+
+        await delete_vacation(
+            db=self.session,
+            employee=self.employee,
+            vacation=await AsyncVacationRepository.get_by_id(self.session, vacation.id),
+        )
+        self.assertEqual(await AsyncVacationRepository.get_many(self.session), [])
+
+    async def test_team_lookups_are_cached(self):
+        team = await AsyncTeamRepository.create(self.session, {"name": "TeamA"})
+        statements: list[str] = []
+        event.listen(
+            self.session.bind.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        for _ in range(2):
+            # ? a new session for each lookup, like a new request
+            async with AsyncSession(self.session.bind) as session:
+                found = await get_team_by_id_async(session, team_id=team.id)
+                self.assertEqual(found.name, "TeamA")
+        self.assertEqual(len(statements), 1)
@@ -0,0 +1,81 @@
+import unittest
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import event
+
+from app.repository.balance import BalanceRepository
+from app.repository.balance_ledger import BalanceLedgerRepository
+from app.repository.employee import EmployeeRepository
+from app.schema.balance import LedgerEntryKind
+from tests.utils import get_test_db
+
+
+class TestBalanceRepository(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+        self.employees = [
+            EmployeeRepository.create(
+                self.session,
+                {"id": UUID(int=n), "first_name": "John", "last_name": "Doe"},
+            )
+            for n in range(1, 3)
+        ]
+        for employee in self.employees:
+            BalanceRepository.create_for_employee(self.session, employee, 10)
+
+    def _balance(self, employee, at=None) -> int:
+        return BalanceRepository.get_schema_by_employee_id(
+            self.session, employee.id, at
+        ).balance
+
+    def test_ledger_entries_add_up(self):
+        before = datetime.utcnow()
+        BalanceLedgerRepository.add_entry(
+            self.session, self.employees[0].id, 3, LedgerEntryKind.VACATION
+        )
+        BalanceLedgerRepository.add_entries(
+            self.session,
+            {employee.id: 2 for employee in self.employees},
+            LedgerEntryKind.ADJUSTMENT,
+        )
+        self.assertEqual([self._balance(e) for e in self.employees], [15, 12])
+        # the balance as it was before the entries
+        self.assertEqual(self._balance(self.employees[0], before), 10)
+        self.assertIsNone(
+            BalanceRepository.get_schema_by_employee_id(self.session, UUID(int=3))
+        )
+
+    def test_get_balance_in_one_query(self):
+        employee_id = self.employees[0].id
+        statements: list[str] = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        BalanceRepository.get_schema_by_employee_id(self.session, employee_id)
+        self.assertEqual(len(statements), 1)
+
+    def test_roll_up(self):
+        for amount in (1, 2):
+            BalanceLedgerRepository.add_entry(
+                self.session, self.employees[0].id, amount, LedgerEntryKind.VACATION
+            )
+        until = datetime.utcnow()
+        BalanceLedgerRepository.add_entry(
+            self.session, self.employees[0].id, 4, LedgerEntryKind.VACATION
+        )
+
+        self.assertEqual(BalanceRepository.roll_up(self.session, until), 1)
+        self.session.expire_all()
+        snapshot = BalanceRepository.get_by_employee_id(
+            self.session, self.employees[0].id
+        )
+        self.assertEqual((snapshot.balance, snapshot.snapshot_at), (13, until))
+        # the entries after the snapshot are still counted, and history is kept
+        self.assertEqual(self._balance(self.employees[0]), 17)
+        self.assertEqual(self._balance(self.employees[0], until - timedelta(days=1)), 0)
+
+        # nothing left to roll up
+        self.assertEqual(BalanceRepository.roll_up(self.session, until), 0)
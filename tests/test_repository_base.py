@@ -23,3 +23,26 @@ class TestBaseRepository(unittest.TestCase):
     def test_get_by_id_not_found(self):
         self.session.query().filter().one_or_none.return_value = None  # type: ignore
         self.assertIsNone(self.repository.get_by_id(self.session, id=uid.uuid4()))
+
+    def test_transaction_commits_once(self):
+        self.session.info = {}
+        with self.repository.transaction(self.session):
+            with self.repository.transaction(self.session):
+                self.repository.update(self.session, BaseModel())
+            self.repository.delete(self.session, BaseModel())
+            self.session.commit.assert_not_called()
+            self.assertEqual(self.session.flush.call_count, 2)
+        self.session.commit.assert_called_once()
+        self.session.rollback.assert_not_called()
+
+    def test_transaction_rollback_on_error(self):
+        self.session.info = {}
+        with self.assertRaises(RuntimeError):
+            with self.repository.transaction(self.session):
+                self.repository.update(self.session, BaseModel())
+                raise RuntimeError()
+        self.session.commit.assert_not_called()
+        self.session.rollback.assert_called_once()
+        # commits again once out of the transaction
+        self.repository.update(self.session, BaseModel())
+        self.session.commit.assert_called_once()
@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch
+from uuid import UUID
+
+from sqlalchemy import event
+
+from app.repository.cache import (
+    MISSING,
+    LocalInvalidationChannel,
+    RepositoryCache,
+    set_invalidation_channel,
+)
+from app.repository.team import TeamRepository
+from tests.utils import get_test_db
+
+
+class TestRepositoryCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = RepositoryCache("test", ttl=10, max_size=2)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        for key in "abc":
+            self.cache.set(key, key.upper(), self.cache.generation)
+            self.cache.get("a")
+        self.assertEqual([self.cache.get(key) for key in "abc"], ["A", MISSING, "C"])
+
+    def test_entries_expire(self):
+        with patch("app.repository.cache.time.monotonic", return_value=100):
+            self.cache.set("a", "A", self.cache.generation)
+        with patch("app.repository.cache.time.monotonic", return_value=109):
+            self.assertEqual(self.cache.get("a"), "A")
+        with patch("app.repository.cache.time.monotonic", return_value=110):
+            self.assertIs(self.cache.get("a"), MISSING)
+
+    def test_values_read_before_an_invalidation_are_not_cached(self):
+        generation = self.cache.generation
+        self.cache.clear()
+        self.cache.set("a", "A", generation)
+        self.assertIs(self.cache.get("a"), MISSING)
+
+
+class TestTeamRepositoryCache(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+        self.team_id = UUID(int=1)
+        TeamRepository.create(self.session, {"id": self.team_id, "name": "TeamA"})
+        self.session.remove()
+        self.statements: list[str] = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: self.statements.append(args[2]),
+        )
+
+    def _get_team(self):
+        # ? a new session for each lookup, like a new request
+        self.session.remove()
+        return TeamRepository.get_by_id(self.session, self.team_id)
+
+    def test_lookups_are_cached(self):
+        self.assertEqual(self._get_team().name, "TeamA")
+        self.assertEqual(self._get_team().name, "TeamA")
+        self.assertEqual(
+            TeamRepository.get_by_name(self.session, "teama").id, self.team_id
+        )
+        self.assertEqual(
+            TeamRepository.get_by_name(self.session, "TEAMA").id, self.team_id
+        )
+        self.assertEqual(len(self.statements), 2)
+        # the cached team is attached to the session
+        self.assertEqual(self._get_team().employees, [])
+
+    def test_writes_invalidate_the_cache(self):
+        team = self._get_team()
+        team.name = "TeamB"
+        TeamRepository.update(self.session, team)
+        self.assertEqual(self._get_team().name, "TeamB")
+        TeamRepository.delete(self.session, self._get_team())
+        self.assertIsNone(self._get_team())
+
+    def test_invalidations_are_broadcast_on_commit(self):
+        channel = LocalInvalidationChannel()
+        set_invalidation_channel(channel)
+        self.addCleanup(set_invalidation_channel, None)
+        with TeamRepository.transaction(self.session):
+            TeamRepository.create(self.session, {"name": "TeamB"})
+            self.assertEqual(channel.published, [])
+        self.assertEqual(channel.published, ["team"])
+        # invalidations of the other processes clear the local cache
+        self._get_team()
+        channel.publish(self.session, "team")
+        self._get_team()
+        self.assertEqual(len(self.statements), 3)
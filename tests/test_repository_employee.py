@@ -1,9 +1,18 @@
 import unittest
 import uuid as uid
+from datetime import date, timedelta
+from random import Random
 from unittest.mock import MagicMock
 
+from sqlalchemy.dialects import postgresql
+
 from app.model import EmployeeModel
 from app.repository.employee import EmployeeRepository
+from app.repository.public_holiday import PublicHolidayRepository
+from app.repository.vacation import VacationRepository
+from app.schema.vacation import VacationType
+from app.service.workdays import get_public_holidays, get_workday_calendar
+from tests.utils import get_test_db
 
 
 class TestEmployeeRepository(unittest.TestCase):
@@ -14,3 +23,67 @@ class TestEmployeeRepository(unittest.TestCase):
     def test_get_by_id(self):
         self.session.query().filter().one_or_none.return_value = EmployeeModel()  # type: ignore
         self.assertIsNotNone(self.repository.get_by_id(self.session, id=uid.uuid4()))
+
+
+class TestEmployeeVacationDays(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+        PublicHolidayRepository.replace(
+            self.session,
+            "Europe/Paris",
+            date(2022, 1, 1),
+            date(2024, 12, 31),
+            {
+                day: name
+                for year in range(2022, 2025)
+                for day, name in get_public_holidays("Europe/Paris", year).items()
+            },
+        )
+        self.employees = [
+            EmployeeRepository.create(
+                self.session,
+                {"id": uid.UUID(int=n), "first_name": "John", "last_name": "Doe"},
+            )
+            for n in range(1, 6)
+        ]
+
+    def test_parity_with_the_workday_calendar(self):
+        random = Random(42)
+        calendar = get_workday_calendar("Europe/Paris")
+        start_date, end_date = date(2023, 3, 10), date(2023, 9, 20)
+        expected: dict[uid.UUID, list[int]] = {}
+        for employee in self.employees[:4]:
+            day = date(2023, 1, 1) + timedelta(days=random.randrange(30))
+            while day < date(2024, 1, 1):
+                vacation_end = day + timedelta(days=random.randrange(20))
+                VacationRepository.create(
+                    self.session,
+                    {
+                        "employee_id": employee.id,
+                        "start_date": day,
+                        "end_date": vacation_end,
+                        "type": VacationType.PAID,
+                    },
+                )
+                clipped = (max(day, start_date), min(vacation_end, end_date))
+                if clipped[0] <= clipped[1]:
+                    totals = expected.setdefault(employee.id, [0, 0])
+                    totals[0] += (clipped[1] - clipped[0]).days + 1
+                    totals[1] += calendar.count_working_days(*clipped)
+                day = vacation_end + timedelta(days=random.randrange(2, 40))
+
+        rows = EmployeeRepository.get_page_with_vacation_days(
+            self.session, start_date, end_date, limit=10
+        )
+        self.assertEqual(
+            {row.id: [row.vacation_days, row.vacation_workdays] for row in rows},
+            expected,
+        )
+        self.assertEqual([row.id for row in rows], sorted(expected))
+
+    def test_day_numbers_on_postgresql(self):
+        query = EmployeeRepository.with_vacation_days(
+            self.session, date(2023, 1, 1), date(2023, 1, 31)
+        )
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+        self.assertIn("- DATE '1900-01-01')", sql)
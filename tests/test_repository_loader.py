@@ -0,0 +1,85 @@
+import unittest
+from uuid import UUID
+
+from sqlalchemy import event
+
+from app.model import EmployeeModel, TeamModel
+from app.repository.employee import EmployeeRepository
+from app.repository.loader import get_loader
+from app.repository.team import TeamRepository
+from tests.utils import get_test_db
+
+
+class TestEntityLoader(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+        for n in range(1, 4):
+            EmployeeRepository.create(
+                self.session,
+                {"id": UUID(int=n), "first_name": "John", "last_name": "Doe"},
+            )
+        TeamRepository.create(self.session, {"id": UUID(int=10), "name": "Team"})
+        # ? a fresh session, nothing in the identity map
+        self.session.remove()
+        self.statements: list[str] = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: self.statements.append(args[2]),
+        )
+
+    def test_load_many_in_one_query(self):
+        employees = EmployeeRepository.load_many(
+            self.session, [UUID(int=2), UUID(int=4), UUID(int=1)]
+        )
+        self.assertEqual(
+            [employee and employee.id for employee in employees],
+            [UUID(int=2), None, UUID(int=1)],
+        )
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn(" IN ", self.statements[0])
+
+    def test_entities_are_fetched_once(self):
+        employee = EmployeeRepository.load(self.session, UUID(int=1))
+        self.assertIs(EmployeeRepository.load(self.session, UUID(int=1)), employee)
+        # only the ids not loaded yet are fetched
+        EmployeeRepository.load_many(self.session, [UUID(int=1), UUID(int=2)])
+        self.assertEqual(len(self.statements), 2)
+        self.assertEqual(self.statements[1].count("?"), 1)
+
+    def test_primed_ids_are_fetched_together(self):
+        loader = get_loader(self.session)
+        loader.prime(EmployeeModel, UUID(int=1), UUID(int=2))
+        loader.prime(TeamModel, UUID(int=10))
+        self.assertIsNotNone(loader.load(EmployeeModel, UUID(int=3)))
+        self.assertIsNotNone(loader.load(EmployeeModel, UUID(int=2)))
+        self.assertIsNotNone(loader.load(TeamModel, UUID(int=10)))
+        # one query per model
+        self.assertEqual(len(self.statements), 2)
+
+    def test_deleted_entities_are_not_returned(self):
+        employee = EmployeeRepository.load(self.session, UUID(int=1))
+        EmployeeRepository.delete(self.session, employee)
+        self.assertIsNone(EmployeeRepository.load(self.session, UUID(int=1)))
+
+    def test_missing_entities_are_fetched_again(self):
+        self.assertIsNone(EmployeeRepository.load(self.session, UUID(int=4)))
+        EmployeeRepository.create(
+            self.session,
+            {"id": UUID(int=4), "first_name": "Janet", "last_name": "Doe"},
+        )
+        self.assertEqual(
+            EmployeeRepository.load(self.session, UUID(int=4)).id, UUID(int=4)
+        )
+
+    def test_rolled_back_entities_are_forgotten(self):
+        with self.assertRaises(RuntimeError):
+            with EmployeeRepository.transaction(self.session):
+                EmployeeRepository.create(
+                    self.session,
+                    {"id": UUID(int=4), "first_name": "Janet", "last_name": "Doe"},
+                )
+                self.assertIsNotNone(EmployeeRepository.load(self.session, UUID(int=4)))
+                raise RuntimeError
+        self.assertIsNone(EmployeeRepository.get_by_id(self.session, UUID(int=4)))
+        self.assertIsNone(EmployeeRepository.load(self.session, UUID(int=4)))
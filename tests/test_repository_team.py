@@ -6,6 +6,7 @@ from app.model import TeamModel
 from app.repository.team import TeamRepository
 from app.schema.employee import Employee
 from app.schema.team import Team
+from tests.utils import get_test_db
 
 DUMMY_TEAM = Team(id=UUID("00000000-0000-0000-0000-000000000001"), name="TeamA")
 DUMMY_TEAM_MODEL = TeamModel(**DUMMY_TEAM.dict())
@@ -33,3 +34,21 @@ class TestTeamRepository(unittest.TestCase):
         response = self.repository.get(session=self.session, id=1)
         get.assert_called_once_with(session=self.session, id=1)
         assert response == DUMMY_TEAM_MODEL
+
+
+class TestTeamRepositoryName(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+        self.team = TeamRepository.create_unless_exists(self.session, {"name": "TeamA"})
+
+    def test_names_are_unique_regardless_of_the_case(self):
+        self.assertEqual(self.team.name, "TeamA")
+        self.assertIsNone(
+            TeamRepository.create_unless_exists(self.session, {"name": "teama"})
+        )
+        self.assertEqual(len(TeamRepository.get_many(self.session)), 1)
+
+    def test_get_by_name_is_an_exact_match(self):
+        self.assertEqual(TeamRepository.get_by_name(self.session, "TEAMA"), self.team)
+        self.assertIsNone(TeamRepository.get_by_name(self.session, "Team%"))
+        self.assertIsNone(TeamRepository.get_by_name(self.session, "Team_"))
@@ -2,6 +2,9 @@ import unittest
 from datetime import date
 from uuid import UUID
 
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+
 from app.model import VacationModel
 from app.repository.employee import EmployeeRepository
 from app.repository.vacation import VacationRepository
@@ -152,3 +155,149 @@ class TestVacationRepository(unittest.TestCase):
             self.session, employee, date(2021, 2, 1), date(2021, 2, 28)
         )
         self.assertEqual(len(vacations), 2)
+
+    def test_get_page_and_stream(self):
+        employee_id = UUID("00000000-0000-0000-0000-000000000000")
+        for month in range(1, 8):
+            VacationRepository.create(
+                self.session,
+                VacationCreate(
+                    employee_id=employee_id,
+                    start_date=date(2021, month, 1),
+                    end_date=date(2021, month, 2),
+                ).dict(),
+            )
+        order_by = [VacationModel.start_date, VacationModel.id]
+
+        pages, after = [], None
+        while page := VacationRepository.get_page(
+            self.session,
+            employee_id=employee_id,
+            order_by=order_by,
+            after=after,
+            limit=3,
+        ):
+            pages.append([vacation.start_date.month for vacation in page])
+            after = [page[-1].start_date, page[-1].id]
+        self.assertEqual(pages, [[1, 2, 3], [4, 5, 6], [7]])
+
+        streamed = VacationRepository.stream(
+            self.session,
+            employee_id=employee_id,
+            order_by=order_by,
+            after=[date(2021, 5, 1), UUID(int=0)],
+            batch_size=2,
+        )
+        self.assertEqual(
+            [vacation.start_date.month for vacation in streamed], [5, 6, 7]
+        )
+
+    def test_bulk_create_update_and_delete(self):
+        employee_id = UUID("00000000-0000-0000-0000-000000000000")
+        statements: list[str] = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        ids = VacationRepository.bulk_create(
+            self.session,
+            [
+                VacationCreate(
+                    employee_id=employee_id,
+                    start_date=date(2021, month, 1),
+                    end_date=date(2021, month, 2),
+                ).dict()
+                for month in range(1, 6)
+            ],
+        )
+        self.assertEqual(len([s for s in statements if s.startswith("INSERT")]), 1)
+        self.assertEqual(len(VacationRepository.get_many(self.session)), 5)
+
+        statements.clear()
+        VacationRepository.bulk_update(
+            self.session,
+            [
+                {
+                    "id": id,
+                    "end_date": date(2021, n + 1, 10),
+                    "type": VacationType.UNPAID,
+                }
+                for n, id in enumerate(ids[:2])
+            ],
+        )
+        self.assertEqual(len([s for s in statements if s.startswith("UPDATE")]), 1)
+        self.session.expire_all()
+        updated = VacationRepository.get_many(
+            self.session, VacationModel.type == VacationType.UNPAID
+        )
+        self.assertEqual(
+            sorted(v.end_date for v in updated), [date(2021, 1, 10), date(2021, 2, 10)]
+        )
+
+        statements.clear()
+        VacationRepository.delete_many(self.session, updated)
+        deleted = VacationRepository.delete_where(
+            self.session, VacationModel.start_date >= date(2021, 5, 1)
+        )
+        self.assertEqual(deleted, 1)
+        self.assertEqual(len([s for s in statements if s.startswith("DELETE")]), 2)
+        self.assertEqual(
+            sorted(v.id for v in VacationRepository.get_many(self.session)),
+            sorted(ids[2:4]),
+        )
+
+    def test_queries_use_the_period_indexes(self):
+        employee_id = UUID("00000000-0000-0000-0000-000000000000")
+        statements: list[tuple[str, tuple]] = []
+
+        def record(*args):
+            statements.append((args[2], args[3]))
+
+        event.listen(self.session.get_bind(), "before_cursor_execute", record)
+        VacationRepository.get_overlapping_vacations(
+            self.session,
+            VacationCreate(
+                employee_id=employee_id,
+                start_date=date(2021, 1, 1),
+                end_date=date(2021, 1, 5),
+            ),
+        )
+        VacationRepository.get_employee_vacation_periods(
+            self.session,
+            EmployeeRepository.model(id=employee_id),
+            date(2021, 1, 1),
+            date(2021, 1, 5),
+        )
+        EmployeeRepository.get_many_in_vacation(
+            self.session, date(2021, 1, 1), date(2021, 1, 5)
+        )
+
+        event.remove(self.session.get_bind(), "before_cursor_execute", record)
+
+        self.assertEqual(len(statements), 3)
+        for statement, parameters in statements:
+            plan = " ".join(
+                row[-1]
+                for row in self.session.connection().exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            )
+            # ? the employee and the start date bound the index range
+            self.assertIn(
+                "ix_vacation_employee_id_start_date_end_date "
+                "(employee_id=? AND start_date<?)",
+                plan,
+            )
+            self.assertNotIn("SCAN vacation", plan)
+
+    def test_overlaps_uses_the_range_index_on_postgresql(self):
+        query = select(VacationModel.id).where(
+            VacationModel.overlaps(date(2021, 1, 1), date(2021, 1, 5))
+        )
+        self.assertIn(
+            "WHERE daterange(vacation.start_date, vacation.end_date, '[]') "
+            "&& daterange(%(overlaps_period_1)s, %(overlaps_period_2)s, '[]')",
+            str(query.compile(dialect=postgresql.dialect())),
+        )
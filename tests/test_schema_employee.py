@@ -10,22 +10,21 @@ class TestEmployeeBaseSchema(unittest.TestCase):
             "Europe/Paris",
         )
 
-    # ? locked to Europe/Paris for now
-    # def test_timezone_set(self):
-    #     self.assertEqual(
-    #         EmployeeBase(
-    #             first_name="Jerome", last_name="Powell", timezone="Europe/London"
-    #         ).timezone,
-    #         "Europe/London",
-    #     )
+    def test_timezone_set(self):
+        self.assertEqual(
+            EmployeeBase(
+                first_name="Jerome", last_name="Powell", timezone="Europe/London"
+            ).timezone,
+            "Europe/London",
+        )
 
-    def test_timezone_locked_to_europe_paris(self):
+    def test_timezone_without_calendar(self):
         self.assertRaises(
             ValueError,
             EmployeeBase,
             first_name="Jerome",
             last_name="Powell",
-            timezone="Europe/London",
+            timezone="Asia/Tokyo",
         )
 
     def test_timezone_wrong(self):
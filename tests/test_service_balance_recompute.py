@@ -0,0 +1,77 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import date
+from uuid import UUID
+
+from app.repository.balance_ledger import BalanceLedgerRepository
+from app.repository.employee import EmployeeRepository
+from app.repository.vacation import VacationRepository
+from app.schema.balance import LedgerEntryKind
+from app.schema.vacation import VacationType
+from app.service.balance_recompute import BalanceRecomputeService
+from tests.utils import get_test_db
+
+
+class TestBalanceRecomputeService(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+        # ? same in-memory database, on the same connection
+        self.write_session = self.session.session_factory()
+        self.jerome, self.janet, self.john = (
+            EmployeeRepository.create(
+                self.session,
+                {"id": UUID(int=n), "first_name": first_name, "last_name": "Doe"},
+            )
+            for n, first_name in ((1, "Jerome"), (2, "Janet"), (3, "John"))
+        )
+        # 2 workdays after 2023-03-06, recorded as 5
+        VacationRepository.create(
+            self.session,
+            {
+                "employee_id": self.jerome.id,
+                "start_date": date(2023, 3, 6),
+                "end_date": date(2023, 3, 8),
+                "type": VacationType.PAID,
+            },
+        )
+        BalanceLedgerRepository.add_entries(
+            self.session,
+            {self.jerome.id: 5, self.janet.id: 3},
+            LedgerEntryKind.VACATION,
+        )
+        self.service = replace(BalanceRecomputeService, batch_size=2, max_in_flight=1)
+        self.executor = ProcessPoolExecutor(2)
+        self.addCleanup(self.executor.shutdown)
+
+    def _recompute(self, after=None):
+        return list(
+            self.service.recompute(
+                self.session, self.write_session, self.executor, after=after
+            )
+        )
+
+    def _adjustments(self) -> dict[int, list[int]]:
+        adjustments: dict[int, list[int]] = {}
+        for entry in BalanceLedgerRepository.get_many(
+            self.session, kind=LedgerEntryKind.ADJUSTMENT
+        ):
+            adjustments.setdefault(entry.employee_id.int, []).append(entry.amount)
+        return adjustments
+
+    def test_recompute(self):
+        progress = self._recompute()
+        self.assertEqual(
+            [(p.last_employee_id.int, p.employees, p.adjusted) for p in progress],
+            [(2, 2, 2), (3, 1, 0)],
+        )
+        self.assertEqual(self._adjustments(), {1: [-3], 2: [-3]})
+
+        # already consistent balances are left untouched
+        self.assertEqual([p.adjusted for p in self._recompute()], [0, 0])
+        self.assertEqual(self._adjustments(), {1: [-3], 2: [-3]})
+
+    def test_resume_after_an_employee(self):
+        progress = self._recompute(after=self.jerome.id)
+        self.assertEqual([p.last_employee_id.int for p in progress], [3])
+        self.assertEqual(self._adjustments(), {2: [-3]})
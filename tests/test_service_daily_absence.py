@@ -0,0 +1,120 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+from uuid import UUID
+
+from app.api.dependencies import get_month
+from app.repository.daily_absence import DailyAbsenceRepository
+from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
+from app.schema.vacation import VacationCreate, VacationType
+from app.service.employee import EmployeeService
+from app.service.vacation import VacationService
+from app.service.vacation_import import VacationImportService
+from tests.utils import get_test_db
+
+
+class TestTeamCalendar(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+        self.team = TeamRepository.create(self.session, {"name": "Calendar"})
+        self.jerome, self.janet = (
+            EmployeeRepository.create(
+                self.session,
+                {
+                    "id": UUID(int=n),
+                    "first_name": first_name,
+                    "last_name": "Doe",
+                    "team_id": self.team.id,
+                },
+            )
+            for n, first_name in ((1, "Jerome"), (2, "Janet"))
+        )
+
+    def _vacation(self, employee, start_day, end_day, type=VacationType.PAID):
+        return VacationCreate(
+            employee_id=employee.id,
+            start_date=date(2023, 3, start_day),
+            end_date=date(2023, 3, end_day),
+            type=type,
+        )
+
+    def _calendar(self, team=None) -> dict[int, list[int]]:
+        return {
+            absence.date.day: [UUID(id).int for id in absence.employee_ids]
+            for absence in DailyAbsenceRepository.get_by_team(
+                self.session, (team or self.team).id, *get_month("2023-03")
+            )
+        }
+
+    def test_create_update_and_delete(self):
+        vacation = VacationService.create(
+            self.session, self._vacation(self.jerome, 1, 3)
+        )
+        VacationService.create(self.session, self._vacation(self.janet, 3, 4))
+        self.assertEqual(self._calendar(), {1: [1], 2: [1], 3: [1, 2], 4: [2]})
+
+        VacationService.update(
+            self.session, vacation, self._vacation(self.jerome, 5, 5)
+        )
+        self.assertEqual(self._calendar(), {3: [2], 4: [2], 5: [1]})
+
+        VacationService.delete(self.session, vacation)
+        self.assertEqual(self._calendar(), {3: [2], 4: [2]})
+
+    def test_merged_vacations(self):
+        VacationService.create(self.session, self._vacation(self.jerome, 1, 2))
+        VacationService.create(self.session, self._vacation(self.jerome, 5, 6))
+        VacationService.create(self.session, self._vacation(self.jerome, 2, 5))
+        self.assertEqual(self._calendar(), {day: [1] for day in range(1, 7)})
+
+    def test_change_team(self):
+        other_team = TeamRepository.create(self.session, {"name": "Other"})
+        VacationService.create(self.session, self._vacation(self.jerome, 1, 2))
+        EmployeeService.change_team(self.session, self.jerome, other_team)
+        self.assertEqual(self._calendar(), {})
+        self.assertEqual(self._calendar(other_team), {1: [1], 2: [1]})
+        EmployeeService.change_team(self.session, self.jerome, None)
+        self.assertEqual(self._calendar(other_team), {})
+
+    def test_moves_between_two_teams_lock_both_first(self):
+        # ? opposite moves lock the teams in the same order, they cannot deadlock
+        other_team = TeamRepository.create(self.session, {"name": "Other"})
+        john = EmployeeRepository.create(
+            self.session,
+            {"first_name": "John", "last_name": "Doe", "team_id": other_team.id},
+        )
+        vacation = VacationService.create(
+            self.session, self._vacation(self.jerome, 1, 2)
+        )
+        for move in (
+            lambda: EmployeeService.change_team(self.session, self.jerome, other_team),
+            lambda: EmployeeService.change_team(self.session, self.jerome, self.team),
+            lambda: VacationService.update(
+                self.session, vacation, self._vacation(john, 1, 2)
+            ),
+        ):
+            with patch.object(
+                TeamRepository, "lock", wraps=TeamRepository.lock
+            ) as lock:
+                move()
+            _, *team_ids = lock.call_args_list[0].args
+            self.assertEqual(set(team_ids), {self.team.id, other_team.id})
+        self.assertEqual(self._calendar(), {})
+        self.assertEqual(
+            self._calendar(other_team), {1: [john.id.int], 2: [john.id.int]}
+        )
+
+    def test_import(self):
+        VacationService.create(self.session, self._vacation(self.jerome, 1, 2))
+        VacationImportService.import_chunk(
+            self.session,
+            [
+                (1, self._vacation(self.jerome, 3, 3)),
+                (2, self._vacation(self.janet, 2, 2)),
+            ],
+        )
+        self.assertEqual(self._calendar(), {1: [1], 2: [1, 2], 3: [1]})
+
+    def test_get_month(self):
+        self.assertEqual(get_month("2024-02"), (date(2024, 2, 1), date(2024, 2, 29)))
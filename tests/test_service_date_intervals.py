@@ -0,0 +1,78 @@
+import unittest
+from datetime import date
+
+from app.service.date_intervals import (
+    get_headcount_periods,
+    intersect_intervals,
+    merge_intervals,
+)
+
+
+class TestDateIntervals(unittest.TestCase):
+    def test_merge_overlapping_and_contiguous(self):
+        self.assertEqual(
+            merge_intervals(
+                [
+                    (date(2021, 1, 10), date(2021, 1, 12)),
+                    (date(2021, 1, 1), date(2021, 1, 5)),
+                    (date(2021, 1, 6), date(2021, 1, 7)),
+                    (date(2021, 1, 2), date(2021, 1, 3)),
+                ]
+            ),
+            [
+                (date(2021, 1, 1), date(2021, 1, 7)),
+                (date(2021, 1, 10), date(2021, 1, 12)),
+            ],
+        )
+
+    def test_intersect(self):
+        self.assertEqual(
+            intersect_intervals(
+                [
+                    (date(2021, 1, 1), date(2021, 1, 10)),
+                    (date(2021, 2, 1), date(2021, 2, 10)),
+                ],
+                [
+                    (date(2021, 1, 5), date(2021, 2, 3)),
+                    (date(2021, 2, 10), date(2021, 2, 20)),
+                ],
+            ),
+            [
+                (date(2021, 1, 5), date(2021, 1, 10)),
+                (date(2021, 2, 1), date(2021, 2, 3)),
+                (date(2021, 2, 10), date(2021, 2, 10)),
+            ],
+        )
+
+    def test_intersect_disjoint(self):
+        self.assertEqual(
+            intersect_intervals(
+                [(date(2021, 1, 1), date(2021, 1, 10))],
+                [(date(2021, 1, 11), date(2021, 1, 20))],
+            ),
+            [],
+        )
+
+    def test_headcount_periods(self):
+        self.assertEqual(
+            get_headcount_periods(
+                [
+                    (date(2021, 1, 1), date(2021, 1, 5)),
+                    (date(2021, 1, 3), date(2021, 1, 8)),
+                    (date(2021, 1, 6), date(2021, 1, 10)),
+                ],
+                min_headcount=2,
+            ),
+            [(date(2021, 1, 3), date(2021, 1, 8), 2)],
+        )
+
+    def test_headcount_periods_contiguous_intervals(self):
+        self.assertEqual(
+            get_headcount_periods(
+                [
+                    (date(2021, 1, 1), date(2021, 1, 5)),
+                    (date(2021, 1, 6), date(2021, 1, 10)),
+                ]
+            ),
+            [(date(2021, 1, 1), date(2021, 1, 10), 1)],
+        )
@@ -1,10 +1,16 @@
 import unittest
 from datetime import date
+from unittest.mock import patch
 from uuid import UUID
 
+from sqlalchemy import event
+
 from app.model import VacationModel
+from app.repository.balance import BalanceRepository
+from app.repository.balance_ledger import BalanceLedgerRepository
 from app.repository.employee import EmployeeRepository
 from app.repository.vacation import VacationRepository
+from app.schema.employee import Employee
 from app.schema.vacation import VacationCreate, VacationType
 from app.service.vacation import VacationService
 from tests.utils import get_test_db
@@ -74,6 +80,59 @@ class TestVacationService(unittest.TestCase):
         self.assertEqual(vacation.end_date, date(2021, 1, 7))
         self.assertEqual(vacation.type, VacationType.PAID)
 
+    def test_create_vacation_with_overlapping_vacations_commits_once(self):
+        BalanceRepository.create_for_employee(self.session, self.jerome)
+        VacationRepository.create(
+            self.session,
+            VacationCreate(
+                employee_id=self.jerome.id,
+                start_date=date(2021, 1, 1),
+                end_date=date(2021, 1, 5),
+            ).dict(),
+        )
+
+        with patch.object(self.session, "commit", wraps=self.session.commit) as commit:
+            self.service.create(
+                self.session,
+                VacationCreate(
+                    employee_id=self.jerome.id,
+                    start_date=date(2021, 1, 4),
+                    end_date=date(2021, 1, 8),
+                ),
+            )
+        commit.assert_called_once()
+
+    def test_create_vacation_is_atomic(self):
+        VacationRepository.create(
+            self.session,
+            VacationCreate(
+                employee_id=self.jerome.id,
+                start_date=date(2021, 1, 1),
+                end_date=date(2021, 1, 5),
+            ).dict(),
+        )
+
+        with patch.object(
+            BalanceLedgerRepository, "add_entry", side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            self.service.create(
+                self.session,
+                VacationCreate(
+                    employee_id=self.jerome.id,
+                    start_date=date(2021, 1, 4),
+                    end_date=date(2021, 1, 8),
+                ),
+            )
+
+        # the merge was rolled back
+        vacations = VacationRepository.get_many(
+            self.session, employee_id=self.jerome.id
+        )
+        self.assertEqual(
+            [(v.start_date, v.end_date) for v in vacations],
+            [(date(2021, 1, 1), date(2021, 1, 5))],
+        )
+
     def test_create_vacation_with_contiguous_vacations(self):
         VacationRepository.create(
             self.session,
@@ -162,6 +221,10 @@ class TestVacationService(unittest.TestCase):
         self.assertEqual(updated_vacation.end_date, date(2021, 1, 6))
         self.assertEqual(updated_vacation.type, VacationType.PAID)
 
+        # the vacation was updated in place
+        self.assertEqual(updated_vacation.id, vacation.id)
+        self.assertEqual(len(VacationRepository.get_many(self.session)), 1)
+
     def test_update_vacation_with_overlapping_vacations(self):
         # create a vacation
         vacation = self.service.create(
@@ -205,6 +268,63 @@ class TestVacationService(unittest.TestCase):
         self.assertEqual(updated_vacation.end_date, date(2021, 1, 7))
         self.assertEqual(updated_vacation.type, VacationType.PAID)
 
+        # the old and the overlapping vacations were replaced by the merged one
+        self.assertEqual(VacationRepository.get_many(self.session), [updated_vacation])
+
+    def test_vacation_priced_with_the_employee_calendar(self):
+        janet = EmployeeRepository.create(
+            self.session,
+            {"first_name": "Janet", "last_name": "Yellen", "timezone": "Europe/London"},
+        )
+        # ? 2023-08-28 is a bank holiday in England, not in France
+        for employee in (self.jerome, janet):
+            self.service.create(
+                self.session,
+                VacationCreate(
+                    employee_id=employee.id,
+                    start_date=date(2023, 8, 25),
+                    end_date=date(2023, 8, 29),
+                ),
+            )
+        self.assertEqual(
+            [
+                [
+                    entry.amount
+                    for entry in BalanceLedgerRepository.get_many(
+                        self.session, employee_id=employee.id
+                    )
+                ]
+                for employee in (self.jerome, janet)
+            ],
+            [[2], [1]],
+        )
+
+    def test_create_and_update_vacation_lock_the_employee(self):
+        with patch.object(
+            EmployeeRepository, "lock", wraps=EmployeeRepository.lock
+        ) as lock:
+            vacation = self.service.create(
+                self.session,
+                VacationCreate(
+                    employee_id=self.jerome.id,
+                    start_date=date(2021, 1, 1),
+                    end_date=date(2021, 1, 5),
+                ),
+            )
+            lock.assert_called_once_with(self.session, self.jerome.id)
+
+            lock.reset_mock()
+            self.service.update(
+                self.session,
+                vacation,
+                VacationCreate(
+                    employee_id=self.jerome.id,
+                    start_date=date(2021, 1, 2),
+                    end_date=date(2021, 1, 6),
+                ),
+            )
+            lock.assert_called_once_with(self.session, self.jerome.id, self.jerome.id)
+
     def test_get_employees_in_vacation(self):
         # create some employees
         jerome = EmployeeRepository.create(
@@ -337,3 +457,38 @@ class TestVacationService(unittest.TestCase):
         # assert the employees were returned
         self.assertEqual(len(employees), 1)
         self.assertEqual(employees, {jim})
+
+    def test_get_employees_in_vacation_statement_count(self):
+        statements: list[str] = []
+        event.listen(
+            self.session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        total = 0
+        for count in (3, 12):
+            total += count
+            for _ in range(count):
+                employee = EmployeeRepository.create(
+                    self.session, {"first_name": "Jim", "last_name": "Cramer"}
+                )
+                VacationRepository.create(
+                    self.session,
+                    VacationCreate(
+                        employee_id=employee.id,
+                        start_date=date(2021, 1, 1),
+                        end_date=date(2021, 1, 5),
+                    ).dict(),
+                )
+            self.session.expunge_all()
+            statements.clear()
+
+            employees = [
+                Employee.from_orm(employee)
+                for employee in self.service.get_employees_in_vacation(
+                    self.session, date(2021, 1, 1), date(2021, 1, 10)
+                )
+            ]
+
+            self.assertEqual(len(statements), 1)
+            self.assertEqual(len(employees), total)
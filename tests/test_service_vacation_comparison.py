@@ -3,6 +3,7 @@ from datetime import date
 from uuid import UUID
 
 from app.repository.employee import EmployeeRepository
+from app.repository.team import TeamRepository
 from app.schema.vacation import VacationCreate
 from app.service.vacation import VacationService
 from app.service.vacation_comparison import VacationComparisonService
@@ -69,3 +70,92 @@ class TestVacationComparisonService(unittest.TestCase):
         self.assertEqual(len(shared_days), 2)
         self.assertEqual(shared_days[0], date(2021, 1, 3))
         self.assertEqual(shared_days[1], date(2021, 1, 4))
+
+    def test_employees_vacation_shared_periods(self):
+        self.service.create(
+            self.session,
+            VacationCreate(
+                employee_id=self.jerome.id,
+                start_date=date(2021, 1, 1),
+                end_date=date(2021, 3, 31),
+            ),
+        )
+        self.service.create(
+            self.session,
+            VacationCreate(
+                employee_id=self.jim.id,
+                start_date=date(2021, 1, 10),
+                end_date=date(2021, 1, 20),
+            ),
+        )
+        self.service.create(
+            self.session,
+            VacationCreate(
+                employee_id=self.jim.id,
+                start_date=date(2021, 3, 25),
+                end_date=date(2021, 4, 10),
+            ),
+        )
+
+        shared_periods = self.comparison_service.compare_employees_vacation_periods(
+            self.session, self.jerome, self.jim, date(2021, 1, 1), date(2021, 12, 31)
+        )
+        self.assertEqual(
+            shared_periods,
+            [
+                (date(2021, 1, 10), date(2021, 1, 20)),
+                (date(2021, 3, 25), date(2021, 3, 31)),
+            ],
+        )
+        shared_days = self.comparison_service.compare_employees_vacations(
+            self.session, self.jerome, self.jim, date(2021, 1, 1), date(2021, 12, 31)
+        )
+        self.assertEqual(len(shared_days), 11 + 7)
+
+    def test_overlapping_periods_by_headcount(self):
+        team = TeamRepository.create(self.session, {"name": "TeamA"})
+        elisabeth = EmployeeRepository.create(
+            self.session,
+            {
+                "id": UUID("00000000-0000-0000-0000-000000000002"),
+                "first_name": "Elisabeth",
+                "last_name": "Warren",
+                "team_id": team.id,
+            },
+        )
+        for employee in (self.jerome, self.jim):
+            EmployeeRepository.update_team(self.session, employee, team)
+
+        for employee, start_date, end_date in [
+            (self.jerome, date(2021, 1, 1), date(2021, 1, 10)),
+            (self.jim, date(2021, 1, 5), date(2021, 1, 15)),
+            (elisabeth, date(2021, 1, 8), date(2021, 1, 20)),
+        ]:
+            self.service.create(
+                self.session,
+                VacationCreate(
+                    employee_id=employee.id, start_date=start_date, end_date=end_date
+                ),
+            )
+
+        periods = self.comparison_service.get_overlapping_periods(
+            self.session, date(2021, 1, 1), date(2021, 3, 31), 2, team_id=team.id
+        )
+        self.assertEqual(
+            periods,
+            [
+                (date(2021, 1, 5), date(2021, 1, 7), 2),
+                (date(2021, 1, 8), date(2021, 1, 10), 3),
+                (date(2021, 1, 11), date(2021, 1, 15), 2),
+            ],
+        )
+
+        # clipped to the search period, only 2 of the employees
+        periods = self.comparison_service.get_overlapping_periods(
+            self.session,
+            date(2021, 1, 6),
+            date(2021, 1, 31),
+            2,
+            employee_ids=[self.jerome.id, elisabeth.id],
+        )
+        self.assertEqual(periods, [(date(2021, 1, 8), date(2021, 1, 10), 2)])
@@ -0,0 +1,121 @@
+import unittest
+from datetime import date
+from uuid import UUID
+
+from app.repository.balance import BalanceRepository
+from app.repository.employee import EmployeeRepository
+from app.repository.vacation import VacationRepository
+from app.schema.vacation import ImportFormat, VacationCreate, VacationType
+from app.service.vacation_import import VacationImportService, VacationRowReader
+from tests.utils import get_test_db
+
+
+class TestVacationRowReader(unittest.TestCase):
+    def test_read_csv(self):
+        reader = VacationRowReader(ImportFormat.CSV)
+        self.assertIsNone(reader.read("employee_id,start_date,end_date,type"))
+        vacation = reader.read(
+            "00000000-0000-0000-0000-000000000001,2021-01-01,2021-01-05,unpaid"
+        )
+        self.assertEqual(vacation.end_date, date(2021, 1, 5))
+        self.assertEqual(vacation.type, VacationType.UNPAID)
+        with self.assertRaises(ValueError):
+            reader.read("00000000-0000-0000-0000-000000000001,2021-01-05")
+
+    def test_read_ndjson(self):
+        reader = VacationRowReader(ImportFormat.NDJSON)
+        self.assertIsNone(reader.read(""))
+        vacation = reader.read(
+            '{"employee_id": "00000000-0000-0000-0000-000000000001",'
+            ' "start_date": "2021-01-01", "end_date": "2021-01-05"}'
+        )
+        self.assertEqual(vacation.type, VacationType.PAID)
+        for line in ("[]", "{", '{"start_date": "2021-01-01"}'):
+            with self.assertRaises(ValueError):
+                reader.read(line)
+
+
+class TestVacationImportService(unittest.TestCase):
+    def setUp(self):
+        self.session = get_test_db()
+        self.service = VacationImportService
+
+        self.jerome = EmployeeRepository.create(
+            self.session,
+            {
+                "id": UUID("00000000-0000-0000-0000-000000000010"),
+                "first_name": "Jerome",
+                "last_name": "Powell",
+            },
+        )
+        BalanceRepository.create_for_employee(self.session, self.jerome, 0)
+
+    def _vacation(self, start_date, end_date, type=VacationType.PAID, employee_id=None):
+        return VacationCreate(
+            employee_id=employee_id or self.jerome.id,
+            start_date=start_date,
+            end_date=end_date,
+            type=type,
+        )
+
+    def test_import_merges_with_existing_vacations(self):
+        VacationRepository.create(
+            self.session, self._vacation(date(2021, 1, 4), date(2021, 1, 8)).dict()
+        )
+        VacationRepository.create(
+            self.session, self._vacation(date(2021, 3, 1), date(2021, 3, 5)).dict()
+        )
+
+        result = self.service.import_chunk(
+            self.session,
+            [
+                (1, self._vacation(date(2021, 1, 11), date(2021, 1, 15))),
+                (2, self._vacation(date(2021, 1, 9), date(2021, 1, 10))),
+                (3, self._vacation(date(2021, 2, 1), date(2021, 2, 3))),
+            ],
+        )
+
+        self.assertEqual((result.rows, result.failed), (3, 0))
+        self.assertEqual((result.created, result.deleted), (2, 1))
+        vacations = VacationRepository.get_many(
+            self.session, employee_id=self.jerome.id
+        )
+        self.assertEqual(
+            sorted((v.start_date, v.end_date) for v in vacations),
+            [
+                (date(2021, 1, 4), date(2021, 1, 15)),
+                (date(2021, 2, 1), date(2021, 2, 3)),
+                (date(2021, 3, 1), date(2021, 3, 5)),
+            ],
+        )
+        # 9 workdays after 2021-01-04 and 2 after 2021-02-01
+        balance = BalanceRepository.get_schema_by_employee_id(
+            self.session, self.jerome.id
+        )
+        self.assertEqual(balance.balance, 11)
+
+    def test_import_reports_invalid_rows(self):
+        result = self.service.import_chunk(
+            self.session,
+            [
+                (1, self._vacation(date(2021, 1, 1), date(2021, 1, 5))),
+                (
+                    2,
+                    self._vacation(
+                        date(2021, 1, 5), date(2021, 1, 6), VacationType.UNPAID
+                    ),
+                ),
+                (
+                    3,
+                    self._vacation(
+                        date(2021, 1, 1),
+                        date(2021, 1, 5),
+                        employee_id=UUID("00000000-0000-0000-0000-000000000099"),
+                    ),
+                ),
+            ],
+        )
+
+        self.assertEqual((result.rows, result.failed, result.created), (3, 3, 0))
+        self.assertEqual(len(result.errors), 2)
+        self.assertEqual(VacationRepository.get_many(self.session), [])
@@ -0,0 +1,111 @@
+import unittest
+from datetime import date, timedelta
+from random import Random
+
+from workalendar.europe import France
+
+from app.core.timezones import SUPPORTED_TIMEZONES
+from app.service.workdays import (
+    WorkdayCalendar,
+    get_calendar_for_tz,
+    get_workday_calendar,
+    get_working_days_deltas,
+)
+
+
+class TestWorkdayCalendar(unittest.TestCase):
+    def setUp(self):
+        self.reference = France()
+        self.calendar = WorkdayCalendar(France())
+
+    def test_same_calendar_per_timezone(self):
+        self.assertIs(
+            get_calendar_for_tz("Europe/Paris"), get_calendar_for_tz("Europe/Paris")
+        )
+        self.assertIs(
+            get_workday_calendar("Europe/Paris"), get_workday_calendar("Europe/Paris")
+        )
+
+    def test_supported_timezones(self):
+        for tz in SUPPORTED_TIMEZONES:
+            calendar = get_workday_calendar(tz)
+            starts = [date(2023, 1, 1) + timedelta(days=n) for n in range(0, 365, 3)]
+            ends = [start + timedelta(days=20) for start in starts]
+            self.assertEqual(
+                calendar.get_working_days_deltas(starts, ends).tolist(),
+                [
+                    calendar.calendar.get_working_days_delta(start, end)
+                    for start, end in zip(starts, ends)
+                ],
+                tz,
+            )
+
+    def test_unsupported_timezone(self):
+        with self.assertRaises(ValueError):
+            get_workday_calendar("Europe/Nowhere")
+
+    def test_parity_with_workalendar(self):
+        random = Random(42)
+        for _ in range(500):
+            start = date(2019, 1, 1) + timedelta(days=random.randrange(0, 6 * 365))
+            end = start + timedelta(days=random.randrange(-20, 800))
+            for include_start in (False, True):
+                self.assertEqual(
+                    self.calendar.get_working_days_delta(start, end, include_start),
+                    self.reference.get_working_days_delta(start, end, include_start),
+                    (start, end, include_start),
+                )
+
+    def test_parity_around_holidays(self):
+        # 2023-05-01 (labour day), 2023-05-08 and 2023-05-18 (ascension)
+        for start, end in [
+            (date(2023, 4, 28), date(2023, 5, 2)),
+            (date(2023, 5, 7), date(2023, 5, 8)),
+            (date(2023, 5, 17), date(2023, 5, 19)),
+            (date(2022, 12, 30), date(2023, 1, 2)),
+            (date(2023, 1, 1), date(2023, 1, 1)),
+        ]:
+            self.assertEqual(
+                self.calendar.get_working_days_delta(start, end),
+                self.reference.get_working_days_delta(start, end),
+            )
+
+    def test_batch_parity_with_scalar_path(self):
+        random = Random(7)
+        starts, ends = [], []
+        for _ in range(500):
+            start = date(2019, 1, 1) + timedelta(days=random.randrange(0, 6 * 365))
+            starts.append(start)
+            ends.append(start + timedelta(days=random.randrange(-20, 800)))
+        self.assertEqual(
+            self.calendar.get_working_days_deltas(starts, ends).tolist(),
+            [self.calendar.get_working_days_delta(s, e) for s, e in zip(starts, ends)],
+        )
+        self.assertEqual(
+            self.calendar.count_working_days_many(starts, ends).tolist(),
+            [self.calendar.count_working_days(s, e) for s, e in zip(starts, ends)],
+        )
+        self.assertEqual(get_working_days_deltas("Europe/Paris", [], []).tolist(), [])
+
+    def test_count_working_days_is_inclusive(self):
+        # monday to friday, no holiday
+        self.assertEqual(
+            self.calendar.count_working_days(date(2023, 3, 6), date(2023, 3, 10)), 5
+        )
+        self.assertEqual(
+            self.calendar.count_working_days(date(2023, 3, 10), date(2023, 3, 6)), 0
+        )
+
+    def test_unused_years_are_evicted(self):
+        calendar = WorkdayCalendar(France(), max_years=2)
+        for year in (2020, 2021, 2022):
+            calendar.is_working_day(date(year, 6, 1))
+        info = calendar.cache_info()
+        self.assertEqual(info.currsize, 2)
+        self.assertEqual(info.misses, 3)
+
+        # 2020 was the least recently used year
+        calendar.is_working_day(date(2022, 6, 2))
+        calendar.is_working_day(date(2020, 6, 2))
+        self.assertEqual(calendar.cache_info().hits, 1)
+        self.assertEqual(calendar.cache_info().misses, 4)
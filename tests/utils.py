@@ -1,5 +1,7 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.model.base import BaseModel
 
@@ -10,3 +12,11 @@ def get_test_db() -> scoped_session:
     scoped = scoped_session(session)
     BaseModel.metadata.create_all(engine)  # type: ignore
     return scoped
+
+
+async def get_async_test_db() -> AsyncSession:
+    # ? a single connection, every new in-memory sqlite connection is empty
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(BaseModel.metadata.create_all)  # type: ignore
+    return AsyncSession(engine, autoflush=False, expire_on_commit=False)